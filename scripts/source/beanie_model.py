@@ -3,8 +3,9 @@ from decimal import Decimal
 from enum import StrEnum, Enum
 from typing import Optional, Union
 
-from beanie import Document, PydanticObjectId
+from beanie import Document, PydanticObjectId, Indexed
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
 
 from dmdoc.core.sink.model import EntityReference, FieldReference
 
@@ -63,7 +64,7 @@ class CreditCard(BaseModel):
 
 
 class Product(Document):
-    name: str = Field(description="Product name")
+    name: Indexed(str, unique=True) = Field(description="Product name")
     description: Optional[str] = Field(default=None)
     price: Decimal
     height: float | None
@@ -75,6 +76,9 @@ class Product(Document):
 
     class Settings:
         name = _Collections.PRODUCTS
+        indexes = [
+            IndexModel([("name", TEXT), ("description", TEXT)], name="product_text")
+        ]
 
 
 class OrderItem(BaseModel):
@@ -99,6 +103,10 @@ class Order(Document):
 
     class Settings:
         name = _Collections.ORDERS
+        indexes = [
+            "id_user",
+            [("status", ASCENDING), ("audit.ts_insert", DESCENDING)]
+        ]
 
     class DmDocConfig:
         references = [
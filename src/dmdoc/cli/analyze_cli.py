@@ -0,0 +1,43 @@
+from typing import Optional
+
+import click
+
+from dmdoc.core.generator import analyze_source
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--source",
+    "source",
+    type=str,
+    required=True,
+    help="Path to the source configuration file."
+)
+@click.option(
+    "-o",
+    "--output",
+    "output",
+    type=str,
+    default=None,
+    help="Path to the JSON report file, by default the report is printed."
+)
+@click.option(
+    "--exit-code",
+    "exit_code",
+    is_flag=True,
+    default=False,
+    help="Exit with an error if any reference is not supported by an index."
+)
+def analyze(source: str, output: Optional[str], exit_code: bool):
+    """ Reports foreign keys (references) whose fields are not a leading prefix of any index, as JSON. """
+
+    report = analyze_source(source_filepath=source)
+    report_json = report.model_dump_json(indent=2)
+    if output is None:
+        click.echo(report_json)
+    else:
+        with open(output, mode="w", encoding="utf-8") as f:
+            f.write(report_json + "\n")
+    if exit_code and not report.is_empty:
+        raise click.exceptions.Exit(1)
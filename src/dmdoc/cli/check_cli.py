@@ -0,0 +1,47 @@
+import click
+
+from dmdoc.core.generator import find_stale_formats, load_source
+
+
+@click.command()
+@click.option(
+    "-s",
+    "--source",
+    "source",
+    type=str,
+    required=True,
+    help="Path to the source configuration file."
+)
+@click.option(
+    "-f",
+    "--format",
+    "formats",
+    type=str,
+    multiple=True,
+    help="Path to the format configuration file, repeat the option to check more formats."
+)
+@click.option(
+    "--stale",
+    "stale",
+    is_flag=True,
+    default=False,
+    help="Fail if the documentation of any format is out of date, comparing the fingerprint embedded in outputs."
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    show_default=True,
+    help="Skip parsing when the source did not change since the previous run."
+)
+def check(source: str, formats: tuple[str, ...], stale: bool, use_cache: bool):
+    """ Checks that the source can be parsed and, with --stale, that the documentation is up to date. """
+
+    if not stale:
+        load_source(source).parse()
+        return
+    if not formats:
+        raise click.UsageError("At least one format is required to check stale documentation")
+    stale_formats = find_stale_formats(source_filepath=source, format_filepaths=list(formats), use_cache=use_cache)
+    if stale_formats:
+        raise click.ClickException(f"Documentation is out of date for format(s): {', '.join(stale_formats)}")
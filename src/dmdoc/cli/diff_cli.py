@@ -0,0 +1,36 @@
+import click
+
+from dmdoc.core.generator import diff_sources
+
+
+@click.command()
+@click.option(
+    "-b",
+    "--baseline",
+    "baseline",
+    type=str,
+    required=True,
+    help="Path to the configuration file of the baseline source, e.g. a snapshot of the previous release."
+)
+@click.option(
+    "-s",
+    "--source",
+    "source",
+    type=str,
+    required=True,
+    help="Path to the source configuration file."
+)
+@click.option(
+    "--exit-code",
+    "exit_code",
+    is_flag=True,
+    default=False,
+    help="Exit with an error if the data models are different."
+)
+def diff(baseline: str, source: str, exit_code: bool):
+    """ Prints the differences between two data models as JSON. """
+
+    data_model_diff = diff_sources(baseline_filepath=baseline, source_filepath=source)
+    click.echo(data_model_diff.model_dump_json(indent=2, exclude_defaults=True))
+    if exit_code and not data_model_diff.is_empty:
+        raise click.exceptions.Exit(1)
@@ -1,5 +1,9 @@
 import click
 
+from dmdoc.cli.analyze_cli import analyze
+from dmdoc.cli.check_cli import check
+from dmdoc.cli.diff_cli import diff
+from dmdoc.cli.generate_all_cli import generate_all
 from dmdoc.cli.generate_cli import generate
 from dmdoc.utils.logging_manager import configure_logging
 
@@ -29,3 +33,11 @@ def main(log_file: str, debug: bool):
 
 # noinspection PyTypeChecker
 main.add_command(generate)
+# noinspection PyTypeChecker
+main.add_command(generate_all)
+# noinspection PyTypeChecker
+main.add_command(check)
+# noinspection PyTypeChecker
+main.add_command(diff)
+# noinspection PyTypeChecker
+main.add_command(analyze)
@@ -0,0 +1,27 @@
+import click
+
+from dmdoc.core.manifest import generate_manifest
+
+
+@click.command(name="generate-all")
+@click.option(
+    "-m",
+    "--manifest",
+    "manifest",
+    type=str,
+    required=True,
+    help="Path to the manifest file, listing the source and format configuration files of each job."
+)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of sources parsed concurrently, each one in a separate process."
+)
+def generate_all(manifest: str, jobs: int):
+    failures = generate_manifest(manifest_filepath=manifest, jobs=jobs)
+    if failures:
+        raise click.ClickException(f"{len(failures)} job(s) failed: {', '.join(failures)}")
@@ -14,9 +14,27 @@ from dmdoc.core.generator import generate_documentation
 @click.option(
     "-f",
     "--format",
-    "format_",
+    "formats",
     type=str,
-    help="Path to the format configuration file."
+    multiple=True,
+    required=True,
+    help="Path to the format configuration file, repeat the option to generate more formats from the same source."
 )
-def generate(source: str, format_: str):
-    generate_documentation(source_filepath=source, format_filepath=format_)
+@click.option(
+    "-j",
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of formats generated concurrently."
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    show_default=True,
+    help="Skip parsing and generation when inputs did not change since the previous run."
+)
+def generate(source: str, formats: tuple[str, ...], jobs: int, use_cache: bool):
+    generate_documentation(source_filepath=source, format_filepaths=list(formats), jobs=jobs, use_cache=use_cache)
@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+from typing import Optional
+
+from dmdoc.core.format import Format
+from dmdoc.core.sink.model import DataModel, dump_data_model
+from dmdoc.utils.file import read_yaml_with_envvars
+from dmdoc.utils.hashing import hash_bytes, hash_file, hash_json
+from dmdoc.utils.plugins import get_cache_dir, plugin_index
+
+_logger = logging.getLogger(__name__)
+
+
+class BuildCache:
+    """
+    Content-addressed cache of parsed data models and generated outputs.
+
+    Entries are JSON files named after the hash of their inputs:
+    * *sources*: source configuration (after environment variables expansion) and plugin versions,
+      pointing to the data model and to the hashes of the files read while parsing (imported modules and
+      source inputs, see `Source.get_input_files`);
+    * *models*: serialized data models, named after their content hash;
+    * *outputs*: format configuration and data model hash, pointing to the hashes of the generated files.
+    """
+
+    def __init__(self, cache_dir: str = None):
+        self._cache_dir = cache_dir or os.path.join(get_cache_dir(), "builds")
+
+    def _get_path(self, kind: str, key: str) -> str:
+        return os.path.join(self._cache_dir, kind, f"{key}.json")
+
+    def _read(self, kind: str, key: str) -> Optional[str]:
+        try:
+            with open(self._get_path(kind, key), mode="r") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, kind: str, key: str, content: str):
+        filepath = self._get_path(kind, key)
+        try:
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+            with open(tmp_filepath, mode="w") as f:
+                f.write(content)
+            os.replace(tmp_filepath, filepath)
+        except OSError as e:
+            _logger.warning("Unable to write build cache entry at [%s]: %s", filepath, e)
+
+    @staticmethod
+    def get_source_key(source_filepath: str) -> str:
+        return hash_json({
+            "source": read_yaml_with_envvars(source_filepath),
+            "distributions": plugin_index.get_distributions()
+        })
+
+    @staticmethod
+    def get_format_key(format_filepath: str, model_key: str) -> str:
+        return hash_json({
+            "format": read_yaml_with_envvars(format_filepath),
+            "model": model_key,
+            "distributions": plugin_index.get_distributions()
+        })
+
+    def load_model(self, source_key: str) -> Optional[tuple[DataModel, str]]:
+        """ Returns the cached data model and its key, if none of the files read while parsing has changed """
+
+        if (entry := self._read("sources", source_key)) is None:
+            return None
+        entry = json.loads(entry)
+        for filepath, file_hash in entry["files"].items():
+            if hash_file(filepath) != file_hash:
+                _logger.debug("Source file changed [%s]", filepath)
+                return None
+        if (content := self._read("models", entry["model"])) is None:
+            return None
+        return DataModel.model_validate_json(content), entry["model"]
+
+    def save_model(self, source_key: str, data_model: DataModel, input_files: Optional[list[str]]) -> str:
+        """
+        Saves the data model and returns its key.
+        Without input files (None), the data model is not saved: its key still identifies the generated outputs.
+        """
+
+        content = dump_data_model(data_model)
+        model_key = hash_bytes(content.encode())
+        if input_files is None:
+            return model_key
+        self._write("models", model_key, content)
+        self._write("sources", source_key, json.dumps({
+            "model": model_key,
+            "files": {filepath: hash_file(filepath) for filepath in input_files}
+        }))
+        return model_key
+
+    def is_generated(self, format_key: str, format_: Format) -> bool:
+        """ Returns true if the format outputs were generated from the same inputs and were not changed since """
+
+        if not format_.get_output_paths() or (entry := self._read("outputs", format_key)) is None:
+            return False
+        outputs: dict[str, str] = json.loads(entry)["outputs"]
+        return set(outputs) == set(format_.get_output_paths()) and all(
+            hash_file(filepath) == file_hash
+            for filepath, file_hash in outputs.items()
+        )
+
+    def save_outputs(self, format_key: str, format_: Format):
+        if not (output_paths := format_.get_output_paths()):
+            return
+        self._write("outputs", format_key, json.dumps({
+            "outputs": {filepath: hash_file(filepath) for filepath in output_paths}
+        }))
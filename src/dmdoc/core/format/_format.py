@@ -1,10 +1,11 @@
 import abc
 import logging
-from typing import Type
+from typing import Type, Optional
 
 from pydantic import BaseModel
 
-from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.model import DataModel, get_data_model_hash
+from dmdoc.utils.hashing import hash_json
 
 _logger = logging.getLogger(__name__)
 
@@ -26,6 +27,50 @@ class Format(abc.ABC):
         """ Executed before precessing. Override if needed, e.g. to apply some validation. """
         pass
 
+    def get_output_paths(self) -> list[str]:
+        """
+        Returns the files written by this format, used to skip unchanged outputs when the build cache is enabled.
+        Formats returning an empty list are always generated.
+        """
+        return []
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns a hash of the data model and of the format configuration.
+        Formats can embed it in their outputs, so that stale documentation is detected without generating it again.
+        """
+
+        config = None
+        if self._config is not None:
+            config = self._config.model_dump(mode="json", exclude=self._get_fingerprint_excluded_options())
+        return hash_json({
+            "format": f"{self.__class__.__module__}.{self.__class__.__name__}",
+            "config": config,
+            "model": get_data_model_hash(self._data_model)
+        })
+
+    def _get_fingerprint_excluded_options(self) -> set[str]:
+        """ Returns the configuration options that do not affect the outputs. Override if needed. """
+        return set()
+
+    def get_input_sources(self) -> dict[str, str]:
+        """
+        Returns the configuration files of other sources read by the format (e.g. a baseline to compare with), by name.
+        The generator parses them and provides their data models with `set_input_models`.
+        """
+        return {}
+
+    def set_input_models(self, data_models: dict[str, DataModel]):
+        """ Receives the data models of the sources returned by `get_input_sources`, indexed by the same names """
+        pass
+
+    def read_fingerprint(self) -> Optional[str]:
+        """
+        Returns the fingerprint embedded in the existing outputs, None if outputs or fingerprint are missing.
+        :raise NotImplementedError: if the format does not embed a fingerprint in its outputs
+        """
+        raise NotImplementedError(f"Format {self.__class__.__name__} does not embed a fingerprint")
+
     @abc.abstractmethod
     def _do_generate(self):
         """ Actual implementation to generate the documentation. """
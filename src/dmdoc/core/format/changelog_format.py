@@ -0,0 +1,158 @@
+import logging
+import os
+from typing import Optional
+
+from mdutils import TextUtils
+from pydantic import BaseModel, Field
+
+from dmdoc.core.format import Format
+from dmdoc.core.format.markdown_format import MarkdownBuffer, MarkdownOutput, get_title
+from dmdoc.core.sink.data_type import DataType, EnumValue
+from dmdoc.core.sink.diff import ChangeType, DataModelDiff, ObjectDiff, EnumDiff, FieldDiff, diff_models
+from dmdoc.core.sink.model import DataModel, EntityReference
+
+_logger = logging.getLogger(__name__)
+
+
+class ChangelogFormatConfig(BaseModel):
+    output_path: str = Field(description="Output markdown file")
+    overwrite: bool = Field(description="If true, existing files will be overwritten", default=False)
+    baseline: str = Field(
+        description="Path to the configuration file of the baseline source, e.g. a snapshot of the previous release, "
+                    "relative paths are resolved against the directory of the format configuration file"
+    )
+    title: Optional[str] = Field(
+        description="Document title, by default it is based on the data model name",
+        default=None
+    )
+
+
+def get_type_text(data_type: DataType) -> str:
+    match data_type.type:
+        case "array":
+            return f"array<{get_type_text(data_type.items)}>"
+        case "map":
+            return f"map<{get_type_text(data_type.values)}>"
+        case "union":
+            return "union[" + ", ".join([get_type_text(_type) for _type in data_type.types]) + "]"
+        case "enum" | "object":
+            return data_type.id
+        case _:
+            return data_type.type
+
+
+def _get_reference_text(reference: EntityReference) -> str:
+    mapping = ", ".join([f"{m.source} -> {m.destination}" for m in reference.mapping])
+    return f"{TextUtils.inline_code(reference.id_entity)} ({mapping})"
+
+
+def _get_field_change_text(field_diff: FieldDiff) -> str:
+    name = TextUtils.inline_code(field_diff.id)
+    match field_diff.change:
+        case ChangeType.ADDED:
+            return f"Added field {name}: {get_type_text(field_diff.new.type)}"
+        case ChangeType.REMOVED:
+            return f"Removed field {name}"
+    changes = []
+    for attribute in field_diff.attributes:
+        if attribute == "type":
+            changes.append(f"type {get_type_text(field_diff.old.type)} -> {get_type_text(field_diff.new.type)}")
+        else:
+            changes.append(attribute)
+    return f"Changed field {name}: " + ", ".join(changes)
+
+
+def _get_object_changes(object_diff: ObjectDiff) -> list[str]:
+    items = [f"Changed {attribute}" for attribute in object_diff.attributes]
+    items.extend(_get_field_change_text(field_diff) for field_diff in object_diff.fields)
+    items.extend(f"Added reference to {_get_reference_text(r)}" for r in object_diff.added_references)
+    items.extend(f"Removed reference to {_get_reference_text(r)}" for r in object_diff.removed_references)
+    return items
+
+
+def _get_value_text(value: EnumValue) -> str:
+    return f"{value.name} ({TextUtils.inline_code(value.value)})"
+
+
+def _get_enum_changes(enum_diff: EnumDiff) -> list[str]:
+    items = [f"Changed {attribute}" for attribute in enum_diff.attributes]
+    items.extend(f"Added value {_get_value_text(value)}" for value in enum_diff.added_values)
+    items.extend(f"Removed value {_get_value_text(value)}" for value in enum_diff.removed_values)
+    items.extend(f"Changed value {_get_value_text(value)}" for value in enum_diff.changed_values)
+    return items
+
+
+def _write_list(md_file: MarkdownOutput, items: list[str]):
+    # trailing blank line, otherwise a following header is not separated from the last item
+    md_file.new_paragraph("\n".join([f"* {item}" for item in items]) + "\n")
+
+
+def write_changelog(md_file: MarkdownOutput, data_model_diff: DataModelDiff):
+    """ Writes the diff as lists of added, removed and changed entities, objects and enums """
+
+    if data_model_diff.is_empty:
+        md_file.new_paragraph("No changes.")
+        return
+    if data_model_diff.attributes:
+        md_file.new_paragraph("Changed data model attributes: " + ", ".join(data_model_diff.attributes))
+    for title, diffs, get_changes in [
+        ("Entities", data_model_diff.entities, _get_object_changes),
+        ("Objects", data_model_diff.objects, _get_object_changes),
+        ("Enums", data_model_diff.enums, _get_enum_changes)
+    ]:
+        if not diffs:
+            continue
+        md_file.new_header(level=1, title=title)
+        for change in ChangeType:
+            if not (changed := [diff for diff in diffs if diff.change == change]):
+                continue
+            md_file.new_header(level=2, title=change.value.capitalize())
+            if change != ChangeType.CHANGED:
+                _write_list(md_file, [TextUtils.inline_code(diff.id) for diff in changed])
+                continue
+            for diff in changed:
+                md_file.new_header(level=3, title=diff.id)
+                _write_list(md_file, get_changes(diff))
+
+
+class ChangelogFormat(Format):
+    """ Renders the differences between a baseline data model and the current one as a Markdown changelog """
+
+    _config: ChangelogFormatConfig
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._baseline: DataModel | None = None
+
+    @classmethod
+    def get_config_class(cls) -> type[ChangelogFormatConfig]:
+        return ChangelogFormatConfig
+
+    # no output paths: the changelog depends on the baseline too, so it is not skipped by the build cache
+
+    def get_input_sources(self) -> dict[str, str]:
+        return {"baseline": self._config.baseline}
+
+    def set_input_models(self, data_models: dict[str, DataModel]):
+        self._baseline = data_models["baseline"]
+
+    def _before_generate(self):
+        if self._baseline is None:
+            raise ValueError("Missing baseline data model, it must be provided with `set_input_models`")
+        if not self._config.output_path.endswith(".md"):
+            raise ValueError(f"Output path must be a valid .md filepath with, received [{self._config.output_path}]")
+        if os.path.isdir(self._config.output_path):
+            raise ValueError(f"Output path [{self._config.output_path}] is a directory")
+        if os.path.isfile(self._config.output_path):
+            if not self._config.overwrite:
+                raise ValueError(f"Output file already exists at [{self._config.output_path}]")
+            else:
+                _logger.warning("Overwriting pre-existing changelog file at [%s]", self._config.output_path)
+
+    def _do_generate(self):
+        md_file = MarkdownBuffer()
+        write_changelog(md_file, diff_models(self._baseline, self._data_model))
+        title = self._config.title or f"Changelog of {self._data_model.name or self._data_model.id}"
+        with open(self._config.output_path, mode="w", encoding="utf-8") as f:
+            f.write(get_title(title))
+            f.write(md_file.get_text().lstrip("\n") + "\n")
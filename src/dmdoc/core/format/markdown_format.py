@@ -1,17 +1,28 @@
+import abc
+import io
 import logging
+import mmap
 import os
 import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from enum import StrEnum
+from itertools import repeat
+from typing import Iterable, Optional, Any
 
-from mdutils import MdUtils, MDList, TextUtils
-from pydantic import BaseModel, Field
+from mdutils import MDList, TextUtils
+from pydantic import BaseModel, Field, model_validator
 
 from dmdoc.core.format import Format
+from dmdoc.core.sink.analysis import is_reference_indexed
 from dmdoc.core.sink.data_type import DataType, ArrayDataType, MapDataType, UnionDataType
 from dmdoc.core.sink.model import (
-    Entity, DataModelObject, DataModelEnum, DocumentationMixin, find_reversed_references,
-    DataModel
+    Entity, DataModelObject, DataModelEnum, DocumentationMixin, DataModel, EntityIndex
 )
+from dmdoc.utils.file import write_text_if_changed
+from dmdoc.utils.hashing import hash_json
+from dmdoc.utils.plugins import plugin_index
 
 _logger = logging.getLogger(__name__)
 
@@ -19,6 +30,11 @@ _logger = logging.getLogger(__name__)
 class MDSymbol(StrEnum):
     CHECK_MARK = ":heavy_check_mark:"
     X = ":x:"
+    WARNING = ":warning:"
+
+
+def get_header_anchor(header: str) -> str:
+    return re.sub("-+", "-", header.lower())
 
 
 def get_local_link(header: str, text: str = None) -> str:
@@ -31,18 +47,246 @@ def get_local_link(header: str, text: str = None) -> str:
     :return: the Markdown code with the formatted link
     :rtype: str
     """
-    href = "#" + re.sub("-+", "-", header.lower())
+    href = "#" + get_header_anchor(header)
     return TextUtils.text_external_link(
         text or header,
         href
     )
 
 
+_FINGERPRINT_PATTERN = re.compile(r"<!-- dmdoc:fingerprint=([0-9a-f]+) -->")
+
+
+def get_header(level: int, title: str) -> str:
+    """ Returns an ATX header, e.g. `## Title` """
+
+    return "\n" + "#" * level + " " + title + "\n"
+
+
+def get_setext_header(title: str) -> str:
+    """ Returns a level 1 setext header, i.e. the title underlined with `=` """
+
+    return "\n" + title + "\n" + "=" * len(title) + "\n"
+
+
+def get_title(title: str, fingerprint: str = None) -> str:
+    """ Returns the document title, followed by the fingerprint comment if provided """
+
+    text = get_setext_header(title)
+    if fingerprint is not None:
+        text += f"<!-- dmdoc:fingerprint={fingerprint} -->\n"
+    return text
+
+
+def read_fingerprint(filepath: str) -> Optional[str]:
+    """ Reads the fingerprint that follows the title of a Markdown file, if any """
+
+    try:
+        with open(filepath, mode="r", encoding="utf-8") as f:
+            # the title takes three lines: an empty one, the title text and its underline
+            lines = [f.readline() for _ in range(4)]
+    except (OSError, ValueError):
+        return None
+    match = _FINGERPRINT_PATTERN.fullmatch(lines[3].rstrip("\n"))
+    return match.group(1) if match else None
+
+
+def get_toc_anchor(header: str) -> str:
+    return "#" + re.sub("[^a-z0-9_-]", "", header.lower().replace(" ", "-"))
+
+
+class SectionKind(StrEnum):
+    ENTITY = "entity"
+    OBJECT = "object"
+    ENUM = "enum"
+
+
+class SectionLinker:
+    """
+    Creates links to entity, object and enum sections, which are local unless sections are split across files.
+    Since data type texts contain links, they are cached here as well.
+    """
+
+    def __init__(self, section_paths: dict[tuple[SectionKind, str], str] = None, path_prefix: str = ""):
+        """
+        :param section_paths: path of the file containing each section, by default sections are in the same file
+        :param path_prefix: prefix prepended to section paths, e.g. to move to the parent directory
+        """
+        self._section_paths = section_paths
+        self._path_prefix = path_prefix
+        # data types are kept along with their text, so that their identifiers are not reused
+        self.type_texts: dict[int, tuple[DataType, str]] = {}
+
+    def get_link(self, kind: SectionKind, name: str, text: str = None) -> str:
+        if self._section_paths is None:
+            return get_local_link(name, text)
+        return TextUtils.text_external_link(
+            text or name,
+            f"{self._path_prefix}{self._section_paths[(kind, name)]}#{get_header_anchor(name)}"
+        )
+
+
+class MarkdownOutput(abc.ABC):
+    """ Markdown text written block by block, along with the headers it contains """
+
+    def __init__(self, pad_tables: bool = False, linker: SectionLinker = None):
+        self._pad_tables = pad_tables
+        self._linker = linker or SectionLinker()
+        self._headers: list[tuple[int, str]] = []
+
+    @property
+    def headers(self) -> list[tuple[int, str]]:
+        return self._headers
+
+    @property
+    def linker(self) -> SectionLinker:
+        return self._linker
+
+    @abc.abstractmethod
+    def write(self, text: str):
+        ...
+
+    def new_header(self, level: int, title: str):
+        self._headers.append((level, title))
+        self.write(get_header(level, title))
+
+    def new_paragraph(self, text: str = ""):
+        self.write("\n\n" + text)
+
+    def new_line(self, text: str = "", bold_italics_code: str = ""):
+        self.write("  \n" + (TextUtils.text_format(text, bold_italics_code) if bold_italics_code else text))
+
+    def new_table(self, header: list[str], rows: Iterable[list[str]]):
+        """
+        Writes a table with centered columns, row by row.
+        If tables are padded, column widths are computed first so that pipes are aligned.
+        """
+
+        header = [_escape_cell(cell) for cell in header]
+        rows = ([_escape_cell(cell) for cell in row] for row in rows)
+        if not self._pad_tables:
+            self.write("\n|" + "|".join(header) + "|\n|" + " :---: |" * len(header) + "\n")
+            for row in rows:
+                self.write("|" + "|".join(row) + "|\n")
+            return
+
+        rows = list(rows)
+        widths = [max(5, len(cell)) for cell in header]
+        for row in rows:
+            for i, cell in enumerate(row):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+        self.write("\n" + _format_padded_row(header, widths) + "\n")
+        self.write("|" + "|".join([" :" + "-" * (width - 2) + ": " for width in widths]) + "|\n")
+        for row in rows:
+            self.write(_format_padded_row(row, widths) + "\n")
+
+
+class MarkdownBuffer(MarkdownOutput):
+    """ Markdown text written to memory, e.g. a section rendered separately """
+
+    def __init__(self, pad_tables: bool = False, linker: SectionLinker = None):
+        super().__init__(pad_tables=pad_tables, linker=linker)
+        self._text = io.StringIO()
+
+    def get_text(self) -> str:
+        return self._text.getvalue()
+
+    def write(self, text: str):
+        self._text.write(text)
+
+
+class MarkdownWriter(MarkdownOutput):
+    """
+    Writes a Markdown document while it is produced, instead of keeping it in memory.
+    The body is streamed to a temporary file next to the output, while headers are recorded:
+    when the document is completed, title, table of contents and body are spliced into the output file.
+    """
+
+    def __init__(self, file_name: str, title: str, pad_tables: bool = False, fingerprint: str = None):
+        super().__init__(pad_tables=pad_tables)
+        self._file_name = file_name
+        self._title = title
+        self._fingerprint = fingerprint
+        self._table_of_contents: tuple[str, int] | None = None
+        self._text = tempfile.NamedTemporaryFile(
+            mode="w+",
+            encoding="utf-8",
+            dir=os.path.dirname(os.path.abspath(file_name)),
+            prefix=".",
+            suffix=".md.tmp",
+            delete=False
+        )
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._text.close()
+        os.remove(self._text.name)
+
+    def write(self, text: str):
+        self._text.write(text)
+
+    def write_section(self, text: str, headers: list[tuple[int, str]]):
+        """ Appends a section rendered separately, e.g. to a `MarkdownBuffer` """
+        self._headers.extend(headers)
+        self.write(text)
+
+    def new_table_of_contents(self, table_title: str, depth: int):
+        """ Adds a table of contents after the title, listing headers up to the provided level """
+        self._table_of_contents = (table_title, depth)
+
+    def _get_table_of_contents(self) -> str:
+        if self._table_of_contents is None:
+            return ""
+        table_title, depth = self._table_of_contents
+        items = "".join([
+            "\n" + "\t" * (level - 1) + f"* [{title}]({get_toc_anchor(title)})"
+            for level, title in self._headers
+            if level <= depth
+        ])
+        return get_setext_header(table_title) + items + "\n"
+
+    def create_md_file(self):
+        self._text.flush()
+        self._text.seek(0)
+        with open(self._file_name, mode="w", encoding="utf-8") as f:
+            f.write(get_title(self._title, self._fingerprint))
+            f.write(self._get_table_of_contents())
+            shutil.copyfileobj(self._text, f)
+
+
+def _escape_cell(cell: str) -> str:
+    """ Escapes pipes, which would otherwise split the cell (e.g. in field documentation) """
+
+    return str(cell).replace("|", r"\|")
+
+
+def _format_padded_row(row: list[str], widths: list[int]) -> str:
+    return "|" + "|".join([f" {cell.ljust(width)} " for cell, width in zip(row, widths)]) + "|"
+
+
 def get_md_list(items: list):
     return "\n".join([f"* {item}" for item in items])
 
 
-def write_aliases(md_file: MdUtils, aliases: list):
+def get_index_kind_text(index: EntityIndex) -> str:
+    text = index.kind.replace("_", " ")
+    if index.expire_after_seconds is not None:
+        return f"{text} ({index.expire_after_seconds}s)"
+    return text
+
+
+def get_size_text(size: int) -> str:
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if size < 1024:
+            return f"{size:.4g} {unit}"
+        size /= 1024
+    return f"{size:.4g} TiB"
+
+
+def write_aliases(md_file: MarkdownOutput, aliases: list):
     if not aliases:
         return
     md_file.new_line("Aliases:", bold_italics_code="i")
@@ -55,7 +299,7 @@ class MarkdownSectionWriter:
 
     def __init__(
             self,
-            md_file: MdUtils,
+            md_file: MarkdownOutput,
             model: DocumentationMixin
     ):
         self._md_file = md_file
@@ -69,8 +313,10 @@ class MarkdownSectionWriter:
     def model(self):
         return self._model
 
-    def write_title(self, title: str):
+    def write_title(self, title: str, section_hash: str = None):
         self.md_file.new_header(level=2, title=title)
+        if section_hash is not None:
+            self.md_file.write(f"<!-- dmdoc:section-hash={section_hash} -->\n")
 
     def write_aliases(self):
         write_aliases(self.md_file, self.model.aliases)
@@ -85,24 +331,28 @@ class MarkdownObjectWriter(MarkdownSectionWriter):
     _model: DataModelObject | Entity
 
     def write_fields(self):
-        text = ["Field name", "Data type", "Required", "Description"] + [
-            table_cell
-            for field in self.model.fields.values()
-            for table_cell in [
-                TextUtils.inline_code(field.name) if field.is_key else TextUtils.bold(field.name),
-                self._type_to_text(field.type),
-                MDSymbol.CHECK_MARK.value if field.is_required else " ",
-                field.doc or " "
-            ]
-        ]
         self.md_file.new_header(level=3, title="List of fields")
         self.md_file.new_table(
-            4,
-            len(self.model.fields) + 1,
-            text
+            ["Field name", "Data type", "Required", "Description"],
+            (
+                [
+                    TextUtils.inline_code(field.name) if field.is_key else TextUtils.bold(field.name),
+                    self._type_to_text(field.type),
+                    MDSymbol.CHECK_MARK.value if field.is_required else " ",
+                    field.doc or " "
+                ]
+                for field in self.model.fields.values()
+            )
         )
 
     def _type_to_text(self, data_type: DataType):
+        # data type instances are shared (see `create_datatype`), thus the text is rendered once for each of them
+        type_texts = self.md_file.linker.type_texts
+        if (cached := type_texts.get(id(data_type))) is None:
+            cached = type_texts[id(data_type)] = (data_type, self._render_type(data_type))
+        return cached[1]
+
+    def _render_type(self, data_type: DataType):
         match data_type.type:
             case "array":
                 return self._array_to_text(data_type)
@@ -111,9 +361,9 @@ class MarkdownObjectWriter(MarkdownSectionWriter):
             case "union":
                 return self._union_to_text(data_type)
             case "enum":
-                return get_local_link(data_type.id)
+                return self.md_file.linker.get_link(SectionKind.ENUM, data_type.id)
             case "object":
-                return get_local_link(data_type.id)
+                return self.md_file.linker.get_link(SectionKind.OBJECT, data_type.id)
             case _:
                 return data_type.type
 
@@ -134,15 +384,47 @@ class MarkdownObjectWriter(MarkdownSectionWriter):
 class MarkdownEntityWriter(MarkdownObjectWriter):
     _model = Entity
 
+    def write_indexes(self):
+        if not self.model.indexes:
+            return
+        self.md_file.new_header(level=3, title="Indexes")
+        self.md_file.new_table(
+            ["Index name", "Fields", "Kind", "Unique"],
+            (
+                [
+                    index.name or " ",
+                    ", ".join(TextUtils.inline_code(field) for field in index.fields),
+                    get_index_kind_text(index),
+                    MDSymbol.CHECK_MARK.value if index.is_unique else " "
+                ]
+                for index in self.model.indexes
+            )
+        )
+
+    def write_statistics(self):
+        statistics = self.model.statistics
+        if statistics is None:
+            return
+        self.md_file.new_header(level=3, title="Statistics")
+        items = [
+            f"Rows: {statistics.row_count if statistics.row_count is not None else 'n/a'}",
+            f"Size: {get_size_text(statistics.size) if statistics.size is not None else 'n/a'}"
+        ]
+        self.md_file.new_paragraph(
+            MDList(items).get_md()
+        )
+
     def write_references(self):
         if not self.model.references:
             return
         self.md_file.new_header(level=3, title="External references")
         items = []
         for reference in self.model.references:
-            reference_text = get_local_link(reference.id_entity)
+            reference_text = self.md_file.linker.get_link(SectionKind.ENTITY, reference.id_entity)
             if reference.name is not None:
                 reference_text = f"{TextUtils.bold(reference.name)} ({reference_text})"
+            if is_reference_indexed(self.model, reference) is False:
+                reference_text = f"{reference_text} {MDSymbol.WARNING.value} not indexed"
 
             items.append(reference_text)
             items.append(
@@ -156,14 +438,14 @@ class MarkdownEntityWriter(MarkdownObjectWriter):
         )
 
     def write_referenced_by(self, id_entity: str, data_model: DataModel):
-        reversed_references = find_reversed_references(id_entity, data_model)
+        reversed_references = data_model.reference_graph.get_referenced_by(id_entity)
         if not reversed_references:
             return
         self.md_file.new_header(level=3, title="Referenced by")
         items = []
         for id_entity, references in reversed_references.items():
             for reference in references:
-                reference_text = get_local_link(id_entity)
+                reference_text = self.md_file.linker.get_link(SectionKind.ENTITY, id_entity)
                 if reference.name is not None:
                     reference_text = f"{TextUtils.bold(reference.name)} ({reference_text})"
 
@@ -195,19 +477,84 @@ class MarkdownEnumWriter(MarkdownSectionWriter):
         )
 
 
+class ShardGrouping(StrEnum):
+    SECTION = "section"
+    PREFIX = "prefix"
+
+
+class MarkdownShardingConfig(BaseModel):
+    group_by: ShardGrouping = Field(
+        description="How sections are grouped in files: one file for each section, "
+                    "or one file for each name prefix (e.g. the schema of SQL tables)",
+        default=ShardGrouping.SECTION
+    )
+    separator: str = Field(description="Separator between name prefix and the rest of the name", default=".")
+
+
 class MarkdownFormatConfig(BaseModel):
-    output_path: str = Field(description="Output markdown file")
+    output_path: str = Field(description="Output markdown file, the index page when output is sharded")
     overwrite: bool = Field(description="If true, existing files will be overwritten", default=False)
+    pad_tables: bool = Field(
+        description="If true, table cells are padded so that columns are aligned in the Markdown source",
+        default=False
+    )
+    workers: int = Field(
+        description="Number of processes rendering entity, object and enum sections",
+        default=1,
+        ge=1
+    )
+    sharding: Optional[MarkdownShardingConfig] = Field(
+        description="If set, entities, objects and enums are written to separate files, "
+                    "in directories next to the output file",
+        default=None
+    )
+    incremental: bool = Field(
+        description="If true, a hash is embedded in each section and sections that did not change since "
+                    "the previous generation are copied from the existing file instead of being rendered again",
+        default=False
+    )
+
+    @model_validator(mode="after")
+    def check_incremental(self):
+        if self.incremental and self.sharding is not None:
+            raise ValueError("Incremental mode is not available for sharded output, unchanged files are kept anyway")
+        return self
+
+
+# directories of sharded sections, relative to the output file
+_SHARD_DIRS = {
+    SectionKind.ENTITY: "entities",
+    SectionKind.OBJECT: "objects",
+    SectionKind.ENUM: "enums"
+}
+# first line of shard files, so that only generated files are deleted when their sections are removed
+_SHARD_MARKER = "<!-- dmdoc:generated -->"
 
 
 class MarkdownFormat(Format):
 
     _config: MarkdownFormatConfig
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._executor: ProcessPoolExecutor | None = None
+        self._previous_sections: SectionIndex | None = None
+
     @classmethod
     def get_config_class(cls) -> type[MarkdownFormatConfig]:
         return MarkdownFormatConfig
 
+    def get_output_paths(self) -> list[str]:
+        if self._config.sharding is None:
+            return [self._config.output_path]
+        return [self._config.output_path] + [self._get_shard_filepath(path) for path in self._get_shards()]
+
+    def _get_fingerprint_excluded_options(self) -> set[str]:
+        return {"output_path", "overwrite", "workers"}
+
+    def read_fingerprint(self) -> Optional[str]:
+        return read_fingerprint(self._config.output_path)
+
     def _before_generate(self):
         if not self._config.output_path.endswith(".md"):
             raise ValueError(f"Output path must be a valid .md filepath with, received [{self._config.output_path}]")
@@ -216,58 +563,379 @@ class MarkdownFormat(Format):
         if os.path.isfile(self._config.output_path):
             if not self._config.overwrite:
                 raise ValueError(f"Output file already exists at [{self._config.output_path}]")
+            elif self._config.sharding is not None:
+                _logger.info("Updating pre-existing documentation files at [%s]", self._config.output_path)
+            elif self._config.incremental:
+                _logger.info("Updating pre-existing documentation file at [%s]", self._config.output_path)
+                self._previous_sections = SectionIndex(self._config.output_path)
             else:
                 _logger.warning("Deleting pre-existing documentation file at [%s]", self._config.output_path)
                 os.remove(self._config.output_path)
 
     def _do_generate(self):
-        md_file = MdUtils(
-            file_name=self._config.output_path,
-            title=self._data_model.name or self._data_model.id
-        )
+        try:
+            if self._config.sharding is not None:
+                self._generate_shards()
+                return
+            with MarkdownWriter(
+                file_name=self._config.output_path,
+                title=self._data_model.name or self._data_model.id,
+                pad_tables=self._config.pad_tables,
+                fingerprint=self.get_fingerprint()
+            ) as md_file:
+                self._write_description(md_file)
+                self._write_entities(md_file)
+                self._finalize(md_file)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._close_previous_sections()
+
+    def _close_previous_sections(self):
+        if self._previous_sections is not None:
+            self._previous_sections.close()
+            self._previous_sections = None
+
+    def _write_description(self, md_file: MarkdownOutput):
         if self._data_model.name != self._data_model.id:
             md_file.new_paragraph(f"{TextUtils.bold("Schema identifier")}: {TextUtils.italics(self._data_model.name)}")
         if self._data_model.doc:
             md_file.new_paragraph(self._data_model.doc)
-        self._write_entities(md_file)
-        self._finalize(md_file)
 
-    def _write_entities(self, md_file: MdUtils):
+    def _write_entities(self, md_file: MarkdownWriter):
         md_file.new_header(level=1, title="Entities")
-        for name, entity in self._data_model.entities.items():
-            entity_writer = MarkdownEntityWriter(md_file, entity)
-            entity_writer.write_title(name)
-            entity_writer.write_aliases()
-            entity_writer.write_description()
-            entity_writer.write_fields()
-            entity_writer.write_references()
-            entity_writer.write_referenced_by(name, self._data_model)
+        self._write_sections(md_file, SectionKind.ENTITY, list(self._data_model.entities))
 
-    def _finalize(self, md_file: MdUtils):
+    def _finalize(self, md_file: MarkdownWriter):
         self._write_objects(md_file)
         self._write_enums(md_file)
 
         md_file.new_table_of_contents(table_title='Index', depth=2)
+        # the previous file is overwritten
+        self._close_previous_sections()
         md_file.create_md_file()
 
-    def _write_objects(self, md_file: MdUtils):
+    def _write_objects(self, md_file: MarkdownWriter):
         md_file.new_header(level=1, title="Objects")
         if not self._data_model.objects:
             md_file.new_paragraph("No object is defined")
-        for name, obj in self._data_model.objects.items():
-            entity_writer = MarkdownObjectWriter(md_file, obj)
-            entity_writer.write_title(name)
-            entity_writer.write_aliases()
-            entity_writer.write_description()
-            entity_writer.write_fields()
+        self._write_sections(md_file, SectionKind.OBJECT, list(self._data_model.objects))
 
-    def _write_enums(self, md_file: MdUtils):
+    def _write_enums(self, md_file: MarkdownWriter):
         md_file.new_header(level=1, title="Enums")
         if not self._data_model.enums:
             md_file.new_paragraph("No enum is defined")
-        for name, obj in self._data_model.enums.items():
-            entity_writer = MarkdownEnumWriter(md_file, obj)
-            entity_writer.write_title(name)
+        self._write_sections(md_file, SectionKind.ENUM, list(self._data_model.enums))
+
+    def _write_sections(self, md_file: MarkdownWriter, kind: "SectionKind", names: list[str]):
+        """
+        Writes a section for each of the provided names.
+        With more than one worker, sections are rendered to buffers in a process pool and
+        appended in the same order, along with their headers.
+        In incremental mode, sections whose hash did not change are copied from the previous file.
+        """
+
+        hashes: dict[str, str] = {}
+        unchanged_names: set[str] = set()
+        if self._config.incremental:
+            salt = {"pad_tables": self._config.pad_tables, "distributions": plugin_index.get_distributions()}
+            hashes = {name: get_section_hash(kind, name, self._data_model, salt) for name in names}
+            if self._previous_sections is not None:
+                unchanged_names = {
+                    name for name in names
+                    if self._previous_sections.is_unchanged(kind, name, hashes[name])
+                }
+                _logger.info("Reusing %d of %d %s sections", len(unchanged_names), len(names), kind)
+
+        if self._config.workers == 1 or len(names) - len(unchanged_names) < 2:
+            for name in names:
+                if name in unchanged_names:
+                    md_file.write_section(*self._previous_sections.read_section(kind, name))
+                else:
+                    write_section(md_file, kind, name, self._data_model, hashes.get(name))
+            return
+
+        executor = self._get_executor()
+        changed_names = [name for name in names if name not in unchanged_names]
+        chunksize = max(1, len(changed_names) // (self._config.workers * 4))
+        rendered_sections = executor.map(
+            _render_section,
+            repeat(kind),
+            changed_names,
+            [hashes.get(name) for name in changed_names],
+            chunksize=chunksize
+        )
+        for name in names:
+            if name in unchanged_names:
+                md_file.write_section(*self._previous_sections.read_section(kind, name))
+            else:
+                md_file.write_section(*next(rendered_sections))
+
+    def _get_executor(self, linker: "SectionLinker" = None) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._config.workers,
+                initializer=_init_section_worker,
+                initargs=(self._data_model, self._config.pad_tables, linker)
+            )
+        return self._executor
+
+    def _get_shards(self) -> dict[str, tuple[str, list[tuple[SectionKind, str]]]]:
+        """ Returns title and sections of each file, indexed by path relative to the output directory """
+
+        shards: dict[str, tuple[str, list[tuple[SectionKind, str]]]] = {}
+        group_paths: dict[tuple[SectionKind, str], str] = {}
+        for kind, names in [
+            (SectionKind.ENTITY, self._data_model.entities),
+            (SectionKind.OBJECT, self._data_model.objects),
+            (SectionKind.ENUM, self._data_model.enums)
+        ]:
+            for name in names:
+                group = name
+                if self._config.sharding.group_by == ShardGrouping.PREFIX:
+                    group = name.split(self._config.sharding.separator, 1)[0]
+                if (path := group_paths.get((kind, group))) is None:
+                    path = _get_shard_path(kind, group, {path.casefold() for path in shards})
+                    group_paths[(kind, group)] = path
+                shards.setdefault(path, (group, []))[1].append((kind, name))
+        return shards
+
+    def _get_shard_filepath(self, path: str) -> str:
+        return os.path.join(os.path.dirname(self._config.output_path), path)
+
+    def _generate_shards(self):
+        """
+        Writes each group of sections to its own file, then an index page linking all sections.
+        Files whose content has not changed are left untouched, while files of removed groups are deleted.
+        """
+
+        shards = self._get_shards()
+        section_paths = {section: path for path, (_, sections) in shards.items() for section in sections}
+        index_path = f"../{os.path.basename(self._config.output_path)}"
+        tasks = [
+            (self._get_shard_filepath(path), title, sections, index_path)
+            for path, (title, sections) in shards.items()
+        ]
+        if self._config.workers == 1 or len(tasks) < 2:
+            linker = SectionLinker(section_paths, path_prefix="../")
+            written = [
+                write_shard(self._data_model, MarkdownBuffer(self._config.pad_tables, linker), *task)
+                for task in tasks
+            ]
+        else:
+            executor = self._get_executor(SectionLinker(section_paths, path_prefix="../"))
+            chunksize = max(1, len(tasks) // (self._config.workers * 4))
+            written = list(executor.map(_write_shard, *zip(*tasks), chunksize=chunksize))
+        self._remove_stale_shards(shards)
+
+        index = MarkdownBuffer(self._config.pad_tables, SectionLinker(section_paths))
+        self._write_description(index)
+        for kind, title, names, empty_text in [
+            (SectionKind.ENTITY, "Entities", self._data_model.entities, None),
+            (SectionKind.OBJECT, "Objects", self._data_model.objects, "No object is defined"),
+            (SectionKind.ENUM, "Enums", self._data_model.enums, "No enum is defined")
+        ]:
+            index.new_header(level=1, title=title)
+            if not names and empty_text:
+                index.new_paragraph(empty_text)
+            elif names:
+                index.new_paragraph(get_md_list([index.linker.get_link(kind, name) for name in names]))
+        written.append(write_text_if_changed(
+            self._config.output_path,
+            get_title(self._data_model.name or self._data_model.id, self.get_fingerprint()) + index.get_text()
+        ))
+        _logger.info("Written %d of %d documentation files", sum(written), len(written))
+
+    def _remove_stale_shards(self, shards: dict):
+        """ Deletes the shard files of removed groups, files that were not generated by dmdoc are kept """
+
+        for directory in _SHARD_DIRS.values():
+            shard_dir = self._get_shard_filepath(directory)
+            if not os.path.isdir(shard_dir):
+                continue
+            for filename in os.listdir(shard_dir):
+                filepath = os.path.join(shard_dir, filename)
+                if filename.endswith(".md") and f"{directory}/{filename}" not in shards and is_shard_file(filepath):
+                    _logger.info("Deleting stale documentation file [%s]", filename)
+                    os.remove(filepath)
+
+
+def _get_shard_path(kind: SectionKind, group: str, used_paths: set[str]) -> str:
+    """
+    Returns the path of the file of a group, relative to the output directory.
+    Distinct groups can have the same file name once sanitized, or names differing only by case (e.g. on macOS),
+    thus a numeric suffix is appended to the file names already used.
+    """
+
+    filename = re.sub("[^A-Za-z0-9_.-]", "_", group)
+    path = f"{_SHARD_DIRS[kind]}/{filename}.md"
+    suffix = 1
+    while path.casefold() in used_paths:
+        suffix += 1
+        path = f"{_SHARD_DIRS[kind]}/{filename}_{suffix}.md"
+    return path
+
+
+def write_section(
+        md_file: MarkdownOutput,
+        kind: SectionKind,
+        name: str,
+        data_model: DataModel,
+        section_hash: str = None
+):
+    match kind:
+        case SectionKind.ENTITY:
+            entity_writer = MarkdownEntityWriter(md_file, data_model.entities[name])
+            entity_writer.write_title(name, section_hash)
             entity_writer.write_aliases()
             entity_writer.write_description()
-            entity_writer.write_values()
+            entity_writer.write_fields()
+            entity_writer.write_indexes()
+            entity_writer.write_statistics()
+            entity_writer.write_references()
+            entity_writer.write_referenced_by(name, data_model)
+        case SectionKind.OBJECT:
+            object_writer = MarkdownObjectWriter(md_file, data_model.objects[name])
+            object_writer.write_title(name, section_hash)
+            object_writer.write_aliases()
+            object_writer.write_description()
+            object_writer.write_fields()
+        case SectionKind.ENUM:
+            enum_writer = MarkdownEnumWriter(md_file, data_model.enums[name])
+            enum_writer.write_title(name, section_hash)
+            enum_writer.write_aliases()
+            enum_writer.write_description()
+            enum_writer.write_values()
+
+
+def get_section_hash(kind: SectionKind, name: str, data_model: DataModel, salt: Any = None) -> str:
+    """
+    Returns the hash of the data a section is rendered from.
+    :param salt: any other input of the rendering, e.g. format options
+    """
+
+    match kind:
+        case SectionKind.ENTITY:
+            content = [
+                data_model.entities[name].merkle_hash,
+                {
+                    id_entity: [reference.merkle_hash for reference in references]
+                    for id_entity, references in data_model.reference_graph.get_referenced_by(name).items()
+                }
+            ]
+        case SectionKind.OBJECT:
+            content = data_model.objects[name].merkle_hash
+        case _:
+            content = data_model.enums[name].merkle_hash
+    return hash_json({"kind": kind, "name": name, "content": content, "salt": salt})
+
+
+class SectionIndex:
+    """
+    Sections of a Markdown file generated in incremental mode, indexed by kind and name along with their hash.
+    Only offsets are kept in memory: the text of a section is read from the file when it is reused.
+    """
+
+    _GROUP_HEADERS = {
+        b"Entities": SectionKind.ENTITY,
+        b"Objects": SectionKind.OBJECT,
+        b"Enums": SectionKind.ENUM
+    }
+    # headers start with a new line, which is part of the section
+    _BOUNDARY_PATTERN = re.compile(
+        rb"\n# (Entities|Objects|Enums)\n|\n## ([^\n]*)\n<!-- dmdoc:section-hash=([0-9a-f]+) -->\n"
+    )
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, mode="rb")
+        self._sections: dict[tuple[SectionKind, str], tuple[str, int, int]] = {}
+        self._index()
+
+    def _index(self):
+        if os.fstat(self._file.fileno()).st_size == 0:
+            return
+        kind = None
+        current: tuple[tuple[SectionKind, str], str, int] | None = None
+        with mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            for match in self._BOUNDARY_PATTERN.finditer(content):
+                self._add_section(current, match.start())
+                current = None
+                if match.group(1) is not None:
+                    kind = self._GROUP_HEADERS[match.group(1)]
+                elif kind is not None:
+                    current = ((kind, match.group(2).decode("utf-8")), match.group(3).decode(), match.start())
+            self._add_section(current, len(content))
+
+    def _add_section(self, section: tuple[tuple[SectionKind, str], str, int] | None, end: int):
+        if section is not None:
+            key, section_hash, start = section
+            self._sections[key] = (section_hash, start, end)
+
+    def is_unchanged(self, kind: SectionKind, name: str, section_hash: str) -> bool:
+        return (section := self._sections.get((kind, name))) is not None and section[0] == section_hash
+
+    def read_section(self, kind: SectionKind, name: str) -> tuple[str, list[tuple[int, str]]]:
+        """ Returns text and headers of the section """
+
+        _, start, end = self._sections[(kind, name)]
+        self._file.seek(start)
+        text = self._file.read(end - start).decode("utf-8")
+        headers = [(2, name)] + [
+            (len(level), title)
+            for level, title in re.findall(r"^(#{3,6}) (.*)$", text, flags=re.MULTILINE)
+        ]
+        return text, headers
+
+    def close(self):
+        self._file.close()
+
+
+def is_shard_file(filepath: str) -> bool:
+    """ Whether the file was written by `write_shard`, i.e. it starts with the shard marker """
+
+    try:
+        with open(filepath, mode="r", encoding="utf-8") as f:
+            return f.readline().rstrip("\n") == _SHARD_MARKER
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def write_shard(
+        data_model: DataModel,
+        md_file: MarkdownBuffer,
+        filepath: str,
+        title: str,
+        sections: list[tuple[SectionKind, str]],
+        index_path: str
+) -> bool:
+    """ Writes a file containing the provided sections, unless it is unchanged. Returns true if it was written. """
+
+    md_file.new_paragraph(TextUtils.text_external_link("Back to index", index_path))
+    for kind, name in sections:
+        write_section(md_file, kind, name, data_model)
+    return write_text_if_changed(
+        filepath,
+        f"{_SHARD_MARKER}\n" + get_setext_header(title) + md_file.get_text()
+    )
+
+
+# data model, table padding and section links of the format, set once in each section worker
+_worker_state: tuple[DataModel, bool, SectionLinker] | None = None
+
+
+def _init_section_worker(data_model: DataModel, pad_tables: bool, linker: SectionLinker = None):
+    global _worker_state
+    _worker_state = (data_model, pad_tables, linker or SectionLinker())
+
+
+def _render_section(kind: SectionKind, name: str, section_hash: str = None) -> tuple[str, list[tuple[int, str]]]:
+    data_model, pad_tables, linker = _worker_state
+    buffer = MarkdownBuffer(pad_tables=pad_tables, linker=linker)
+    write_section(buffer, kind, name, data_model, section_hash)
+    return buffer.get_text(), buffer.headers
+
+
+def _write_shard(filepath: str, title: str, sections: list[tuple[SectionKind, str]], index_path: str) -> bool:
+    data_model, pad_tables, linker = _worker_state
+    return write_shard(data_model, MarkdownBuffer(pad_tables, linker), filepath, title, sections, index_path)
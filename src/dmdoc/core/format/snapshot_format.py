@@ -0,0 +1,39 @@
+import logging
+import os
+
+from pydantic import BaseModel, Field
+
+from dmdoc.core.format import Format
+from dmdoc.core.sink.snapshot import save_snapshot
+
+_logger = logging.getLogger(__name__)
+
+
+class SnapshotFormatConfig(BaseModel):
+    output_path: str = Field(description="Output snapshot file")
+    overwrite: bool = Field(description="If true, existing files will be overwritten", default=False)
+
+
+class SnapshotFormat(Format):
+    """ Saves the data model to a binary snapshot, which can be loaded back with the `snapshot` source """
+
+    _config: SnapshotFormatConfig
+
+    @classmethod
+    def get_config_class(cls) -> type[SnapshotFormatConfig]:
+        return SnapshotFormatConfig
+
+    def get_output_paths(self) -> list[str]:
+        return [self._config.output_path]
+
+    def _before_generate(self):
+        if os.path.isdir(self._config.output_path):
+            raise ValueError(f"Output path [{self._config.output_path}] is a directory")
+        if os.path.isfile(self._config.output_path):
+            if not self._config.overwrite:
+                raise ValueError(f"Output file already exists at [{self._config.output_path}]")
+            else:
+                _logger.warning("Overwriting pre-existing snapshot file at [%s]", self._config.output_path)
+
+    def _do_generate(self):
+        save_snapshot(self._data_model, self._config.output_path)
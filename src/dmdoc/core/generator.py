@@ -1,10 +1,16 @@
 import logging
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 
+from dmdoc.core.build_cache import BuildCache
 from dmdoc.core.format import Format
+from dmdoc.core.sink.analysis import IndexCoverageReport, find_unindexed_references
+from dmdoc.core.sink.diff import DataModelDiff, diff_models
 from dmdoc.core.sink.model import DataModel
 from dmdoc.core.source import Source
 from dmdoc.utils.file import is_yaml_file, read_yaml_with_envvars
-from dmdoc.utils.importing import resolve_entrypoint_class
+from dmdoc.utils.importing import resolve_entrypoint_class, track_imported_modules
 
 _logger = logging.getLogger(__name__)
 
@@ -30,6 +36,11 @@ def load_source(source_filepath: str) -> Source:
 
 
 def load_format(format_filepath: str, data_model: DataModel) -> Format:
+    """
+    Creates the format of the configuration file, along with the data models of the other sources it reads:
+    their relative paths are resolved against the directory of the format configuration file
+    """
+
     if not is_yaml_file(format_filepath):
         raise ValueError(f"Format filepath is not a YAML file [{format_filepath}]")
     format_dict = read_yaml_with_envvars(format_filepath)
@@ -43,18 +54,143 @@ def load_format(format_filepath: str, data_model: DataModel) -> Format:
         parent_class=Format
     )
     config = format_dict.get("config")
-    return format_class.create(
+    format_ = format_class.create(
         data_model=data_model,
         config_dict=config
     )
+    if input_sources := format_.get_input_sources():
+        base_dir = os.path.dirname(os.path.abspath(format_filepath))
+        format_.set_input_models({
+            name: load_source(os.path.join(base_dir, source_filepath)).parse()
+            for name, source_filepath in input_sources.items()
+        })
+    return format_
+
+
+def generate_formats(formats: list[Format], jobs: int = 1):
+    """ Generates the documentation of all formats, using a thread pool when more than one job is allowed """
 
+    if jobs <= 1 or len(formats) <= 1:
+        for format_ in formats:
+            format_.generate()
+        return
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="dmdoc-format") as executor:
+        futures = [executor.submit(format_.generate) for format_ in formats]
+    for future in futures:
+        # raise the first failure, once all formats are completed
+        future.result()
 
-def generate_documentation(source_filepath: str, format_filepath: str):
+
+def generate_documentation(
+        source_filepath: str,
+        format_filepaths: str | list[str] = None,
+        jobs: int = 1,
+        use_cache: bool = False,
+        format_filepath: str = None
+):
+    """
+    Parses the source once and generates the documentation for each format.
+    When the build cache is used, parsing is skipped if the source is unchanged and formats are skipped if
+    their outputs are up to date.
+    :param format_filepath: deprecated, use `format_filepaths` instead
+    """
+
+    if format_filepath is not None:
+        warnings.warn(
+            "`format_filepath` is deprecated, use `format_filepaths` instead",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        if format_filepaths is not None:
+            raise ValueError("Only one of `format_filepaths` and `format_filepath` can be set")
+        format_filepaths = format_filepath
+    if isinstance(format_filepaths, str):
+        format_filepaths = [format_filepaths]
+    if not format_filepaths:
+        raise ValueError("At least one format filepath is required")
     if not is_yaml_file(source_filepath):
         raise ValueError(f"Source filepath is not a YAML file [{source_filepath}]")
-    if not is_yaml_file(format_filepath):
-        raise ValueError(f"Format filepath is not a YAML file [{format_filepath}]")
+    for format_filepath in format_filepaths:
+        if not is_yaml_file(format_filepath):
+            raise ValueError(f"Format filepath is not a YAML file [{format_filepath}]")
+    if use_cache:
+        _generate_documentation_cached(source_filepath, format_filepaths, jobs, BuildCache())
+        return
     source = load_source(source_filepath)
     data_model = source.parse()
-    format_ = load_format(format_filepath, data_model)
-    format_.generate()
+    formats = [
+        load_format(format_filepath, data_model)
+        for format_filepath in format_filepaths
+    ]
+    generate_formats(formats, jobs=jobs)
+
+
+def _load_data_model(source_filepath: str, cache: BuildCache) -> tuple[DataModel, str]:
+    """ Returns the data model and its key, parsing the source only if it changed since it was cached """
+
+    source_key = cache.get_source_key(source_filepath)
+    if (cached_model := cache.load_model(source_key)) is not None:
+        _logger.info("Source is unchanged, using cached data model [%s]", source_filepath)
+        return cached_model
+    with track_imported_modules() as imported_files:
+        source = load_source(source_filepath)
+        data_model = source.parse()
+    if (source_files := source.get_input_files()) is None:
+        _logger.info("Source inputs cannot be tracked, the data model is not cached [%s]", source_filepath)
+        return data_model, cache.save_model(source_key, data_model, None)
+    return data_model, cache.save_model(source_key, data_model, [*imported_files, *source_files])
+
+
+def _generate_documentation_cached(source_filepath: str, format_filepaths: list[str], jobs: int, cache: BuildCache):
+    data_model, model_key = _load_data_model(source_filepath, cache)
+
+    formats: dict[str, Format] = {}
+    for format_filepath in format_filepaths:
+        format_ = load_format(format_filepath, data_model)
+        format_key = cache.get_format_key(format_filepath, model_key)
+        if cache.is_generated(format_key, format_):
+            _logger.info("Output is up to date, skipping format [%s]", format_filepath)
+            continue
+        formats[format_key] = format_
+    generate_formats(list(formats.values()), jobs=jobs)
+    for format_key, format_ in formats.items():
+        cache.save_outputs(format_key, format_)
+
+
+def find_stale_formats(source_filepath: str, format_filepaths: list[str], use_cache: bool = False) -> list[str]:
+    """
+    Returns the format filepaths whose documentation is out of date, without generating anything.
+    The fingerprint of the data model and format configuration is compared with the one embedded in the outputs:
+    formats that do not embed a fingerprint are skipped.
+    """
+
+    if use_cache:
+        data_model, _ = _load_data_model(source_filepath, BuildCache())
+    else:
+        data_model = load_source(source_filepath).parse()
+    stale_formats = []
+    for format_filepath in format_filepaths:
+        format_ = load_format(format_filepath, data_model)
+        try:
+            fingerprint = format_.read_fingerprint()
+        except NotImplementedError:
+            _logger.warning("Format does not embed a fingerprint, skipping [%s]", format_filepath)
+            continue
+        if fingerprint != format_.get_fingerprint():
+            _logger.info("Documentation is stale [%s]", format_filepath)
+            stale_formats.append(format_filepath)
+    return stale_formats
+
+
+def diff_sources(baseline_filepath: str, source_filepath: str) -> DataModelDiff:
+    """ Parses both sources and compares their data models, e.g. a snapshot of the previous release with the code """
+
+    baseline = load_source(baseline_filepath).parse()
+    data_model = load_source(source_filepath).parse()
+    return diff_models(baseline, data_model)
+
+
+def analyze_source(source_filepath: str) -> IndexCoverageReport:
+    """ Parses the source and reports the references that are not supported by an index """
+
+    return find_unindexed_references(load_source(source_filepath).parse())
@@ -0,0 +1,93 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from dmdoc.core.generator import load_source, load_format, generate_formats
+from dmdoc.core.sink.model import DataModel
+from dmdoc.utils.file import is_yaml_file, read_yaml_with_envvars
+from dmdoc.utils.logging_manager import configure_logging
+
+_logger = logging.getLogger(__name__)
+
+
+class ManifestJob(BaseModel):
+    name: Optional[str] = Field(description="Job name, by default the source filepath", default=None)
+    source: str = Field(description="Path to the source configuration file")
+    formats: list[str] = Field(description="Paths to the format configuration files", min_length=1)
+
+    @property
+    def display_name(self) -> str:
+        return self.name or self.source
+
+
+class Manifest(BaseModel):
+    jobs: list[ManifestJob] = Field(description="Source/formats pairs to generate", min_length=1)
+
+    @model_validator(mode="after")
+    def check_unique_names(self):
+        # failures are reported by job name
+        names = [job.display_name for job in self.jobs]
+        if duplicates := sorted({name for name in names if names.count(name) > 1}):
+            raise ValueError(f"Job names must be unique, set `name` to tell them apart: {', '.join(duplicates)}")
+        return self
+
+
+def load_manifest(manifest_filepath: str) -> Manifest:
+    """ Reads a manifest file, relative paths are resolved against the manifest directory """
+
+    if not is_yaml_file(manifest_filepath):
+        raise ValueError(f"Manifest filepath is not a YAML file [{manifest_filepath}]")
+    manifest = Manifest.model_validate(read_yaml_with_envvars(manifest_filepath))
+    base_dir = os.path.dirname(os.path.abspath(manifest_filepath))
+    for job in manifest.jobs:
+        job.source = os.path.join(base_dir, job.source)
+        job.formats = [os.path.join(base_dir, format_filepath) for format_filepath in job.formats]
+    return manifest
+
+
+def _init_worker(debug: bool):
+    configure_logging(debug=debug)
+
+
+def _parse_source(source_filepath: str) -> DataModel:
+    return load_source(source_filepath).parse()
+
+
+def generate_manifest(manifest_filepath: str, jobs: int = 1) -> dict[str, BaseException]:
+    """
+    Generates the documentation of every manifest job.
+    Sources are parsed in a process pool, each job in a fresh worker so that source model imports stay isolated,
+    while formats are generated as soon as the data model of their job is available.
+    A failing job does not stop the other ones: failures are returned, indexed by job name.
+    """
+
+    manifest = load_manifest(manifest_filepath)
+    failures: dict[str, BaseException] = {}
+    with ProcessPoolExecutor(
+            max_workers=jobs,
+            max_tasks_per_child=1,
+            initializer=_init_worker,
+            initargs=(logging.getLogger().isEnabledFor(logging.DEBUG),)
+    ) as executor:
+        futures = {
+            executor.submit(_parse_source, job.source): job
+            for job in manifest.jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                data_model = future.result()
+                _logger.info("Parsed source of job [%s]", job.display_name)
+                formats = [
+                    load_format(format_filepath, data_model)
+                    for format_filepath in job.formats
+                ]
+                generate_formats(formats)
+            except Exception as e:
+                _logger.error("Job [%s] failed: %s", job.display_name, e, exc_info=e)
+                failures[job.display_name] = e
+    _logger.info("Completed %d of %d jobs", len(manifest.jobs) - len(failures), len(manifest.jobs))
+    return failures
@@ -0,0 +1,82 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from dmdoc.core.sink.model import DataModel, Entity, EntityIndex, EntityReference, IndexKind
+
+
+class UnindexedReference(BaseModel):
+    entity: str = Field(description="Entity holding the reference")
+    name: Optional[str] = Field(description="Reference name", default=None)
+    id_entity: str = Field(description="Referenced entity")
+    fields: list[str] = Field(description="Source fields of the reference, not covered by any index")
+
+
+class IndexCoverageReport(BaseModel):
+    data_model: str = Field(description="Data model identifier")
+    references: int = Field(description="Number of analyzed references")
+    unindexed_references: list[UnindexedReference] = Field(description="References without a supporting index")
+    unknown_entities: list[str] = Field(
+        description="Entities with references whose indexes are not captured by the source, thus not analyzed",
+        default=[]
+    )
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.unindexed_references
+
+
+def is_index_prefix(fields: list[str], index: EntityIndex) -> bool:
+    """ Whether the fields, in any order, are the leading fields of the index. Text indexes do not support lookups """
+
+    return index.kind != IndexKind.TEXT and set(fields) == set(index.fields[:len(fields)])
+
+
+def get_leading_fields(indexes: list[EntityIndex]) -> set[str]:
+    """ Returns the fields that are covered by an index prefix on their own """
+
+    return {index.fields[0] for index in indexes if is_index_prefix(index.fields[:1], index)}
+
+
+def is_reference_indexed(entity: Entity, reference: EntityReference) -> Optional[bool]:
+    """
+    Whether the source fields of the reference are a leading prefix of any index of the entity, including primary key
+    and unique constraints: otherwise, looking up the referencing rows (e.g. on delete of the referenced one)
+    requires a full scan. None means unknown, since the indexes of the entity were not captured by the source.
+    """
+
+    if entity.indexes is None:
+        return None
+    fields = [mapping.source for mapping in reference.mapping]
+    return any(is_index_prefix(fields, index) for index in entity.indexes)
+
+
+def find_unindexed_references(data_model: DataModel) -> IndexCoverageReport:
+    """
+    Returns the references whose source fields are not covered by an index, in entity order.
+    Entities whose indexes were not captured by the source are reported as unknown.
+    """
+
+    references = 0
+    unindexed_references = []
+    unknown_entities = []
+    for _id, entity in data_model.entities.items():
+        if entity.indexes is None:
+            if entity.references:
+                unknown_entities.append(_id)
+            continue
+        for reference in entity.references:
+            references += 1
+            if not is_reference_indexed(entity, reference):
+                unindexed_references.append(UnindexedReference(
+                    entity=_id,
+                    name=reference.name,
+                    id_entity=reference.id_entity,
+                    fields=[mapping.source for mapping in reference.mapping]
+                ))
+    return IndexCoverageReport(
+        data_model=data_model.id,
+        references=references,
+        unindexed_references=unindexed_references,
+        unknown_entities=unknown_entities
+    )
@@ -1,23 +1,28 @@
 import abc
 import logging
-from typing import Literal, Optional, Annotated, Union
+import weakref
+from contextvars import ContextVar
+from typing import Literal, Optional, Annotated, Any
 
-from pydantic import BaseModel, Field, model_serializer, model_validator, TypeAdapter
+from pydantic import ConfigDict, Field, GetJsonSchemaHandler, model_serializer, model_validator
+from pydantic.json_schema import JsonSchemaValue
+from pydantic_core import core_schema
 
-from dmdoc.utils.importing import import_entrypoint_items
+from dmdoc.core.sink.merkle import MerkleHashMixin, iter_fields
+from dmdoc.utils.importing import import_entrypoint_object
+from dmdoc.utils.plugins import plugin_index
 
 _logger = logging.getLogger()
 _DATATYPES_ENTRYPOINTS_PATH = "dmdoc.sink.datatypes"
+_DATATYPE_SCHEMA_REF = "DataType"
+# set while the `DataType` definition is generated, so that nested data types only reference it
+_generating_datatype_schema: ContextVar[bool] = ContextVar("_generating_datatype_schema", default=False)
 
 
-def generate_polymorphic_type(*types: type, discriminator: str):
-    return Annotated[
-        Union[*types],
-        Field(discriminator=discriminator)
-    ]
+class BaseDataType(MerkleHashMixin, abc.ABC):
+    # instances are shared by `create_datatype`, thus they must not be changed
+    model_config = ConfigDict(frozen=True)
 
-
-class BaseDataType(BaseModel, abc.ABC):
     @classmethod
     def get_type(cls):
         _type = cls.model_fields.get("type")
@@ -67,6 +72,12 @@ class TimeDataType(PrimitiveType):
     type: Literal["time"] = Field(description="Type discriminator")
 
 
+class AnyDataType(PrimitiveType):
+    """ Values of any type, e.g. fields annotated with `typing.Any` """
+
+    type: Literal["any"] = Field(description="Type discriminator")
+
+
 class ObjectDataType(BaseDataType):
     type: Literal["object"] = Field(description="Type identifier")
     id: str = Field(description="Object identifier")
@@ -77,7 +88,7 @@ class EnumDataType(BaseDataType):
     id: str = Field(description="Enum identifier")
 
 
-class EnumValue(BaseModel):
+class EnumValue(MerkleHashMixin):
     name: str = Field(description="User friendly value name")
     value: str = Field(description="Value identifier that must match the regex: [A-Za-z0-9_]*")
     doc: Optional[str] = Field(description="Documentation string", default=None)
@@ -127,41 +138,161 @@ class ObjectIdDataType(BaseDataType):
     type: Literal["objectId"] = Field(description="Type discriminator")
 
 
-def _add_beanie_extra_data_types(types: dict[str, type["DataType"]]):
-    try:
-        from dmdoc.core.source.beanie_source import BeanieSource
-        _objectid_type_name = ObjectIdDataType.get_type()
-        if _objectid_type_name in types:
-            raise Exception(
-                f"Cannot configure `{_objectid_type_name}` data type: "
-                f"an entry point class [{types[_objectid_type_name]}] already exists with that name"
+class DataTypeRegistry:
+    """
+    Registry of the data type classes registered as entry points.
+    Entry points are resolved on first use and each class is imported only when its type is requested.
+    """
+
+    def __init__(self, group: str):
+        self._group = group
+        self._classes: dict[str, type[BaseDataType]] = {}
+        self._union_schema = None
+
+    @property
+    def entrypoints(self):
+        return plugin_index.get_entrypoints(self._group)
+
+    def get_names(self) -> list[str]:
+        return list(self.entrypoints.keys())
+
+    def get_class(self, type_name: str) -> type[BaseDataType]:
+        if (type_class := self._classes.get(type_name)) is not None:
+            return type_class
+        if (entrypoint := self.entrypoints.get(type_name)) is None:
+            raise ValueError(f"Unknown data type `{type_name}`, expected one of {self.get_names()}")
+        type_class = import_entrypoint_object(entrypoint)
+        if not isinstance(type_class, type) or not issubclass(type_class, BaseDataType):
+            raise ValueError(f"Invalid type `{type_name}`: class does not inherit from {BaseDataType}")
+        if type_name != type_class.get_type():
+            raise AttributeError(
+                f"Invalid type `{type_name}`: class type {type_class.get_type()} does not match the declared type"
+            )
+        self._classes[type_name] = type_class
+        return type_class
+
+    def get_union_schema(self) -> core_schema.CoreSchema:
+        """ Returns the core schema of the discriminated union of all registered data types (imports all of them) """
+
+        if self._union_schema is None:
+            self._union_schema = core_schema.tagged_union_schema(
+                choices={
+                    type_name: self.get_class(type_name).__pydantic_core_schema__
+                    for type_name in self.get_names()
+                },
+                discriminator="type",
+                ref=_DATATYPE_SCHEMA_REF
             )
-        types[_objectid_type_name] = ObjectIdDataType
-    except ImportError:
-        _logger.debug("Skipping beanie source data types registration...")
+        return self._union_schema
+
+    def validate(self, value: Any) -> BaseDataType:
+        if isinstance(value, BaseDataType):
+            if not isinstance(value, self.get_class(value.get_type())):
+                raise ValueError(f"Data type {value} is not an instance of the registered class")
+            return value
+        if isinstance(value, str):
+            # short representation of primitive types (see `PrimitiveType.serialize`)
+            value = {"type": value}
+        if not isinstance(value, dict):
+            raise ValueError(f"Invalid data type definition, expected an object found {value}")
+        type_name = value.get("type")
+        if not isinstance(type_name, str):
+            raise ValueError(f"Missing data type discriminator `type` in {value}")
+        return self.get_class(type_name).model_validate(value)
+
+
+class _DataTypeAnnotation:
+    """ Validates data types through the registry, so the discriminated union is never built to validate fields """
+
+    def __get_pydantic_core_schema__(self, source, handler) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(_validate_datatype)
+
+    def __get_pydantic_json_schema__(self, schema, handler: GetJsonSchemaHandler) -> JsonSchemaValue:
+        # the union is generated once as `DataType` definition, nested data types only reference it
+        reference_schema = core_schema.definition_reference_schema(_DATATYPE_SCHEMA_REF)
+        if _generating_datatype_schema.get():
+            # recursive data types, the definition is being generated
+            return handler(reference_schema)
+        token = _generating_datatype_schema.set(True)
+        try:
+            return handler(core_schema.definitions_schema(reference_schema, [datatype_registry.get_union_schema()]))
+        finally:
+            _generating_datatype_schema.reset(token)
+
+
+def _validate_datatype(value: Any) -> "DataType":
+    if isinstance(value, str):
+        return create_datatype(type=value)
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return create_datatype(**value)
+    return intern_datatype(datatype_registry.validate(value))
+
+
+# structural key -> shared data type instance, kept while the data type is in use
+_interned_datatypes: weakref.WeakValueDictionary[tuple, "DataType"] = weakref.WeakValueDictionary()
+# raw create_datatype arguments -> shared data type instance, kept while the data type is in use
+_created_datatypes: weakref.WeakValueDictionary[tuple, "DataType"] = weakref.WeakValueDictionary()
+
+
+class _Identity:
+    """ Key of an interned data type, compared by identity since data types are not hashable """
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: "DataType"):
+        # the reference keeps the data type alive as long as the key, so that its identity is not reused
+        self.value = value
 
+    def __hash__(self):
+        return id(self.value)
 
-def _generate_datatype():
-    types: dict[str, type["DataType"]] = import_entrypoint_items(_DATATYPES_ENTRYPOINTS_PATH)
-    _add_beanie_extra_data_types(types)
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.value is self.value
+
+
+def _freeze(value: Any) -> Any:
+    """ Returns a hashable representation of a data type payload """
+
+    if isinstance(value, BaseDataType):
+        # children are interned before being frozen, thus the identity is a structural key
+        return _Identity(intern_datatype(value))
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    hash(value)
+    return value
 
-    for type_name, type_class in types.items():
-        if not issubclass(type_class, BaseDataType):
-            raise ValueError(f"Invalid type `{type_name}`: class does not inherit from {DataType}")
-        class_type = type_class.get_type()
-        if type_name != class_type:
-            raise AttributeError(
-                f"Invalid type `{type_name}`: class type {type_class.get_type()} does not match the declared type"
-            )
-    return generate_polymorphic_type(
-        *types.values(),
-        discriminator="type"
-    )
+
+def intern_datatype(data_type: "DataType") -> "DataType":
+    """ Returns the shared instance that is structurally equal to the provided data type """
+
+    children = {}
+    for name, value in iter_fields(data_type):
+        if isinstance(value, BaseDataType):
+            children[name] = intern_datatype(value)
+        elif isinstance(value, list) and any(isinstance(v, BaseDataType) for v in value):
+            children[name] = [intern_datatype(v) if isinstance(v, BaseDataType) else v for v in value]
+    key = (type(data_type), _freeze({name: children.get(name, value) for name, value in iter_fields(data_type)}))
+    if (interned := _interned_datatypes.get(key)) is not None:
+        return interned
+    if any(value is not getattr(data_type, name) for name, value in children.items()):
+        # share the interned children too
+        data_type = data_type.model_copy(update=children)
+    return _interned_datatypes.setdefault(key, data_type)
 
 
 def create_datatype(**kwargs) -> "DataType":
-    return _datatype.validate_python(kwargs)
+    """ Creates a data type, identical structures are validated once and share the same instance """
+
+    try:
+        key = _freeze(kwargs)
+    except TypeError:
+        return intern_datatype(datatype_registry.validate(kwargs))
+    if (data_type := _created_datatypes.get(key)) is None:
+        data_type = _created_datatypes[key] = intern_datatype(datatype_registry.validate(kwargs))
+    return data_type
 
 
-DataType = _generate_datatype()
-_datatype = TypeAdapter(DataType)
+datatype_registry = DataTypeRegistry(_DATATYPES_ENTRYPOINTS_PATH)
+DataType = Annotated[BaseDataType, _DataTypeAnnotation()]
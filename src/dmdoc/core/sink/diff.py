@@ -0,0 +1,172 @@
+from enum import StrEnum
+from typing import Callable, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from dmdoc.core.sink.data_type import EnumValue
+from dmdoc.core.sink.merkle import MerkleHashMixin, get_hash_content
+from dmdoc.core.sink.model import DataModel, BaseObject, DataModelEnum, EntityReference, ModelField
+
+_H = TypeVar("_H", bound=MerkleHashMixin)
+_D = TypeVar("_D", bound=BaseModel)
+
+
+class ChangeType(StrEnum):
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+
+
+class FieldDiff(BaseModel):
+    id: str = Field(description="Field identifier")
+    change: ChangeType = Field(description="Change type")
+    attributes: list[str] = Field(description="Changed attributes, e.g. `type` or `is_key`", default=[])
+    old: Optional[ModelField] = Field(description="Baseline field, unless it was added", default=None)
+    new: Optional[ModelField] = Field(description="Current field, unless it was removed", default=None)
+
+
+class ObjectDiff(BaseModel):
+    id: str = Field(description="Entity or object identifier")
+    change: ChangeType = Field(description="Change type")
+    attributes: list[str] = Field(
+        description="Changed attributes, e.g. `doc`. `fields` is reported when only the field order changed",
+        default=[]
+    )
+    fields: list[FieldDiff] = Field(description="Added, removed and changed fields", default=[])
+    added_references: list[EntityReference] = Field(description="References added to the entity", default=[])
+    removed_references: list[EntityReference] = Field(description="References removed from the entity", default=[])
+
+
+class EnumDiff(BaseModel):
+    id: str = Field(description="Enum identifier")
+    change: ChangeType = Field(description="Change type")
+    attributes: list[str] = Field(
+        description="Changed attributes, e.g. `doc`. `values` is reported when only the value order changed",
+        default=[]
+    )
+    added_values: list[EnumValue] = Field(description="Added values", default=[])
+    removed_values: list[EnumValue] = Field(description="Removed values", default=[])
+    changed_values: list[EnumValue] = Field(
+        description="Values whose identifier or documentation changed, values are matched by name",
+        default=[]
+    )
+
+
+class DataModelDiff(BaseModel):
+    attributes: list[str] = Field(
+        description="Changed data model attributes, e.g. `name` or `doc`. "
+                    "`entities`, `objects` or `enums` are reported when only their order changed",
+        default=[]
+    )
+    entities: list[ObjectDiff] = Field(description="Added, removed and changed entities", default=[])
+    objects: list[ObjectDiff] = Field(description="Added, removed and changed objects", default=[])
+    enums: list[EnumDiff] = Field(description="Added, removed and changed enums", default=[])
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.attributes or self.entities or self.objects or self.enums)
+
+
+def diff_models(old: DataModel, new: DataModel) -> DataModelDiff:
+    """
+    Compares a baseline data model with the current one.
+    Merkle hashes are compared first at every level (see `MerkleHashMixin`), so that only changed subtrees are visited.
+    """
+
+    if old.merkle_hash == new.merkle_hash:
+        return DataModelDiff()
+    diff = DataModelDiff(
+        attributes=_get_changed_attributes(old, new, exclude={"entities", "objects", "enums"}),
+        entities=_diff_mappings(old.entities, new.entities, ObjectDiff, _diff_object),
+        objects=_diff_mappings(old.objects, new.objects, ObjectDiff, _diff_object),
+        enums=_diff_mappings(old.enums, new.enums, EnumDiff, _diff_enum)
+    )
+    for name in ["entities", "objects", "enums"]:
+        if not getattr(diff, name) and list(getattr(old, name)) != list(getattr(new, name)):
+            diff.attributes.append(name)
+    return diff
+
+
+def _diff_mappings(
+        old: dict[str, _H],
+        new: dict[str, _H],
+        diff_class: type[_D],
+        diff_item: Callable[[str, _H, _H], _D]
+) -> list[_D]:
+    """ Returns the diff of items that were added, removed or whose hash changed, in the order of the current model """
+
+    diffs = []
+    for _id, item in new.items():
+        if (old_item := old.get(_id)) is None:
+            diffs.append(diff_class(id=_id, change=ChangeType.ADDED))
+        elif old_item.merkle_hash != item.merkle_hash:
+            diffs.append(diff_item(_id, old_item, item))
+    diffs.extend(diff_class(id=_id, change=ChangeType.REMOVED) for _id in old if _id not in new)
+    return diffs
+
+
+def _get_changed_attributes(old: BaseModel, new: BaseModel, exclude: set[str]) -> list[str]:
+    return [
+        name
+        for name in type(old).model_fields
+        if name not in exclude and get_hash_content(getattr(old, name)) != get_hash_content(getattr(new, name))
+    ]
+
+
+def _diff_field(_id: str, old: ModelField, new: ModelField) -> FieldDiff:
+    return FieldDiff(
+        id=_id,
+        change=ChangeType.CHANGED,
+        attributes=_get_changed_attributes(old, new, exclude=set()),
+        old=old,
+        new=new
+    )
+
+
+def _diff_object(_id: str, old: BaseObject, new: BaseObject) -> ObjectDiff:
+    fields = []
+    for field_id, field in new.fields.items():
+        if (old_field := old.fields.get(field_id)) is None:
+            fields.append(FieldDiff(id=field_id, change=ChangeType.ADDED, new=field))
+        elif old_field.merkle_hash != field.merkle_hash:
+            fields.append(_diff_field(field_id, old_field, field))
+    fields.extend(
+        FieldDiff(id=field_id, change=ChangeType.REMOVED, old=field)
+        for field_id, field in old.fields.items()
+        if field_id not in new.fields
+    )
+    attributes = _get_changed_attributes(old, new, exclude={"fields", "references"})
+    if not fields and list(old.fields) != list(new.fields):
+        attributes.append("fields")
+
+    old_references = {reference.merkle_hash: reference for reference in getattr(old, "references", [])}
+    new_references = {reference.merkle_hash: reference for reference in getattr(new, "references", [])}
+    return ObjectDiff(
+        id=_id,
+        change=ChangeType.CHANGED,
+        attributes=attributes,
+        fields=fields,
+        added_references=[reference for key, reference in new_references.items() if key not in old_references],
+        removed_references=[reference for key, reference in old_references.items() if key not in new_references]
+    )
+
+
+def _diff_enum(_id: str, old: DataModelEnum, new: DataModelEnum) -> EnumDiff:
+    # matched by name, so that a changed value identifier is reported as a change
+    old_values = {value.name: value for value in old.values}
+    new_values = {value.name: value for value in new.values}
+    diff = EnumDiff(
+        id=_id,
+        change=ChangeType.CHANGED,
+        attributes=_get_changed_attributes(old, new, exclude={"values"}),
+        added_values=[value for key, value in new_values.items() if key not in old_values],
+        removed_values=[value for key, value in old_values.items() if key not in new_values],
+        changed_values=[
+            value
+            for key, value in new_values.items()
+            if key in old_values and old_values[key].merkle_hash != value.merkle_hash
+        ]
+    )
+    if not (diff.added_values or diff.removed_values or diff.changed_values) and list(old_values) != list(new_values):
+        diff.attributes.append("values")
+    return diff
@@ -0,0 +1,118 @@
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from dmdoc.core.sink.data_type import DataType
+    from dmdoc.core.sink.model import Entity, EntityReference, DataModelObject, ModelField
+
+# field key -> (field, identifiers of the objects nested into the field)
+_FieldNode = dict[str, tuple["ModelField", tuple[str, ...]]]
+
+
+def iter_nested_object_ids(data_type: "DataType") -> Iterator[str]:
+    """ Yields the identifiers of the objects reachable from the data type (through arrays, maps and unions) """
+
+    match data_type.type:
+        case "object":
+            yield data_type.id
+        case "array":
+            yield from iter_nested_object_ids(data_type.items)
+        case "map":
+            yield from iter_nested_object_ids(data_type.values)
+        case "union":
+            for _type in data_type.types:
+                yield from iter_nested_object_ids(_type)
+
+
+class ReferenceGraph:
+    """ Forward and reverse adjacency of entity references, keyed by entity identifier. """
+
+    def __init__(
+            self,
+            forward: dict[str, list["EntityReference"]],
+            reverse: dict[str, dict[str, list["EntityReference"]]]
+    ):
+        self._forward = forward
+        self._reverse = reverse
+
+    @classmethod
+    def from_entities(cls, entities: dict[str, "Entity"]) -> "ReferenceGraph":
+        """ Builds the graph with a single pass over all entity references. """
+
+        forward: dict[str, list["EntityReference"]] = {}
+        reverse: dict[str, dict[str, list["EntityReference"]]] = {}
+        for _id, entity in entities.items():
+            if not entity.references:
+                continue
+            forward[_id] = entity.references
+            for reference in entity.references:
+                reverse.setdefault(reference.id_entity, {}).setdefault(_id, []).append(reference)
+        return cls(forward=forward, reverse=reverse)
+
+    def get_references(self, id_entity: str) -> list["EntityReference"]:
+        """ Returns the references declared by the provided entity """
+        return self._forward.get(id_entity, [])
+
+    def get_referenced_by(self, id_entity: str) -> dict[str, list["EntityReference"]]:
+        """ Returns the references to the provided entity, grouped by referencing entity """
+        return self._reverse.get(id_entity, {})
+
+
+class FieldPathIndex:
+    """
+    Compiled lookup of the dotted field paths reachable from each entity.
+
+    Every entity and object is compiled once to a node mapping field names to nested objects, so a path lookup
+    walks one node per path segment. Recursive objects are supported, since nodes are shared by object identifier.
+    """
+
+    def __init__(self, entities: dict[str, _FieldNode], objects: dict[str, _FieldNode]):
+        self._entities = entities
+        self._objects = objects
+        self._cache: dict[tuple[str, str], list["ModelField"]] = {}
+
+    @classmethod
+    def from_model(
+            cls,
+            entities: dict[str, "Entity"],
+            objects: dict[str, "DataModelObject"]
+    ) -> "FieldPathIndex":
+        return cls(
+            entities={_id: _compile_fields(entity.fields) for _id, entity in entities.items()},
+            objects={_id: _compile_fields(obj.fields) for _id, obj in objects.items()}
+        )
+
+    def find_fields(self, id_entity: str, field_path: str) -> list["ModelField"]:
+        """ Returns the fields matching the path, more than one when the path crosses a union of objects """
+
+        key = (id_entity, field_path)
+        if (fields := self._cache.get(key)) is None:
+            fields = self._cache[key] = self._find_fields(id_entity, field_path)
+        return fields
+
+    def is_valid(self, id_entity: str, field_path: str) -> bool:
+        """ Returns true if the field path exists in the provided entity """
+        return len(self.find_fields(id_entity, field_path)) > 0
+
+    def _find_fields(self, id_entity: str, field_path: str) -> list["ModelField"]:
+        if (node := self._entities.get(id_entity)) is None:
+            return []
+        nodes = [node]
+        *parents, leaf = field_path.split(".")
+        for name in parents:
+            object_ids = dict.fromkeys(
+                _id
+                for node in nodes
+                if name in node
+                for _id in node[name][1]
+            )
+            nodes = [self._objects[_id] for _id in object_ids if _id in self._objects]
+            if not nodes:
+                return []
+        return [node[leaf][0] for node in nodes if leaf in node]
+
+
+def _compile_fields(fields: dict[str, "ModelField"]) -> _FieldNode:
+    return {
+        _id: (field, tuple(dict.fromkeys(iter_nested_object_ids(field.type))))
+        for _id, field in fields.items()
+    }
@@ -0,0 +1,44 @@
+from functools import cached_property
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+
+from dmdoc.utils.hashing import hash_json
+
+
+def iter_fields(model: BaseModel) -> Iterator[tuple[str, Any]]:
+    """ Iterates over model fields only: unlike `iter(model)`, memoized properties are skipped """
+
+    for name in type(model).model_fields:
+        yield name, getattr(model, name)
+
+
+class MerkleHashMixin(BaseModel):
+    """
+    Adds a Merkle hash to sink models: the hash of a model is computed from its field values,
+    where nested sink models contribute their own hash. Thus, two models can be compared
+    descending only into the children whose hash differs.
+    Hashes are computed once, so models must not be changed once their hash is read.
+    """
+
+    @cached_property
+    def merkle_hash(self) -> str:
+        return hash_json({name: get_hash_content(value) for name, value in iter_fields(self)})
+
+
+def get_hash_content(value: Any) -> Any:
+    """
+    Returns a JSON serializable representation of the value, where sink models are replaced by their hash.
+    Dictionaries are converted to lists of key-value pairs, because their order is meaningful (e.g. field order)
+    and it would be lost by the sorted keys of the hashed JSON.
+    """
+
+    if isinstance(value, MerkleHashMixin):
+        return value.merkle_hash
+    if isinstance(value, BaseModel):
+        return {name: get_hash_content(v) for name, v in iter_fields(value)}
+    if isinstance(value, dict):
+        return [[key, get_hash_content(v)] for key, v in value.items()]
+    if isinstance(value, (list, tuple)):
+        return [get_hash_content(v) for v in value]
+    return value
@@ -1,17 +1,26 @@
-from typing import Optional
+import re
+from enum import StrEnum
+from functools import cached_property
+from typing import Optional, TypeVar
 
 from pydantic import BaseModel, Field, model_validator, field_validator
 
-from dmdoc.core.sink.data_type import EnumValue, DataType
+from dmdoc.core.sink.data_type import EnumValue, DataType, BaseDataType
+from dmdoc.core.sink.index import ReferenceGraph, FieldPathIndex
+from dmdoc.core.sink.merkle import MerkleHashMixin
 
+ID_PATTERN = "[A-Za-z_][A-Za-z0-9_]*"
 
-class DocumentationMixin(BaseModel):
+_M = TypeVar("_M", bound=BaseModel)
+
+
+class DocumentationMixin(MerkleHashMixin):
     aliases: list[str] = Field(description="Additional names or identifiers", default=[])
     doc: Optional[str] = Field(description="Documentation string", default=None)
 
 
-class DataModel(BaseModel):
-    id: str = Field(description="Unique identifier", pattern="[A-Za-z_][A-Za-z0-9_]*")
+class DataModel(MerkleHashMixin):
+    id: str = Field(description="Unique identifier", pattern=ID_PATTERN)
     name: Optional[str] = Field(description="User friendly name", default=None)
     doc: Optional[str] = Field(description="Documentation string", default=None)
     entities: dict[str, "Entity"] = Field(description="List of entities belonging to the data model", min_length=1)
@@ -20,17 +29,43 @@ class DataModel(BaseModel):
 
     @model_validator(mode="after")
     def validate_references(self):
-        for _id, entity in self.entities.items():
-            for reference in entity.references:
-                if (referenced_entity := self.entities.get(reference.id_entity)) is None:
-                    raise ValueError(f"Entity `{_id}` reference an entity that does not exists `{reference.id_entity}`")
-                for mapping in reference.mapping:
-                    if not is_valid_field_path(mapping.source, entity.fields, self.objects):
-                        raise ValueError(f"Source field {mapping.source} is not valid for entity {_id}")
-                    if not is_valid_field_path(mapping.destination, referenced_entity.fields, self.objects):
-                        raise ValueError(f"Target field {mapping.destination} is not valid for entity {_id}")
+        check_references(self)
         return self
 
+    def check_integrity(self):
+        """
+        Checks the constraints that validation would enforce on the whole data model.
+        It is meant for data models built without validation (see `construct_model`).
+        :raise ValueError: if any constraint is not satisfied
+        """
+
+        if not isinstance(self.id, str) or not re.search(ID_PATTERN, self.id):
+            raise ValueError(f"Data model identifier `{self.id}` does not match pattern {ID_PATTERN}")
+        if not self.entities:
+            raise ValueError("Data model must define at least one entity")
+        for _id, obj in [*self.entities.items(), *self.objects.items()]:
+            if not obj.fields:
+                raise ValueError(f"Object `{_id}` must define at least one field")
+            for field in obj.fields.values():
+                if not isinstance(field.type, BaseDataType):
+                    raise ValueError(f"Field `{field.name}` of object `{_id}` has an invalid data type: {field.type}")
+            check_unique_names(obj.fields)
+        for _id, enum in self.enums.items():
+            if not enum.values:
+                raise ValueError(f"Enum `{_id}` must define at least one value")
+            check_unique_values(enum.values)
+        check_references(self)
+
+    @cached_property
+    def reference_graph(self) -> ReferenceGraph:
+        """ Forward and reverse references between entities, computed once. """
+        return ReferenceGraph.from_entities(self.entities)
+
+    @cached_property
+    def field_path_index(self) -> FieldPathIndex:
+        """ Lookup of the field paths reachable from each entity, computed once. """
+        return FieldPathIndex.from_model(self.entities, self.objects)
+
 
 class BaseObject(DocumentationMixin):
     fields: dict[str, "ModelField"] = Field(description="List of fields", min_length=1)
@@ -39,15 +74,19 @@ class BaseObject(DocumentationMixin):
     @field_validator("fields")
     @classmethod
     def check_unique_names(cls, fields: dict[str, "ModelField"]) -> dict[str, "ModelField"]:
-        seen_ids = set()
-        duplicates = [f for f in fields.values() if f.name in seen_ids or seen_ids.add(f.name)]
-        if len(duplicates):
-            raise ValueError(f"Duplicated fields identifiers are not allowed: {duplicates}")
+        check_unique_names(fields)
         return fields
 
 
 class DataModelEnum(DocumentationMixin):
-    values: set["EnumValue"] = Field(description="List of allowed values", min_length=1)
+    values: list["EnumValue"] = Field(description="List of allowed values, in declaration order", min_length=1)
+
+    # noinspection PyNestedDecorators
+    @field_validator("values")
+    @classmethod
+    def check_unique_values(cls, values: list["EnumValue"]) -> list["EnumValue"]:
+        check_unique_values(values)
+        return values
 
 
 class DataModelObject(BaseObject):
@@ -56,25 +95,56 @@ class DataModelObject(BaseObject):
 
 class Entity(BaseObject):
     references: list["EntityReference"] = Field(description="External references to other entities", default=[])
+    indexes: Optional[list["EntityIndex"]] = Field(
+        description="Indexes, including the ones backing primary keys and unique constraints. "
+                    "None if the source does not capture indexes",
+        default=None
+    )
+    statistics: Optional["EntityStatistics"] = Field(
+        description="Volume statistics, collected from a database when requested by the source",
+        default=None
+    )
+
+
+class IndexKind(StrEnum):
+    PRIMARY_KEY = "primary_key"
+    UNIQUE_CONSTRAINT = "unique_constraint"
+    INDEX = "index"
+    TEXT = "text"
+    TTL = "ttl"
 
 
-class EntityReference(BaseModel):
+class EntityIndex(MerkleHashMixin):
+    name: Optional[str] = Field(description="Index name", default=None)
+    fields: list[str] = Field(description="Indexed field names, in index order", min_length=1)
+    kind: IndexKind = Field(description="How the index is declared", default=IndexKind.INDEX)
+    is_unique: bool = Field(description="Whether the index is unique or not", default=False)
+    expire_after_seconds: Optional[int] = Field(description="Expiration of documents of TTL indexes", default=None)
+
+
+class EntityStatistics(MerkleHashMixin):
+    row_count: Optional[int] = Field(description="Number of rows, it may be estimated", default=None)
+    size: Optional[int] = Field(description="Estimated size in bytes, including indexes", default=None)
+
+
+class EntityReference(MerkleHashMixin):
     id_entity: str = Field(description="Referenced entity")
     name: Optional[str] = Field(description="Reference name", default=None)
     mapping: list["FieldReference"] = Field(description="References")
 
 
-class FieldReference(BaseModel):
+class FieldReference(MerkleHashMixin):
     source: str = Field(description="Source field name")
     destination: str = Field(description="Target field name")
 
 
-class ModelField(BaseModel):
+class ModelField(MerkleHashMixin):
     name: str = Field(description="Field name")
     type: "DataType" = Field(description="Field data type")
     doc: Optional[str] = Field(description="Documentation string", default=None)
     is_key: bool = Field(description="Whether the field is part of key or not", default=False)
     is_required: bool = Field(description="Whether the field is required or not", default=False)
+    is_indexed: bool = Field(description="Whether the field is the leading field of an index or not", default=False)
 
     # noinspection PyNestedDecorators
     @model_validator(mode="before")
@@ -87,6 +157,53 @@ class ModelField(BaseModel):
         return model
 
 
+def construct_model(model_class: type[_M], **values) -> _M:
+    """
+    Builds a sink model without validation, missing fields are set to their default value.
+    Meant for built-in sources, which already provide well typed values:
+    the resulting data model should be checked once with `DataModel.check_integrity`.
+    """
+    return model_class.model_construct(**values)
+
+
+def check_unique_names(fields: dict[str, "ModelField"]):
+    seen_ids = set()
+    duplicates = [f for f in fields.values() if f.name in seen_ids or seen_ids.add(f.name)]
+    if len(duplicates):
+        raise ValueError(f"Duplicated fields identifiers are not allowed: {duplicates}")
+
+
+def check_unique_values(values: list["EnumValue"]):
+    seen_values = set()
+    duplicates = [v for v in values if v.value in seen_values or seen_values.add(v.value)]
+    if len(duplicates):
+        raise ValueError(f"Duplicated enum values are not allowed: {duplicates}")
+
+
+def check_references(data_model: DataModel):
+    """ Checks that references point to existing entities and fields """
+
+    field_paths = data_model.field_path_index
+    for _id, entity in data_model.entities.items():
+        for reference in entity.references:
+            if reference.id_entity not in data_model.entities:
+                raise ValueError(f"Entity `{_id}` reference an entity that does not exists `{reference.id_entity}`")
+            for mapping in reference.mapping:
+                if not field_paths.is_valid(_id, mapping.source):
+                    raise ValueError(f"Source field {mapping.source} is not valid for entity {_id}")
+                if not field_paths.is_valid(reference.id_entity, mapping.destination):
+                    raise ValueError(f"Target field {mapping.destination} is not valid for entity {_id}")
+
+
+def dump_data_model(data_model: DataModel) -> str:
+    return data_model.model_dump_json()
+
+
+def get_data_model_hash(data_model: DataModel) -> str:
+    """ Returns a canonical hash of the data model content, see `MerkleHashMixin` """
+    return data_model.merkle_hash
+
+
 def get_python_class_id(python_class: type) -> str:
     return f"{python_class.__module__}.{python_class.__name__}"
 
@@ -94,17 +211,7 @@ def get_python_class_id(python_class: type) -> str:
 def find_reversed_references(id_entity: str, data_model: DataModel) -> dict[str, list[EntityReference]]:
     """ Find all entities that reference the provided entity """
 
-    references: dict[str, list[EntityReference]] = {}
-    for _id, entity in data_model.entities.items():
-        if not entity.references:
-            continue
-        current_references = []
-        for reference in entity.references:
-            if reference.id_entity == id_entity:
-                current_references.append(reference)
-        if current_references:
-            references[_id] = current_references
-    return references
+    return data_model.reference_graph.get_referenced_by(id_entity)
 
 
 def is_valid_field_path(
@@ -142,7 +249,7 @@ def _is_valid_field_path(
         nested_object = available_objects[data_type.values.id]
     elif data_type.type == "union":
         for _type in data_type.types:
-            if _is_valid_field_path(field_path, data_type, available_objects, prefixes):
+            if _is_valid_field_path(field_path, _type, available_objects, prefixes):
                 return True
     if (
             nested_object is not None and
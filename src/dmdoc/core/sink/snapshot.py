@@ -0,0 +1,252 @@
+import json
+import mmap
+import struct
+from itertools import accumulate
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from dmdoc.core.sink.data_type import DataType, create_datatype
+from dmdoc.core.sink.model import (
+    DataModel, Entity, DataModelObject, DataModelEnum, EnumValue, ModelField, EntityReference, FieldReference,
+    EntityStatistics, EntityIndex
+)
+
+SNAPSHOT_VERSION = 1
+
+_M = TypeVar("_M", bound=BaseModel)
+
+_MAGIC = b"DMDS"
+_HEADER = struct.Struct("<4sHH")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_INT = 3
+_TAG_FLOAT = 4
+_TAG_STR = 5
+_TAG_LIST = 6
+_TAG_DICT = 7
+
+
+class _Encoder:
+
+    def __init__(self):
+        self._strings: dict[str, int] = {}
+        self._body = bytearray()
+
+    def _string_index(self, value: str) -> bytes:
+        if (index := self._strings.get(value)) is None:
+            index = self._strings[value] = len(self._strings)
+        return _U32.pack(index)
+
+    def encode(self, value: Any):
+        body = self._body
+        if value is None:
+            body.append(_TAG_NONE)
+        elif value is True:
+            body.append(_TAG_TRUE)
+        elif value is False:
+            body.append(_TAG_FALSE)
+        elif isinstance(value, int):
+            body.append(_TAG_INT)
+            body += _I64.pack(value)
+        elif isinstance(value, float):
+            body.append(_TAG_FLOAT)
+            body += _F64.pack(value)
+        elif isinstance(value, str):
+            body.append(_TAG_STR)
+            body += self._string_index(value)
+        elif isinstance(value, (list, tuple, set)):
+            body.append(_TAG_LIST)
+            body += _U32.pack(len(value))
+            for item in value:
+                self.encode(item)
+        elif isinstance(value, dict):
+            body.append(_TAG_DICT)
+            body += _U32.pack(len(value))
+            for key, item in value.items():
+                body += self._string_index(key)
+                self.encode(item)
+        else:
+            raise TypeError(f"Unsupported snapshot value of type {type(value)}")
+
+    def to_bytes(self) -> bytes:
+        encoded_strings = [value.encode() for value in self._strings]
+        offsets = list(accumulate(len(encoded_string) for encoded_string in encoded_strings))
+        return b"".join([
+            _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, 0),
+            _U32.pack(len(offsets)),
+            struct.pack(f"<{len(offsets)}I", *offsets),
+            *encoded_strings,
+            self._body
+        ])
+
+
+class _Decoder:
+
+    def __init__(self, buffer: memoryview):
+        self._buffer = buffer
+        magic, version, _ = _HEADER.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Invalid snapshot: magic bytes do not match")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}, expected {SNAPSHOT_VERSION}")
+        position = _HEADER.size
+        (count,) = _U32.unpack_from(buffer, position)
+        position += _U32.size
+        offsets = struct.unpack_from(f"<{count}I", buffer, position)
+        position += _U32.size * count
+        blob = bytes(buffer[position:position + (offsets[-1] if count else 0)])
+        start = 0
+        self._strings: list[str] = []
+        for end in offsets:
+            self._strings.append(blob[start:end].decode())
+            start = end
+        self._position = position + len(blob)
+
+    def decode(self) -> Any:
+        buffer = self._buffer
+        strings = self._strings
+        unpack_u32 = _U32.unpack_from
+
+        def decode_value(position: int) -> tuple[Any, int]:
+            tag = buffer[position]
+            position += 1
+            if tag == _TAG_STR:
+                return strings[unpack_u32(buffer, position)[0]], position + 4
+            if tag == _TAG_DICT:
+                value = {}
+                count = unpack_u32(buffer, position)[0]
+                position += 4
+                for _ in range(count):
+                    key = strings[unpack_u32(buffer, position)[0]]
+                    value[key], position = decode_value(position + 4)
+                return value, position
+            if tag == _TAG_LIST:
+                value = []
+                count = unpack_u32(buffer, position)[0]
+                position += 4
+                for _ in range(count):
+                    item, position = decode_value(position)
+                    value.append(item)
+                return value, position
+            if tag == _TAG_NONE:
+                return None, position
+            if tag == _TAG_TRUE:
+                return True, position
+            if tag == _TAG_FALSE:
+                return False, position
+            if tag == _TAG_INT:
+                return _I64.unpack_from(buffer, position)[0], position + 8
+            if tag == _TAG_FLOAT:
+                return _F64.unpack_from(buffer, position)[0], position + 8
+            raise ValueError(f"Invalid snapshot: unknown tag {tag} at position {position - 1}")
+
+        value, self._position = decode_value(self._position)
+        return value
+
+
+def dump_snapshot(data_model: DataModel) -> bytes:
+    """
+    Encodes the data model to a snapshot, laid out as follows (integers are little endian):
+    * header: magic bytes `DMDS`, format version (u16), flags (u16);
+    * string table: number of strings (u32), end offset of each string (u32), UTF-8 encoded strings;
+    * body: the data model content as a tree of tagged values, i.e. a tag byte followed by an i64, an f64,
+      a string table index (u32) or a number of items (u32) followed by the items (dict keys are string indexes).
+      Distinct data types are stored once in a table, fields refer to them by index.
+    """
+
+    content = data_model.model_dump(mode="json")
+    # distinct data types are stored once and referenced by index from fields
+    datatypes: dict[str, int] = {}
+    for obj in [*content["entities"].values(), *content["objects"].values()]:
+        for field in obj["fields"].values():
+            key = json.dumps(field["type"], sort_keys=True)
+            field["type"] = datatypes.setdefault(key, len(datatypes))
+    encoder = _Encoder()
+    encoder.encode({
+        "datatypes": [json.loads(key) for key in datatypes],
+        "model": content
+    })
+    return encoder.to_bytes()
+
+
+def parse_snapshot(buffer: bytes | memoryview) -> DataModel:
+    with memoryview(buffer) as view:
+        content = _Decoder(view).decode()
+    datatypes = [_construct_datatype(datatype) for datatype in content["datatypes"]]
+    return _construct_data_model(content["model"], datatypes)
+
+
+def save_snapshot(data_model: DataModel, filepath: str):
+    with open(filepath, mode="wb") as f:
+        f.write(dump_snapshot(data_model))
+
+
+def load_snapshot(filepath: str) -> DataModel:
+    """
+    Loads a snapshot from a read-only memory map. The data model is rebuilt without validation,
+    since its content was validated before being saved.
+    """
+
+    with open(filepath, mode="rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return parse_snapshot(buffer)
+
+
+def _construct(model_class: type[_M], values: dict) -> _M:
+    """ Same as `model_construct`, but faster since snapshot values include all fields (no default is needed) """
+
+    instance = model_class.__new__(model_class)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_extra__", None)
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _construct_datatype(content: str | dict) -> DataType:
+    if isinstance(content, str):
+        return create_datatype(type=content)
+    return create_datatype(**content)
+
+
+def _construct_fields(content: dict, datatypes: list[DataType]) -> dict[str, ModelField]:
+    for field in content.values():
+        field["type"] = datatypes[field["type"]]
+    return {_id: _construct(ModelField, field) for _id, field in content.items()}
+
+
+def _construct_entity(content: dict, datatypes: list[DataType]) -> Entity:
+    content["fields"] = _construct_fields(content["fields"], datatypes)
+    for reference in content["references"]:
+        reference["mapping"] = [_construct(FieldReference, mapping) for mapping in reference["mapping"]]
+    content["references"] = [_construct(EntityReference, reference) for reference in content["references"]]
+    if content["indexes"] is not None:
+        content["indexes"] = [_construct(EntityIndex, index) for index in content["indexes"]]
+    if content["statistics"] is not None:
+        content["statistics"] = _construct(EntityStatistics, content["statistics"])
+    return _construct(Entity, content)
+
+
+def _construct_object(content: dict, datatypes: list[DataType]) -> DataModelObject:
+    content["fields"] = _construct_fields(content["fields"], datatypes)
+    return _construct(DataModelObject, content)
+
+
+def _construct_enum(content: dict) -> DataModelEnum:
+    content["values"] = [_construct(EnumValue, value) for value in content["values"]]
+    return _construct(DataModelEnum, content)
+
+
+def _construct_data_model(content: dict, datatypes: list[DataType]) -> DataModel:
+    """ Builds the data model in place of the decoded content, without validation """
+
+    content["entities"] = {_id: _construct_entity(entity, datatypes) for _id, entity in content["entities"].items()}
+    content["objects"] = {_id: _construct_object(obj, datatypes) for _id, obj in content["objects"].items()}
+    content["enums"] = {_id: _construct_enum(enum) for _id, enum in content["enums"].items()}
+    return _construct(DataModel, content)
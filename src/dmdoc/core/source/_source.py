@@ -1,6 +1,6 @@
 import abc
 import logging
-from typing import Type
+from typing import Type, Optional
 
 from pydantic import BaseModel
 
@@ -31,6 +31,15 @@ class Source(abc.ABC):
         """ Actual implementation to produce the data model. """
         ...
 
+    def get_input_files(self) -> Optional[list[str]]:
+        """
+        Returns the files read by the source besides imported Python modules (e.g. a snapshot or a SQLite database),
+        so that the build cache reuses the data model only while they are unchanged.
+        None means the source reads inputs that cannot be tracked (e.g. a database server): it is never cached.
+        """
+
+        return []
+
     @classmethod
     @abc.abstractmethod
     def get_config_class(cls) -> Type[BaseModel]:
@@ -1,13 +1,19 @@
 from datetime import datetime, date, time
 from decimal import Decimal
 from enum import Enum
-from typing import Type, Iterable, Optional
+from typing import Type, Iterable, Optional, Any
 
 from beanie import Document, PydanticObjectId
-from pydantic import BaseModel, Field
-
-from dmdoc.core.sink.data_type import create_datatype, EnumValue
-from dmdoc.core.sink.model import DataModel, Entity, ModelField, DataModelObject, DataModelEnum, get_python_class_id
+from beanie.odm.utils.typing import get_index_attributes
+from pydantic import BaseModel, Field, TypeAdapter
+from pymongo import IndexModel, TEXT
+
+from dmdoc.core.sink.analysis import get_leading_fields
+from dmdoc.core.sink.data_type import DataType, create_datatype, EnumValue
+from dmdoc.core.sink.model import (
+    DataModel, Entity, ModelField, DataModelObject, DataModelEnum, EntityReference, EntityIndex, IndexKind,
+    get_python_class_id, construct_model
+)
 from dmdoc.core.source import Source
 from dmdoc.utils.exception import DataTypeResolutionError
 from dmdoc.utils.importing import import_object
@@ -17,20 +23,109 @@ def _get_doc_from_model_class(model_class: type[BaseModel]):
     return model_class.model_config.get("title")
 
 
-def _get_references_from_model_class(model_class: type[BaseModel]):
+_references_adapter = TypeAdapter(list[EntityReference])
+
+
+def _get_references_from_model_class(model_class: type[BaseModel]) -> list[EntityReference]:
     if hasattr(model_class, "DmDocConfig"):
         config = model_class.DmDocConfig
         if hasattr(config, "references"):
-            return config.references
+            # references are written by users, hence they are validated
+            return _references_adapter.validate_python(config.references)
     return []
 
 
+def _get_annotation_args(annotation) -> list:
+    """ Returns the distinct arguments of a generic annotation, except None, in declaration order """
+
+    annotation_args = []
+    # noinspection PyUnresolvedReferences
+    for annotation_arg in annotation.__args__:
+        if annotation_arg is not type(None) and annotation_arg not in annotation_args:
+            annotation_args.append(annotation_arg)
+    return annotation_args
+
+
 def get_collection_name(document_class: type[Document]):
     if hasattr(document_class, "Settings") and hasattr(document_class.Settings, "name"):
         return document_class.Settings.name
     return document_class.__name__
 
 
+def _get_field_names(model_class: type[BaseModel]) -> dict[str, str]:
+    """ Returns field names indexed by their key in MongoDB documents, e.g. `_id` -> `id` """
+
+    return {field_info.alias or name: name for name, field_info in model_class.model_fields.items()}
+
+
+def _get_field_path(key: str, field_names: dict[str, str]) -> str:
+    head, separator, tail = key.partition(".")
+    return field_names.get(head, head) + separator + tail
+
+
+def _get_settings_indexes(document_class: type[Document]) -> list:
+    """ Returns the indexes declared in `Settings`, including the ones of parent documents if they are merged """
+
+    settings = getattr(document_class, "Settings", None)
+    if not getattr(settings, "merge_indexes", False):
+        return list(getattr(settings, "indexes", []))
+    indexes = []
+    for parent_class in reversed(document_class.__mro__):
+        if isinstance(parent_class, type) and issubclass(parent_class, Document) and parent_class != Document:
+            indexes.extend(getattr(parent_class.__dict__.get("Settings"), "indexes", []))
+    return indexes
+
+
+def _convert_index(index_model: IndexModel, field_names: dict[str, str]) -> EntityIndex:
+    document = index_model.document
+    keys = list(document["key"].items())
+    if any(direction == TEXT for _, direction in keys):
+        kind = IndexKind.TEXT
+    elif "expireAfterSeconds" in document:
+        kind = IndexKind.TTL
+    else:
+        kind = IndexKind.INDEX
+    return construct_model(
+        EntityIndex,
+        name=document.get("name"),
+        fields=[_get_field_path(key, field_names) for key, _ in keys],
+        kind=kind,
+        is_unique=bool(document.get("unique", False)),
+        expire_after_seconds=document.get("expireAfterSeconds")
+    )
+
+
+def get_entity_indexes(document_class: type[Document]) -> list[EntityIndex]:
+    """
+    Returns the indexes of the document collection, read from the class definition without connecting to MongoDB:
+    the default `_id` index, fields annotated with `Indexed` and `Settings.indexes`, in this order.
+    Indexes with the same name are defined once, as Beanie does.
+    """
+
+    field_names = _get_field_names(document_class)
+    index_models = []
+    for name, field_info in document_class.model_fields.items():
+        if (index_attributes := get_index_attributes(field_info)) is not None:
+            index_type, index_options = index_attributes
+            index_models.append(IndexModel([(field_info.alias or name, index_type)], **index_options))
+    for index in _get_settings_indexes(document_class):
+        index_models.append(index if isinstance(index, IndexModel) else IndexModel(index))
+
+    indexes = {
+        "_id_": construct_model(
+            EntityIndex,
+            name="_id_",
+            fields=[field_names.get("_id", "_id")],
+            kind=IndexKind.PRIMARY_KEY,
+            is_unique=True
+        )
+    }
+    for index_model in index_models:
+        index = _convert_index(index_model, field_names)
+        indexes.setdefault(index.name, index)
+    return list(indexes.values())
+
+
 class BeanieSourceConfig(BaseModel):
     id: str = Field(description="Unique identifier", pattern="[A-Za-z_][A-Za-z0-9_]*")
     name: Optional[str] = Field(description="User friendly name", default=None)
@@ -52,6 +147,12 @@ class BeanieSource(Source):
         super().__init__(*args, **kwargs)
         self._objects: dict[str, "DataModelObject"] = {}
         self._enums: dict[str, "DataModelEnum"] = {}
+        # object and enum identifier -> python class, to detect different classes with the same name
+        self._classes: dict[str, type] = {}
+        # identifiers of the objects whose fields are being extracted, to detect cycles
+        self._pending_objects: set[str] = set()
+        # (annotation, representation) -> data type, resolved once for each parse
+        self._resolved_types: dict[tuple[Any, str], DataType] = {}
 
     def _do_parse(self) -> DataModel:
         document_classes: Iterable[type[Document]] = import_object(self._config.classes)
@@ -67,7 +168,8 @@ class BeanieSource(Source):
                     f"Document class {model_class} must inherit from {Document}"
                 )
             entities[get_collection_name(model_class)] = self._convert_entity(model_class)
-        return DataModel(
+        data_model = construct_model(
+            DataModel,
             id=self._config.id,
             name=self._config.name,
             doc=self._config.doc,
@@ -75,22 +177,24 @@ class BeanieSource(Source):
             objects=self._objects,
             enums=self._enums
         )
+        data_model.check_integrity()
+        return data_model
 
-    def _convert_map(self, annotation_args: set):
+    def _convert_map(self, annotation_args: list):
         if len(annotation_args) != 1:
             raise DataTypeResolutionError(
                 f"Map conversion failed: expected exactly one annotation argument, found {annotation_args}"
             )
         return create_datatype(
             type="map",
-            values=self._resolve_type(annotation_args.pop())
+            values=self._resolve_type(annotation_args[0])
         )
 
-    def _convert_array(self, annotation_args: set):
+    def _convert_array(self, annotation_args: list):
         if len(annotation_args) != 1:
             raise DataTypeResolutionError(f"Expected exactly one annotation argument, found [{annotation_args}]")
         elif len(annotation_args) == 1:
-            items_type = self._resolve_type(annotation_args.pop())
+            items_type = self._resolve_type(annotation_args[0])
         else:
             items_type = self._convert_union(annotation_args)
         return create_datatype(
@@ -98,11 +202,11 @@ class BeanieSource(Source):
             items=items_type
         )
 
-    def _convert_union(self, annotations: set):
+    def _convert_union(self, annotations: list):
         if len(annotations) == 0:
             raise DataTypeResolutionError(f"Expected at least one annotation, found {annotations}")
         elif len(annotations) == 1:
-            return self._resolve_type(annotations.pop())
+            return self._resolve_type(annotations[0])
 
         return create_datatype(
             type="union",
@@ -112,37 +216,64 @@ class BeanieSource(Source):
             ]
         )
 
+    def _get_class_id(self, python_class: type) -> str:
+        """
+        Returns the identifier of an object or enum class, i.e. its name.
+        :raise DataTypeResolutionError: if a different class with the same name was already converted
+        """
+
+        _id = python_class.__name__
+        if (registered_class := self._classes.setdefault(_id, python_class)) is not python_class:
+            raise DataTypeResolutionError(
+                f"Classes `{get_python_class_id(registered_class)}` and `{get_python_class_id(python_class)}` "
+                f"have the same name `{_id}`"
+            )
+        return _id
+
     def _convert_enum(self, enum_class: type[Enum]):
-        if enum_class.__name__ not in self._enums:
-            self._enums[enum_class.__name__] = DataModelEnum(
+        _id = self._get_class_id(enum_class)
+        if _id not in self._enums:
+            self._enums[_id] = construct_model(
+                DataModelEnum,
                 aliases=[get_python_class_id(enum_class)],
-                values={
-                    EnumValue(
+                values=[
+                    construct_model(
+                        EnumValue,
                         name=value.name,
                         value=str(value.value)
                     )
                     for value in enum_class
-                }
+                ]
             )
         return create_datatype(
             type="enum",
-            id=enum_class.__name__
+            id=_id
         )
 
     def _convert_object(self, python_class: type[BaseModel]):
-        full_name = get_python_class_id(python_class)
-        if full_name not in self._objects:
-            self._objects[python_class.__name__] = DataModelObject(
-                aliases=[full_name],
-                fields=self._extract_fields(python_class),
+        _id = self._get_class_id(python_class)
+        # objects referencing themselves (directly or not) only need the identifier while fields are being extracted
+        if _id not in self._objects and _id not in self._pending_objects:
+            self._pending_objects.add(_id)
+            try:
+                fields = self._extract_fields(python_class)
+            finally:
+                self._pending_objects.discard(_id)
+            self._objects[_id] = construct_model(
+                DataModelObject,
+                aliases=[get_python_class_id(python_class)],
+                fields=fields,
                 doc=_get_doc_from_model_class(python_class)
             )
         return create_datatype(
             type="object",
-            id=python_class.__name__
+            id=_id
         )
 
     def _create_type_from_python_class(self, python_class: type):
+        if hasattr(python_class, "_indexed"):
+            # types created by `Indexed(<type>)` are subclasses of the annotated type
+            python_class = python_class.__bases__[0]
         if python_class == str:
             return create_datatype(type="string")
         if python_class == int:
@@ -171,13 +302,23 @@ class BeanieSource(Source):
 
         raise DataTypeResolutionError(f"Cannot resolve data type for python class {python_class}")
 
-    def _resolve_type(self, annotation):
+    def _resolve_type(self, annotation) -> DataType:
+        # unions are equal regardless of the order of their arguments, unlike their representation
+        key = (annotation, repr(annotation))
+        try:
+            data_type = self._resolved_types.get(key)
+        except TypeError:
+            # unhashable annotation
+            return self._do_resolve_type(annotation)
+        if data_type is None:
+            data_type = self._resolved_types[key] = self._do_resolve_type(annotation)
+        return data_type
+
+    def _do_resolve_type(self, annotation) -> DataType:
         if isinstance(annotation, type):
             return self._create_type_from_python_class(annotation)
 
-        # noinspection PyUnresolvedReferences
-        annotation_args = set(annotation.__args__)
-        annotation_args.discard(type(None))
+        annotation_args = _get_annotation_args(annotation)
         if hasattr(annotation, "__name__"):
             annotation_name = annotation.__name__
         else:
@@ -194,7 +335,7 @@ class BeanieSource(Source):
         if len(annotation_args) != 1:
             raise DataTypeResolutionError(f"Expected exactly one annotation argument, found [{annotation_args}]")
 
-        return self._create_type_from_python_class(annotation_args.pop())
+        return self._resolve_type(annotation_args[0])
 
     def _extract_fields(self, model_class: type[BaseModel]):
         model_class.model_rebuild()
@@ -207,7 +348,8 @@ class BeanieSource(Source):
                 data_type = self._resolve_type(field_info.annotation)
             except Exception as e:
                 raise DataTypeResolutionError(f"Failed to resolve type for field `{name}`") from e
-            fields[name] = ModelField(
+            fields[name] = construct_model(
+                ModelField,
                 name=name,
                 type=data_type,
                 doc=field_info.description,
@@ -217,9 +359,16 @@ class BeanieSource(Source):
 
     def _convert_entity(self, model_class: type[Document]):
         fields = self._extract_fields(model_class)
-        return Entity(
+        indexes = get_entity_indexes(model_class)
+        for name in get_leading_fields(indexes):
+            if name in fields:
+                # entity fields are not shared, thus they can be updated
+                fields[name].is_indexed = True
+        return construct_model(
+            Entity,
             aliases=[get_python_class_id(model_class)],
             doc=_get_doc_from_model_class(model_class),
             fields=fields,
-            references=_get_references_from_model_class(model_class)
+            references=_get_references_from_model_class(model_class),
+            indexes=indexes
         )
@@ -0,0 +1,240 @@
+from typing import Iterable, Optional, Any
+
+from pydantic import BaseModel, Field, TypeAdapter
+from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
+from pydantic_core import core_schema
+
+from dmdoc.core.sink.data_type import DataType, create_datatype, EnumValue
+from dmdoc.core.sink.model import (
+    DataModel, Entity, ModelField, DataModelObject, DataModelEnum, get_python_class_id, construct_model
+)
+from dmdoc.core.source import Source
+from dmdoc.utils.exception import DataTypeResolutionError
+from dmdoc.utils.importing import import_object
+
+_REF_PREFIX = "#/$defs/"
+# names of enum members, which are missing from standard JSON schemas
+_ENUM_NAMES_KEY = "x-dmdoc-enum-names"
+
+# JSON schema `format` of strings -> sink type name
+_STRING_FORMATS = {
+    "date-time": "datetime",
+    "date": "date",
+    "time": "time",
+    "binary": "bytes",
+    "base64": "bytes"
+}
+
+_PRIMITIVE_TYPES = {
+    "integer": "integer",
+    "number": "number",
+    "boolean": "boolean"
+}
+
+
+def get_ref_name(ref: str) -> str:
+    if not ref.startswith(_REF_PREFIX):
+        raise DataTypeResolutionError(f"Unsupported JSON schema reference `{ref}`, expected a `{_REF_PREFIX}` one")
+    return ref[len(_REF_PREFIX):]
+
+
+def is_enum_schema(schema: dict) -> bool:
+    return "enum" in schema and "properties" not in schema
+
+
+class _EnumNamesJsonSchema(GenerateJsonSchema):
+    """ Adds the names of enum members to the JSON schema of enum classes """
+
+    def enum_schema(self, schema: core_schema.EnumSchema) -> JsonSchemaValue:
+        json_schema = super().enum_schema(schema)
+        json_schema[_ENUM_NAMES_KEY] = [member.name for member in schema["members"]]
+        return json_schema
+
+
+class PydanticSourceConfig(BaseModel):
+    id: str = Field(description="Unique identifier", pattern="[A-Za-z_][A-Za-z0-9_]*")
+    name: Optional[str] = Field(description="User friendly name, by default the identifier", default=None)
+    doc: Optional[str] = Field(description="Documentation string", default=None)
+    models: str = Field(
+        description="Path to an iterable of model classes (extending `pydantic.BaseModel`), which are the entities of "
+                    "the data model, defined as <package-path>:<iterable-name>"
+    )
+    by_alias: bool = Field(description="If true, fields are named after their alias", default=True)
+
+
+class PydanticSource(Source):
+    """
+    Reads plain Pydantic models through their JSON schema, generated once for all models.
+    Models referenced by fields are converted once from the shared `$defs`, thus fields only refer to them by name
+    and recursive models need no special handling.
+    """
+
+    _config: PydanticSourceConfig
+
+    @classmethod
+    def get_config_class(cls) -> type[PydanticSourceConfig]:
+        return PydanticSourceConfig
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._definitions: dict[str, dict] = {}
+        # names of the object definitions referenced by fields
+        self._referenced_objects: set[str] = set()
+        self._fields: dict[str, dict[str, ModelField]] = {}
+
+    def _do_parse(self) -> DataModel:
+        model_classes: Iterable[type[BaseModel]] = import_object(self._config.models)
+        if not isinstance(model_classes, Iterable):
+            raise ValueError(f"Models iterable {self._config.models} is not an iterable")
+        model_classes = list(model_classes)
+        if not model_classes:
+            raise ValueError(f"Models iterable {self._config.models} is empty")
+        for model_class in model_classes:
+            if not isinstance(model_class, type) or not issubclass(model_class, BaseModel):
+                raise ValueError(f"Model class {model_class} must inherit from {BaseModel}")
+
+        # a single schema generation for all models: shared models are defined once in `$defs`
+        schema = TypeAdapter(tuple[*model_classes]).json_schema(
+            by_alias=self._config.by_alias,
+            schema_generator=_EnumNamesJsonSchema
+        )
+        self._definitions = schema.get("$defs", {})
+        entity_names = []
+        for model_class, item_schema in zip(model_classes, schema["prefixItems"]):
+            if "$ref" in item_schema:
+                entity_names.append(get_ref_name(item_schema["$ref"]))
+            else:
+                # models that are not referenced elsewhere may be inlined
+                entity_names.append(model_class.__name__)
+                self._definitions.setdefault(model_class.__name__, item_schema)
+
+        entities = {
+            name: construct_model(
+                Entity,
+                aliases=[get_python_class_id(model_class)],
+                doc=self._definitions[name].get("description"),
+                fields=self._get_fields(name)
+            )
+            for model_class, name in zip(model_classes, entity_names)
+        }
+        enums = {
+            name: self._convert_enum(definition)
+            for name, definition in self._definitions.items()
+            if is_enum_schema(definition)
+        }
+        objects = {}
+        # converting objects may reference further objects
+        while pending_objects := self._referenced_objects - objects.keys():
+            for name in sorted(pending_objects):
+                objects[name] = construct_model(
+                    DataModelObject,
+                    doc=self._definitions[name].get("description"),
+                    fields=self._get_fields(name)
+                )
+        data_model = construct_model(
+            DataModel,
+            id=self._config.id,
+            name=self._config.name or self._config.id,
+            doc=self._config.doc,
+            entities=entities,
+            objects=objects,
+            enums=enums
+        )
+        data_model.check_integrity()
+        return data_model
+
+    def _get_fields(self, name: str) -> dict[str, ModelField]:
+        """ Returns the fields of a model definition, converted once even if the model is entity and object too """
+
+        if (fields := self._fields.get(name)) is None:
+            fields = self._fields[name] = self._convert_fields(self._definitions[name])
+        return fields
+
+    def _convert_fields(self, schema: dict) -> dict[str, ModelField]:
+        required = set(schema.get("required", []))
+        fields = {}
+        for name, field_schema in schema.get("properties", {}).items():
+            try:
+                data_type = self._resolve_type(field_schema)
+            except (Exception, DataTypeResolutionError) as e:
+                raise DataTypeResolutionError(f"Failed to resolve type for field `{name}`") from e
+            fields[name] = construct_model(
+                ModelField,
+                name=name,
+                type=data_type,
+                doc=field_schema.get("description"),
+                is_required=name in required
+            )
+        return fields
+
+    @staticmethod
+    def _convert_enum(schema: dict) -> DataModelEnum:
+        # enums defined without a class (e.g. by a custom JSON schema) have no member names
+        names = schema.get(_ENUM_NAMES_KEY) or [str(value) for value in schema["enum"]]
+        return construct_model(
+            DataModelEnum,
+            doc=schema.get("description"),
+            values=[
+                construct_model(
+                    EnumValue,
+                    name=name,
+                    value=str(value)
+                )
+                for name, value in zip(names, schema["enum"])
+            ]
+        )
+
+    def _resolve_ref(self, ref: str) -> DataType:
+        name = get_ref_name(ref)
+        if name not in self._definitions:
+            raise DataTypeResolutionError(f"Missing JSON schema definition `{name}`")
+        if is_enum_schema(self._definitions[name]):
+            return create_datatype(type="enum", id=name)
+        self._referenced_objects.add(name)
+        return create_datatype(type="object", id=name)
+
+    def _resolve_union(self, schemas: list[dict]) -> DataType:
+        schemas = [schema for schema in schemas if schema.get("type") != "null"]
+        if not schemas:
+            raise DataTypeResolutionError("Union types that only allow null are not supported")
+        if len(schemas) == 1:
+            return self._resolve_type(schemas[0])
+        types = []
+        for schema in schemas:
+            if (data_type := self._resolve_type(schema)) not in types:
+                types.append(data_type)
+        if len(types) == 1:
+            return types[0]
+        return create_datatype(type="union", types=types)
+
+    def _resolve_type(self, schema: dict[str, Any] | bool) -> DataType:
+        if schema is True or schema == {}:
+            # e.g. `Any`, or the values of `dict` and `list` without type arguments
+            return create_datatype(type="any")
+        if not isinstance(schema, dict):
+            raise DataTypeResolutionError(f"Cannot resolve data type for JSON schema {schema}")
+        if "$ref" in schema:
+            return self._resolve_ref(schema["$ref"])
+        if "anyOf" in schema or "oneOf" in schema:
+            return self._resolve_union(schema.get("anyOf") or schema["oneOf"])
+        if "allOf" in schema and len(schema["allOf"]) == 1:
+            return self._resolve_type(schema["allOf"][0])
+
+        match schema.get("type"):
+            case None if not schema.keys() - {"title", "description", "default", "examples"}:
+                return create_datatype(type="any")
+            case "null":
+                raise DataTypeResolutionError("Types that only allow null are not supported")
+            case "string":
+                return create_datatype(type=_STRING_FORMATS.get(schema.get("format"), "string"))
+            case "integer" | "number" | "boolean" as type_name:
+                return create_datatype(type=_PRIMITIVE_TYPES[type_name])
+            case "array":
+                return create_datatype(type="array", items=self._resolve_type(schema.get("items", True)))
+            case "object":
+                if "properties" in schema:
+                    raise DataTypeResolutionError(f"Inline object schemas are not supported {schema}")
+                return create_datatype(type="map", values=self._resolve_type(schema.get("additionalProperties", True)))
+            case list() as type_names:
+                return self._resolve_union([{**schema, "type": type_name} for type_name in type_names])
+        raise DataTypeResolutionError(f"Cannot resolve data type for JSON schema {schema}")
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.snapshot import load_snapshot
+from dmdoc.core.source import Source
+
+
+class SnapshotSourceConfig(BaseModel):
+    path: str = Field(description="Path to a snapshot file, as generated by the `snapshot` format")
+
+
+class SnapshotSource(Source):
+    """ Loads a data model from a binary snapshot, without importing the original source models """
+
+    _config: SnapshotSourceConfig
+
+    @classmethod
+    def get_config_class(cls) -> type[SnapshotSourceConfig]:
+        return SnapshotSourceConfig
+
+    def get_input_files(self) -> Optional[list[str]]:
+        return [self._config.path]
+
+    def _do_parse(self) -> DataModel:
+        return load_snapshot(self._config.path)
@@ -0,0 +1,186 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import takewhile
+from typing import Optional, Any
+
+from pydantic import BaseModel, Field
+from sqlalchemy import (
+    Column, MetaData, Table, PrimaryKeyConstraint, ForeignKeyConstraint, UniqueConstraint, Index, Engine,
+    create_engine, inspect
+)
+from sqlalchemy.types import TypeEngine
+
+from dmdoc.core.sink.model import DataModel, construct_model
+from dmdoc.core.source.sqlalchemy_source import SQLAlchemySource
+from dmdoc.core.source.sqlalchemy_statistics import SQLiteStatisticsConfig, get_sqlite_files
+
+_logger = logging.getLogger(__name__)
+
+# bulk inspector methods: each one returns the information of all tables of a schema in a single call
+_COLUMNS = "get_multi_columns"
+_PK_CONSTRAINTS = "get_multi_pk_constraint"
+_FOREIGN_KEYS = "get_multi_foreign_keys"
+_UNIQUE_CONSTRAINTS = "get_multi_unique_constraints"
+_INDEXES = "get_multi_indexes"
+_TABLE_COMMENTS = "get_multi_table_comment"
+
+
+def get_table_fullname(schema: Optional[str], name: str) -> str:
+    return f"{schema}.{name}" if schema else name
+
+
+def get_generic_type(type_: TypeEngine) -> TypeEngine:
+    """ Converts a dialect specific type (e.g. `INTEGER`) to its generic SQLAlchemy type (e.g. `Integer`) """
+
+    try:
+        return type_.as_generic()
+    except NotImplementedError:
+        return type_
+
+
+def inspect_schema(engine: Engine, schema: Optional[str], method_name: str) -> dict[tuple[Optional[str], str], Any]:
+    """ Runs a bulk inspector method on its own pooled connection, so that methods can run concurrently """
+
+    _logger.debug("Inspecting schema [%s] with %s", schema, method_name)
+    with engine.connect() as connection:
+        return getattr(inspect(connection), method_name)(schema=schema)
+
+
+def build_tables(metadata: MetaData, reflected: dict[str, dict[tuple[Optional[str], str], Any]]):
+    """
+    Adds the reflected tables to the metadata, as if they were declared in code.
+    Foreign keys referring tables that were not reflected (e.g. in other schemas) are skipped.
+    """
+
+    table_names = {get_table_fullname(schema, name) for schema, name in reflected[_COLUMNS]}
+    for (schema, name), columns in reflected[_COLUMNS].items():
+        pk = reflected[_PK_CONSTRAINTS].get((schema, name)) or {}
+        constraints = []
+        if pk.get("constrained_columns"):
+            constraints.append(PrimaryKeyConstraint(*pk["constrained_columns"], name=pk.get("name")))
+        for fk in reflected[_FOREIGN_KEYS].get((schema, name), []):
+            referred_table = get_table_fullname(fk["referred_schema"] or schema, fk["referred_table"])
+            if referred_table not in table_names:
+                _logger.warning(
+                    "Skipping foreign key [%s] of table [%s]: referred table [%s] was not reflected",
+                    fk.get("name"), get_table_fullname(schema, name), referred_table
+                )
+                continue
+            constraints.append(ForeignKeyConstraint(
+                fk["constrained_columns"],
+                [f"{referred_table}.{column}" for column in fk["referred_columns"]],
+                name=fk.get("name")
+            ))
+        for constraint in reflected[_UNIQUE_CONSTRAINTS].get((schema, name), []):
+            constraints.append(UniqueConstraint(*constraint["column_names"], name=constraint.get("name")))
+        indexes = []
+        for index in reflected[_INDEXES].get((schema, name), []):
+            # expressions of functional indexes are reflected as None: only the columns before the first one are
+            # a usable prefix, indexes led by an expression are skipped
+            column_names = list(takewhile(lambda column: column is not None, index["column_names"]))
+            if column_names:
+                indexes.append(Index(index["name"], *column_names, unique=index["unique"]))
+        comment = reflected[_TABLE_COMMENTS].get((schema, name)) or {}
+        Table(
+            name,
+            metadata,
+            *[
+                Column(
+                    column["name"],
+                    get_generic_type(column["type"]),
+                    nullable=column["nullable"],
+                    comment=column.get("comment")
+                )
+                for column in columns
+            ],
+            *constraints,
+            *indexes,
+            schema=schema,
+            comment=comment.get("text")
+        )
+
+
+class SQLAlchemyReflectSourceConfig(BaseModel):
+    url: str = Field(description="Database connection URL, e.g. `sqlite:///path/to/database.db`")
+    schemas: list[Optional[str]] = Field(
+        description="Schemas to reflect, null stands for the default schema of the connection",
+        min_length=1,
+        default=[None]
+    )
+    id: str = Field(description="Unique identifier of the data model", pattern="[A-Za-z_][A-Za-z0-9_]*")
+    name: Optional[str] = Field(description="Name of the data model", default=None)
+    doc: Optional[str] = Field(description="Documentation string", default=None)
+    workers: int = Field(
+        description="Maximum number of concurrent inspector calls, which is also the size of the connection pool",
+        ge=1,
+        default=4
+    )
+    statistics: Optional[SQLiteStatisticsConfig] = Field(
+        description="If set, row counts and sizes of tables are collected, by default from the same database",
+        default=None
+    )
+
+
+class SQLAlchemyReflectSource(SQLAlchemySource):
+    """
+    Reflects tables from a live database, without ORM models.
+    Each schema is inspected with the bulk `get_multi_*` inspector methods, which run concurrently on a small
+    connection pool. Reflected tables are then converted as declared tables.
+    """
+
+    _config: SQLAlchemyReflectSourceConfig
+
+    @classmethod
+    def get_config_class(cls) -> type[SQLAlchemyReflectSourceConfig]:
+        return SQLAlchemyReflectSourceConfig
+
+    def get_input_files(self) -> Optional[list[str]]:
+        # statistics are collected from the reflected database by default
+        urls = {self._config.url}
+        if self._config.statistics is not None and self._config.statistics.url is not None:
+            urls.add(self._config.statistics.url)
+        input_files = []
+        for url in sorted(urls):
+            if (database_files := get_sqlite_files(url)) is None:
+                return None
+            input_files.extend(database_files)
+        return input_files
+
+    def _do_parse(self) -> DataModel:
+        metadata = self.reflect()
+        entities = {
+            table_name: self.get_entity_info(table, set())
+            for table_name, table in metadata.tables.items()
+        }
+        self.add_statistics(entities, metadata.tables, default_url=self._config.url)
+        data_model = construct_model(
+            DataModel,
+            id=self._config.id,
+            name=self._config.name or self._config.id,
+            doc=self._config.doc,
+            entities=entities,
+            enums=self._enums
+        )
+        data_model.check_integrity()
+        return data_model
+
+    def reflect(self) -> MetaData:
+        engine = create_engine(self._config.url, pool_size=self._config.workers, max_overflow=0)
+        try:
+            method_names = [_COLUMNS, _PK_CONSTRAINTS, _FOREIGN_KEYS, _UNIQUE_CONSTRAINTS, _INDEXES]
+            if engine.dialect.supports_comments:
+                method_names.append(_TABLE_COMMENTS)
+            with ThreadPoolExecutor(max_workers=self._config.workers, thread_name_prefix="dmdoc-reflect") as executor:
+                futures = {
+                    (schema, method_name): executor.submit(inspect_schema, engine, schema, method_name)
+                    for schema in self._config.schemas
+                    for method_name in method_names
+                }
+                reflected = {method_name: {} for method_name in [*method_names, _TABLE_COMMENTS]}
+                for (schema, method_name), future in futures.items():
+                    reflected[method_name].update(future.result())
+        finally:
+            engine.dispose()
+        metadata = MetaData()
+        build_tables(metadata, reflected)
+        return metadata
@@ -1,23 +1,31 @@
 import enum
 import logging
-from typing import Optional
+from functools import partial
+from typing import Optional, Callable, Mapping, Iterable
 
 from pydantic import BaseModel, Field
-from sqlalchemy import Column, Table, ForeignKeyConstraint
+from sqlalchemy import Column, Table, ForeignKeyConstraint, TypeDecorator, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, registry
 from sqlalchemy.sql import sqltypes
+from sqlalchemy.types import TypeEngine
 
+from dmdoc.core.sink.analysis import get_leading_fields
 from dmdoc.core.sink.data_type import DataType, create_datatype, EnumValue
 from dmdoc.core.sink.model import (
-    DataModel, Entity, ModelField, EntityReference, FieldReference, DataModelEnum,
-    get_python_class_id
+    DataModel, Entity, ModelField, EntityReference, FieldReference, DataModelEnum, EntityIndex, IndexKind,
+    get_python_class_id, construct_model
 )
 from dmdoc.core.source import Source
+from dmdoc.core.source.sqlalchemy_statistics import (
+    SQLiteStatisticsConfig, collect_sqlite_statistics, get_sqlite_files
+)
 from dmdoc.utils.exception import DataTypeResolutionError
-from dmdoc.utils.importing import import_object
+from dmdoc.utils.importing import import_object, import_entrypoint_items
 
 _logger = logging.getLogger(__name__)
 
+_SQL_TYPES_ENTRYPOINTS_PATH = "dmdoc.sqlalchemy.types"
+
 
 def get_class_table_mapping(mapper_registry: registry):
     mapping: dict[str, set[str]] = {}
@@ -36,19 +44,144 @@ def get_class_table_mapping(mapper_registry: registry):
 
 def get_entity_reference(fkc: ForeignKeyConstraint) -> EntityReference:
     mapping = [
-        FieldReference(
+        construct_model(
+            FieldReference,
             source=fk.parent.name,
             destination=fk.column.name
         )
         for fk in fkc.elements
     ]
-    return EntityReference(
-        id_entity=fkc.referred_table.name,
+    return construct_model(
+        EntityReference,
+        id_entity=fkc.referred_table.fullname,
         name=fkc.name,
         mapping=mapping
     )
 
 
+def _resolve_enum(source: "SQLAlchemySource", column: Column, sql_type: sqltypes.Enum) -> DataType:
+    if sql_type.enum_class is None:
+        return source.get_values_enum_type(column, sql_type)
+    # noinspection PyTypeChecker
+    return source.get_enum_type(sql_type.enum_class)
+
+
+def _resolve_array(source: "SQLAlchemySource", column: Column, sql_type: sqltypes.ARRAY) -> DataType:
+    return create_datatype(type="array", items=source.resolve_sql_type(column, sql_type.item_type))
+
+
+def _resolve_type_name(type_name: str, source: "SQLAlchemySource", column: Column, sql_type: TypeEngine) -> DataType:
+    return create_datatype(type=type_name)
+
+
+SQLTypeResolver = Callable[["SQLAlchemySource", Column, TypeEngine], DataType]
+# SQL type class -> sink type name or resolver
+SQLTypeMapping = dict[type[TypeEngine], str | SQLTypeResolver]
+
+BUILTIN_SQL_TYPES: SQLTypeMapping = {
+    sqltypes.String: "string",
+    sqltypes.Uuid: "string",
+    sqltypes.DateTime: "datetime",
+    sqltypes.Date: "date",
+    sqltypes.Time: "time",
+    sqltypes.Integer: "integer",
+    sqltypes.Float: "number",
+    sqltypes.Numeric: "number",
+    sqltypes.Boolean: "boolean",
+    sqltypes.LargeBinary: "bytes",
+    sqltypes.Enum: _resolve_enum,
+    sqltypes.ARRAY: _resolve_array
+}
+
+
+class SQLTypeRegistry:
+    """
+    Maps SQL type classes to sink data types.
+    Classes are resolved through their MRO, so that subclasses (e.g. `Text`, `BigInteger` or dialect types) use the
+    mapping of the closest mapped ancestor. Resolvers are memoized per class.
+    Mappings registered as entry points extend (or override) the built-in ones: each entry point refers to a
+    `SQLTypeMapping` dictionary.
+    """
+
+    def __init__(self, group: str, mapping: SQLTypeMapping):
+        self._group = group
+        self._builtin_mapping = mapping
+        self._mapping: SQLTypeMapping | None = None
+        self._resolvers: dict[type[TypeEngine], SQLTypeResolver | None] = {}
+
+    def get_mapping(self) -> SQLTypeMapping:
+        if self._mapping is None:
+            mapping = dict(self._builtin_mapping)
+            for name, plugin_mapping in import_entrypoint_items(self._group).items():
+                if not isinstance(plugin_mapping, dict):
+                    raise ValueError(
+                        f"Invalid SQL type mapping `{name}`: expected a dictionary, found {plugin_mapping}"
+                    )
+                mapping.update(plugin_mapping)
+            self._mapping = mapping
+        return self._mapping
+
+    def register(self, sql_type_class: type[TypeEngine], resolver: str | SQLTypeResolver):
+        self.get_mapping()[sql_type_class] = resolver
+        self._resolvers.clear()
+
+    def get_resolver(self, sql_type_class: type[TypeEngine]) -> SQLTypeResolver | None:
+        """ Returns the resolver of the closest mapped class in the MRO, None if no class is mapped """
+
+        try:
+            return self._resolvers[sql_type_class]
+        except KeyError:
+            pass
+        mapping = self.get_mapping()
+        resolver = next((mapping[c] for c in sql_type_class.__mro__ if c in mapping), None)
+        if isinstance(resolver, str):
+            resolver = partial(_resolve_type_name, resolver)
+        self._resolvers[sql_type_class] = resolver
+        return resolver
+
+
+sql_type_registry = SQLTypeRegistry(_SQL_TYPES_ENTRYPOINTS_PATH, BUILTIN_SQL_TYPES)
+
+
+def _get_index(
+        name: Optional[str],
+        expressions: Iterable,
+        kind: IndexKind,
+        is_unique: bool
+) -> Optional[EntityIndex]:
+    column_names = []
+    for expression in expressions:
+        if not isinstance(expression, Column):
+            # functional index: the expression orders the following columns, thus they are not a usable prefix
+            break
+        column_names.append(expression.name)
+    if not column_names:
+        # e.g. functional indexes led by an expression
+        return None
+    return construct_model(EntityIndex, name=name, fields=column_names, kind=kind, is_unique=is_unique)
+
+
+def get_entity_indexes(table: Table) -> list[EntityIndex]:
+    """ Returns primary key, unique constraints and indexes of the table, constraints and indexes are sorted by name """
+
+    indexes = [
+        _get_index(table.primary_key.name, table.primary_key.columns, IndexKind.PRIMARY_KEY, True),
+        *[
+            _get_index(constraint.name, constraint.columns, IndexKind.UNIQUE_CONSTRAINT, True)
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ],
+        *[
+            _get_index(index.name, index.expressions, IndexKind.INDEX, bool(index.unique))
+            for index in table.indexes
+        ]
+    ]
+    return sorted(
+        [index for index in indexes if index is not None],
+        key=lambda index: (list(IndexKind).index(index.kind), index.name or "", index.fields)
+    )
+
+
 class SQLAlchemySourceConfig(BaseModel):
     base: str = Field(
         description="Path to the ORM base class (extending `sqlalchemy.orm.DeclarativeBase`) for declarative mapping or"
@@ -61,6 +194,10 @@ class SQLAlchemySourceConfig(BaseModel):
     )
     name: Optional[str] = Field(description="Name of the data model", default=None)
     doc: Optional[str] = Field(description="Documentation string", default=None)
+    statistics: Optional[SQLiteStatisticsConfig] = Field(
+        description="If set, row counts and sizes of tables are collected from a SQLite database",
+        default=None
+    )
 
 
 class SQLAlchemySource(Source):
@@ -74,6 +211,11 @@ class SQLAlchemySource(Source):
     def get_config_class(cls) -> type[SQLAlchemySourceConfig]:
         return SQLAlchemySourceConfig
 
+    def get_input_files(self) -> Optional[list[str]]:
+        if self._config.statistics is None:
+            return []
+        return get_sqlite_files(self._config.statistics.url)
+
     def _do_parse(self) -> DataModel:
         base: type[DeclarativeBase] | registry = import_object(self._config.base)
         if isinstance(base, type) and issubclass(base, DeclarativeBase):
@@ -91,81 +233,106 @@ class SQLAlchemySource(Source):
         entities = {}
         for table_name, table in base.metadata.tables.items():
             entities[table_name] = self.get_entity_info(table, cls_names.get(table_name, []))
-        return DataModel(
+        self.add_statistics(entities, base.metadata.tables)
+        data_model = construct_model(
+            DataModel,
             id=_id,
             name=self._config.name or _id,
             doc=self._config.doc,
             entities=entities,
             enums=self._enums
         )
+        data_model.check_integrity()
+        return data_model
+
+    def add_statistics(self, entities: dict[str, Entity], tables: Mapping[str, Table], default_url: str = None):
+        """ Collects statistics of the tables when enabled, entities and tables are indexed by the same keys """
+
+        if self._config.statistics is None:
+            return
+        statistics = collect_sqlite_statistics(self._config.statistics, dict(tables), default_url)
+        for table_name, entity_statistics in statistics.items():
+            entities[table_name].statistics = entity_statistics
 
     def get_data_type(self, column: Column) -> DataType:
-        _type = type(column.type)
-        match _type:
-            case sqltypes.String:
-                return create_datatype(type="string")
-            case sqltypes.DateTime:
-                return create_datatype(type="datetime")
-            case sqltypes.Date:
-                return create_datatype(type="date")
-            case sqltypes.Time:
-                return create_datatype(type="time")
-            case sqltypes.Integer:
-                return create_datatype(type="integer")
-            case sqltypes.Float | sqltypes.Numeric:
-                return create_datatype(type="number")
-            case sqltypes.Boolean:
-                return create_datatype(type="boolean")
-            case sqltypes.LargeBinary:
-                return create_datatype(type="bytes")
-            case sqltypes.Enum:
-                # noinspection PyTypeChecker
-                return self.get_enum_type(column.type.python_type)
-            case _:
+        return self.resolve_sql_type(column, column.type)
+
+    def resolve_sql_type(self, column: Column, sql_type: TypeEngine) -> DataType:
+        """ Resolves a SQL type of the column through the type registry, unwrapping `TypeDecorator` types if needed """
+
+        while (resolver := sql_type_registry.get_resolver(type(sql_type))) is None:
+            if not isinstance(sql_type, TypeDecorator):
                 raise DataTypeResolutionError(
-                    f"Unable to find suitable data type for column "
-                    "`[{column.table.name}].[{column.name}]`: {column.type}"
+                    f"Unable to find suitable data type for column `[{column.table.name}].[{column.name}]`: {sql_type}"
                 )
+            sql_type = sql_type.impl_instance
+        return resolver(self, column, sql_type)
 
     def get_enum_type(self, enum_class: type[enum.Enum]):
         if enum_class.__name__ not in self._enums:
-            self._enums[enum_class.__name__] = DataModelEnum(
+            self._enums[enum_class.__name__] = construct_model(
+                DataModelEnum,
                 aliases=[get_python_class_id(enum_class)],
-                values={
-                    EnumValue(
+                values=[
+                    construct_model(
+                        EnumValue,
                         name=value.name,
                         value=str(value.value)
                     )
                     for value in enum_class
-                }
+                ]
             )
         return create_datatype(
             type="enum",
             id=enum_class.__name__
         )
 
-    def get_field_info(self, column: Column, is_key: bool) -> ModelField:
-        return ModelField(
+    def get_values_enum_type(self, column: Column, enum_type: sqltypes.Enum) -> DataType:
+        """ Returns the type of enums defined by their values only, e.g. reflected ones """
+
+        enum_id = enum_type.name or f"{column.table.name}_{column.name}"
+        if enum_id not in self._enums:
+            self._enums[enum_id] = construct_model(
+                DataModelEnum,
+                values=[construct_model(EnumValue, name=value, value=value) for value in enum_type.enums]
+            )
+        return create_datatype(
+            type="enum",
+            id=enum_id
+        )
+
+    def get_field_info(self, column: Column, is_key: bool, is_indexed: bool = False) -> ModelField:
+        return construct_model(
+            ModelField,
             name=column.name,
             doc=column.comment,
             type=self.get_data_type(column),
             is_key=is_key,
-            is_required=not column.nullable
+            is_required=not column.nullable,
+            is_indexed=is_indexed
         )
 
     def get_entity_info(self, table: Table, aliases: set[str]) -> Entity:
+        indexes = get_entity_indexes(table)
+        indexed_fields = get_leading_fields(indexes)
         fields = {
-            c.name: self.get_field_info(c, table.primary_key.contains_column(c))
+            c.name: self.get_field_info(c, table.primary_key.contains_column(c), c.name in indexed_fields)
             for c in table.c.values()
         }
+        # foreign key constraints are a set: sort them by column position to get a deterministic data model
+        column_positions = {column.key: position for position, column in enumerate(table.c)}
         references = [
             get_entity_reference(fk)
-            for fk in table.foreign_key_constraints
+            for fk in sorted(
+                table.foreign_key_constraints,
+                key=lambda fkc: ([column_positions[column.key] for column in fkc.columns], fkc.referred_table.name)
+            )
         ]
-        return Entity(
-            id=table.name,
-            aliases=aliases,
+        return construct_model(
+            Entity,
+            aliases=sorted(aliases),
             doc=table.comment,
             fields=fields,
-            references=references
+            references=references,
+            indexes=indexes
         )
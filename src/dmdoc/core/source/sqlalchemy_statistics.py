@@ -0,0 +1,200 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import Engine, Table, create_engine, func, select, text, make_url
+from sqlalchemy.exc import OperationalError
+
+from dmdoc.core.sink.model import EntityStatistics, construct_model
+
+_logger = logging.getLogger(__name__)
+
+
+class SQLiteStatisticsConfig(BaseModel):
+    url: Optional[str] = Field(
+        description="SQLite database URL, e.g. `sqlite:///path/to/database.db`. "
+                    "By default, the URL of the source is used when it has one",
+        default=None
+    )
+    workers: int = Field(
+        description="Maximum number of concurrent queries, which is also the size of the connection pool",
+        ge=1,
+        default=4
+    )
+    count_timeout: float = Field(
+        description="Timeout in seconds of the `COUNT(*)` fallback of each table, the row count is skipped on timeout",
+        gt=0,
+        default=10
+    )
+
+
+def get_sqlite_files(url: Optional[str]) -> Optional[list[str]]:
+    """
+    Returns the files of a SQLite database (including its write-ahead log) from its URL,
+    or None if the URL does not point to a SQLite database file
+    """
+
+    if url is None:
+        return None
+    url = make_url(url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    filepath = os.path.abspath(url.database)
+    return [filepath, f"{filepath}-wal"]
+
+
+def _get_schema_name(schema: Optional[str]) -> str:
+    return schema or "main"
+
+
+def _quote_literal(value: str) -> str:
+    escaped = value.replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _fetch_all(engine: Engine, statement: str) -> list[tuple]:
+    with engine.connect() as connection:
+        return [tuple(row) for row in connection.execute(text(statement))]
+
+
+def _fetch_optional(engine: Engine, statement: str) -> Optional[list[tuple]]:
+    """ Same as `_fetch_all`, but returns None when the queried table does not exist (e.g. `dbstat` is not compiled) """
+
+    try:
+        return _fetch_all(engine, statement)
+    except OperationalError as e:
+        _logger.debug("Statistics query failed, skipping: %s", e)
+        return None
+
+
+def count_rows(engine: Engine, table: Table, timeout: float) -> Optional[int]:
+    """ Counts the rows of the table, the query is interrupted after `timeout` seconds and None is returned """
+
+    with engine.connect() as connection:
+        # SQLite counts rows with a single instruction, so the query is interrupted by a timer
+        timer = threading.Timer(timeout, connection.connection.driver_connection.interrupt)
+        timer.start()
+        try:
+            return connection.execute(select(func.count()).select_from(table)).scalar_one()
+        except OperationalError as e:
+            _logger.warning("Unable to count rows of table [%s] within %s seconds: %s", table.fullname, timeout, e)
+            return None
+        finally:
+            timer.cancel()
+
+
+def parse_stat_row_counts(rows: list[tuple]) -> dict[str, int]:
+    """
+    Returns the estimated row count of each table from `sqlite_stat1` rows (table, index, stat).
+    The first number of `stat` is the number of rows of the table (idx is null) or of the index.
+    """
+
+    row_counts: dict[str, int] = {}
+    for table_name, index_name, stat in rows:
+        if not stat:
+            continue
+        row_count = int(stat.split()[0])
+        if index_name is None or table_name not in row_counts:
+            row_counts[table_name] = row_count
+        else:
+            # partial indexes may cover fewer rows than the table
+            row_counts[table_name] = max(row_counts[table_name], row_count)
+    return row_counts
+
+
+class SQLiteStatisticsCollector:
+    """
+    Collects row counts and estimated sizes (including indexes) of SQLite tables.
+    Each schema is queried with a few batched statements (`sqlite_master`, `sqlite_stat1` and `dbstat`), then the rows
+    of tables without `sqlite_stat1` entries are counted. All queries run concurrently on a connection pool.
+    """
+
+    def __init__(self, config: SQLiteStatisticsConfig, url: str):
+        self._config = config
+        self._url = url
+
+    def collect(self, tables: dict[str, Table]) -> dict[str, EntityStatistics]:
+        """ Returns the statistics of the provided tables, indexed by the same keys """
+
+        engine = create_engine(self._url, pool_size=self._config.workers, max_overflow=0)
+        if engine.dialect.name != "sqlite":
+            engine.dispose()
+            raise ValueError(f"Statistics can be collected from SQLite databases only, found [{engine.dialect.name}]")
+        try:
+            with ThreadPoolExecutor(max_workers=self._config.workers, thread_name_prefix="dmdoc-stats") as executor:
+                return self._collect(engine, executor, tables)
+        finally:
+            engine.dispose()
+
+    def _collect(
+            self,
+            engine: Engine,
+            executor: ThreadPoolExecutor,
+            tables: dict[str, Table]
+    ) -> dict[str, EntityStatistics]:
+        schemas = {_get_schema_name(table.schema) for table in tables.values()}
+        index_futures: dict[str, Future] = {}
+        stat_futures: dict[str, Future] = {}
+        size_futures: dict[str, Future] = {}
+        for schema in schemas:
+            quoted_schema = engine.dialect.identifier_preparer.quote_schema(schema)
+            index_futures[schema] = executor.submit(
+                _fetch_all,
+                engine,
+                f"SELECT name, tbl_name FROM {quoted_schema}.sqlite_master WHERE type = 'index' ORDER BY tbl_name, name"
+            )
+            stat_futures[schema] = executor.submit(
+                _fetch_optional,
+                engine,
+                f"SELECT tbl, idx, stat FROM {quoted_schema}.sqlite_stat1"
+            )
+            # aggregated page sizes of each table and index, available if SQLite is compiled with the dbstat table
+            size_futures[schema] = executor.submit(
+                _fetch_optional,
+                engine,
+                f"SELECT name, pgsize FROM dbstat({_quote_literal(schema)}, 1)"
+            )
+
+        indexes: dict[str, dict[str, list[str]]] = {}
+        row_counts: dict[str, dict[str, int]] = {}
+        sizes: dict[str, dict[str, int]] = {}
+        for schema in schemas:
+            indexes[schema] = {}
+            for index_name, table_name in index_futures[schema].result():
+                indexes[schema].setdefault(table_name, []).append(index_name)
+            row_counts[schema] = parse_stat_row_counts(stat_futures[schema].result() or [])
+            sizes[schema] = dict(size_futures[schema].result() or [])
+
+        count_futures = {
+            key: executor.submit(count_rows, engine, table, self._config.count_timeout)
+            for key, table in tables.items()
+            if table.name not in row_counts[_get_schema_name(table.schema)]
+        }
+        statistics = {}
+        for key, table in tables.items():
+            schema = _get_schema_name(table.schema)
+            table_indexes = indexes[schema].get(table.name, [])
+            size = None
+            if table.name in sizes[schema]:
+                size = sizes[schema][table.name] + sum(sizes[schema].get(index, 0) for index in table_indexes)
+            statistics[key] = construct_model(
+                EntityStatistics,
+                row_count=count_futures[key].result() if key in count_futures else row_counts[schema][table.name],
+                size=size
+            )
+        return statistics
+
+
+def collect_sqlite_statistics(
+        config: SQLiteStatisticsConfig,
+        tables: dict[str, Table],
+        default_url: Optional[str] = None
+) -> dict[str, EntityStatistics]:
+    url = config.url or default_url
+    if url is None:
+        raise ValueError("Missing database URL to collect statistics from")
+    _logger.info("Collecting statistics of %s tables", len(tables))
+    return SQLiteStatisticsCollector(config, url).collect(tables)
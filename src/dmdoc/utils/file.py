@@ -19,3 +19,20 @@ def read_yaml(filepath: str):
 def read_yaml_with_envvars(filepath: str):
     content = read_yaml(filepath)
     return resolve_any(content)
+
+
+def write_text_if_changed(filepath: str, content: str) -> bool:
+    """ Writes a text file, unless it already has the same content. Returns true if the file was written. """
+
+    try:
+        with open(filepath, mode="r", encoding="utf-8") as f:
+            if f.read() == content:
+                return False
+    except (OSError, ValueError):
+        pass
+    os.makedirs(os.path.dirname(os.path.abspath(filepath)), exist_ok=True)
+    tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+    with open(tmp_filepath, mode="w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_filepath, filepath)
+    return True
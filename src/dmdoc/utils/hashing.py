@@ -0,0 +1,21 @@
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def hash_bytes(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def hash_file(filepath: str) -> Optional[str]:
+    """ Returns the hash of the file content, or None if the file cannot be read """
+
+    try:
+        with open(filepath, mode="rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except OSError:
+        return None
+
+
+def hash_json(content: Any) -> str:
+    return hash_bytes(json.dumps(content, sort_keys=True, default=str).encode())
@@ -1,7 +1,13 @@
 import inspect
+import os
+import sys
+import sysconfig
+from contextlib import contextmanager
 from importlib import import_module
-from importlib.metadata import EntryPoint, entry_points
-from typing import Type, TypeVar, Any
+from importlib.metadata import EntryPoint
+from typing import Type, TypeVar, Any, Iterator
+
+from dmdoc.utils.plugins import plugin_index
 
 _T = TypeVar("_T")
 
@@ -37,11 +43,9 @@ def scan_module_subclasses(module: str, parent_class: Type):
 
 
 def resolve_entrypoint_class(name: str, group: str, parent_class: type[_T]) -> type[_T]:
-    entrypoints = entry_points(name=name, group=group)
-    try:
-        entrypoint = entrypoints[name]
-    except Exception as e:
-        raise ValueError(f"Cannot find entrypoint named `{name}` belonging to group `{group}`") from e
+    entrypoint = plugin_index.get_entrypoint(name=name, group=group)
+    if entrypoint is None:
+        raise ValueError(f"Cannot find entrypoint named `{name}` belonging to group `{group}`")
     _class = import_entrypoint_object(entrypoint)
     if not issubclass(_class, parent_class):
         raise ValueError(f"Invalid entrypoint class for key `{name}` {_class}: it must inherit from {parent_class}")
@@ -49,8 +53,39 @@ def resolve_entrypoint_class(name: str, group: str, parent_class: type[_T]) -> t
 
 
 def import_entrypoint_items(group: str) -> dict[str, Any]:
-    entrypoints = entry_points(group=group)
+    entrypoints = plugin_index.get_entrypoints(group)
     return {
-        entrypoint.name: import_entrypoint_object(entrypoint)
-        for entrypoint in entrypoints
+        name: import_entrypoint_object(entrypoint)
+        for name, entrypoint in entrypoints.items()
     }
+
+
+def _get_install_dirs(*keys: str) -> tuple[str, ...]:
+    return tuple(
+        os.path.join(os.path.abspath(path), "")
+        for key in keys
+        if (path := sysconfig.get_paths().get(key))
+    )
+
+
+@contextmanager
+def track_imported_modules() -> Iterator[list[str]]:
+    """
+    Collects the source files of the modules imported within the context.
+    Modules of the standard library are excluded, while installed packages are collected too,
+    since data models may be installed as well.
+    """
+
+    imported_files: list[str] = []
+    modules_before = set(sys.modules)
+    yield imported_files
+    stdlib_dirs = _get_install_dirs("stdlib", "platstdlib")
+    # site-packages may be nested into the standard library directory
+    package_dirs = _get_install_dirs("purelib", "platlib")
+    for name in sorted(set(sys.modules) - modules_before):
+        filepath = getattr(sys.modules[name], "__file__", None)
+        if not filepath or not os.path.isfile(filepath):
+            continue
+        filepath = os.path.abspath(filepath)
+        if filepath.startswith(package_dirs) or not filepath.startswith(stdlib_dirs):
+            imported_files.append(filepath)
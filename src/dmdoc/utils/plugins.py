@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import sys
+from importlib.metadata import EntryPoint, entry_points
+from typing import Iterable
+
+_logger = logging.getLogger(__name__)
+
+_CACHE_DIR_ENVVAR = "DMDOC_CACHE_DIR"
+_ENTRYPOINTS_CACHE_FILENAME = "entrypoints.json"
+
+# entry point groups indexed at once, the first time any of them is requested
+PLUGIN_GROUPS = ("dmdoc.sources", "dmdoc.formats", "dmdoc.sink.datatypes", "dmdoc.sqlalchemy.types")
+
+
+def get_cache_dir() -> str:
+    """ Returns the directory used by dmdoc to persist cache files """
+
+    if cache_dir := os.environ.get(_CACHE_DIR_ENVVAR):
+        return cache_dir
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(xdg_cache_home, "dmdoc")
+
+
+def get_environment_key() -> str:
+    """
+    Returns a fingerprint of the import path entries and their modification times.
+    Installing or removing a distribution changes the modification time of the directory it belongs to.
+    The current working directory is skipped, since it does not contain installed distributions.
+    """
+
+    digest = hashlib.sha256()
+    for path in sys.path:
+        if not path:
+            continue
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        digest.update(f"{path}:{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_cache(filepath: str) -> dict:
+    try:
+        with open(filepath, mode="r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(filepath: str, content: dict):
+    try:
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_filepath, mode="w") as f:
+            json.dump(content, f)
+        os.replace(tmp_filepath, filepath)
+    except OSError as e:
+        _logger.debug("Unable to write entry points cache at [%s]: %s", filepath, e)
+
+
+def _load_groups(groups: list[str]) -> dict:
+    filepath = os.path.join(get_cache_dir(), _ENTRYPOINTS_CACHE_FILENAME)
+    key = get_environment_key()
+    cache = _read_cache(filepath)
+    if cache.get("key") != key:
+        cache = {"key": key, "groups": {}, "distributions": {}}
+    cached_groups: dict[str, dict[str, str]] = cache.setdefault("groups", {})
+    cached_distributions: dict[str, dict[str, str]] = cache.setdefault("distributions", {})
+
+    if missing_groups := [
+        group for group in groups
+        if group not in cached_groups or group not in cached_distributions
+    ]:
+        _logger.debug("Scanning entry points of groups %s", missing_groups)
+        all_entrypoints = entry_points()
+        for group in missing_groups:
+            group_entrypoints = all_entrypoints.select(group=group)
+            cached_groups[group] = {
+                entrypoint.name: entrypoint.value
+                for entrypoint in group_entrypoints
+            }
+            cached_distributions[group] = {
+                entrypoint.dist.name: entrypoint.dist.version
+                for entrypoint in group_entrypoints
+                if entrypoint.dist is not None
+            }
+        _write_cache(filepath, cache)
+    return cache
+
+
+def load_entrypoints(groups: Iterable[str]) -> dict[str, dict[str, EntryPoint]]:
+    """
+    Returns the entry points of the provided groups, indexed by group and name.
+    Resolved entry points are persisted to a cache file, which is invalidated when installed distributions change.
+    """
+
+    groups = list(groups)
+    cached_groups = _load_groups(groups)["groups"]
+    return {
+        group: {
+            name: EntryPoint(name=name, value=value, group=group)
+            for name, value in cached_groups[group].items()
+        }
+        for group in groups
+    }
+
+
+def load_distributions(groups: Iterable[str]) -> dict[str, str]:
+    """ Returns name and version of the distributions providing entry points of the provided groups """
+
+    groups = list(groups)
+    cached_distributions = _load_groups(groups)["distributions"]
+    return {
+        name: version
+        for group in groups
+        for name, version in cached_distributions[group].items()
+    }
+
+
+class PluginIndex:
+    """
+    In-memory index of entry points, kept for the whole process.
+    Known groups are loaded together, so a process reads the cache file (or scans distributions) once.
+    """
+
+    def __init__(self, groups: Iterable[str]):
+        self._groups = tuple(groups)
+        self._entrypoints: dict[str, dict[str, EntryPoint]] = {}
+        self._distributions: dict[str, str] | None = None
+
+    def get_entrypoints(self, group: str) -> dict[str, EntryPoint]:
+        if group not in self._entrypoints:
+            groups = [group] + [g for g in self._groups if g not in self._entrypoints and g != group]
+            self._entrypoints.update(load_entrypoints(groups))
+        return self._entrypoints[group]
+
+    def get_entrypoint(self, name: str, group: str) -> EntryPoint | None:
+        return self.get_entrypoints(group).get(name)
+
+    def get_distributions(self) -> dict[str, str]:
+        """ Returns name and version of the distributions providing entry points of the known groups """
+
+        if self._distributions is None:
+            self._distributions = dict(sorted(load_distributions(self._groups).items()))
+        return self._distributions
+
+    def clear(self):
+        self._entrypoints.clear()
+        self._distributions = None
+
+
+plugin_index = PluginIndex(PLUGIN_GROUPS)
@@ -0,0 +1,40 @@
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from dmdoc.core.sink.model import DataModel
+
+
+def _create_data_model(
+        fields: dict[str, str | dict] = None,
+        entity_ids: Iterable[str] = ("user",),
+        key_fields: Iterable[str] = (),
+        entity: dict[str, Any] = None,
+        **model: Any
+) -> DataModel:
+    """
+    Returns a data model whose entities share the same fields, by default a string `id`.
+    :param fields: data types by field name, either a type identifier or a data type dictionary
+    :param key_fields: names of the key fields
+    :param entity: other attributes of every entity, e.g. references or indexes
+    :param model: other attributes of the data model, e.g. objects or enums. Entities are added to the generated ones.
+    """
+
+    fields = fields or {"id": "string"}
+    entity_fields = {
+        name: {"name": name, "type": _type, "is_key": name in key_fields}
+        for name, _type in fields.items()
+    }
+    entities = {_id: {"fields": entity_fields, **(entity or {})} for _id in entity_ids}
+    return DataModel(
+        id=model.pop("id", "sample"),
+        name=model.pop("name", "sample"),
+        entities={**entities, **model.pop("entities", {})},
+        **model
+    )
+
+
+@pytest.fixture
+def create_data_model() -> Callable[..., DataModel]:
+    """ Factory of sample data models, every call returns a new instance (hashes are memoized) """
+    return _create_data_model
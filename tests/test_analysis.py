@@ -0,0 +1,49 @@
+from typing import Optional
+
+import pytest
+
+from dmdoc.core.sink.analysis import is_reference_indexed, find_unindexed_references
+from dmdoc.core.sink.model import DataModel
+
+
+@pytest.fixture
+def create_order_model(create_data_model):
+    """ Data models with an order entity referencing a user entity """
+
+    def create_order_model(order_indexes: Optional[list[dict]]) -> DataModel:
+        return create_data_model(
+            {"id": "string", "id_user": "string"},
+            entity_ids=["order"],
+            entity={
+                "references": [{"id_entity": "user", "mapping": [{"source": "id_user", "destination": "id"}]}],
+                "indexes": order_indexes
+            },
+            entities={"user": {"fields": {"id": {"name": "id", "type": "string"}}, "indexes": []}}
+        )
+    return create_order_model
+
+
+def test_indexed_reference(create_order_model):
+    data_model = create_order_model([{"fields": ["id_user", "id"]}])
+    order = data_model.entities["order"]
+    assert is_reference_indexed(order, order.references[0]) is True
+    assert find_unindexed_references(data_model).is_empty
+
+
+def test_unindexed_reference(create_order_model):
+    data_model = create_order_model([{"fields": ["id", "id_user"], "kind": "primary_key"}])
+    order = data_model.entities["order"]
+    assert is_reference_indexed(order, order.references[0]) is False
+    report = find_unindexed_references(data_model)
+    assert report.references == 1
+    assert [reference.fields for reference in report.unindexed_references] == [["id_user"]]
+
+
+def test_unknown_indexes(create_order_model):
+    data_model = create_order_model(None)
+    order = data_model.entities["order"]
+    assert is_reference_indexed(order, order.references[0]) is None
+    report = find_unindexed_references(data_model)
+    assert report.is_empty
+    assert report.references == 0
+    assert report.unknown_entities == ["order"]
@@ -0,0 +1,167 @@
+from datetime import datetime
+from typing import Optional, Union
+
+import pytest
+from beanie import Document, Indexed, PydanticObjectId
+from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from dmdoc.core.sink.analysis import find_unindexed_references
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.source.beanie_source import BeanieSource, BeanieSourceConfig, get_entity_indexes
+from dmdoc.utils.exception import DataTypeResolutionError
+
+
+class Address(BaseModel):
+    street: str
+    previous: Optional["Address"] = None
+
+
+class Category(BaseModel):
+    name: str
+    products: list["Product"] = []
+
+
+class Product(BaseModel):
+    name: str
+    category: Optional[Category] = None
+    address: Optional[Address] = None
+
+
+class Customer(Document):
+    code: str
+    address: Address
+    categories: list[Category]
+
+    class Settings:
+        name = "customers"
+        indexes = ["code"]
+
+
+class Order(Customer):
+    email: Indexed(str, unique=True)
+    id_customer: PydanticObjectId = Field(alias="customerId")
+    description: str
+    created: datetime
+    product: Product
+
+    class DmDocConfig:
+        references = [{"id_entity": "customers", "mapping": [{"source": "id_customer", "destination": "id"}]}]
+
+    class Settings:
+        name = "orders"
+        merge_indexes = True
+        indexes = [
+            IndexModel([("customerId", ASCENDING), ("created", DESCENDING)], name="customer_created"),
+            IndexModel([("description", TEXT)], name="description_text"),
+            IndexModel([("created", ASCENDING)], name="created_ttl", expireAfterSeconds=3600),
+            # defined once, as Beanie does
+            IndexModel([("description", ASCENDING)], name="description_text")
+        ]
+
+
+class Invoice(Order):
+    class Settings:
+        indexes = [[("description", ASCENDING)]]
+
+
+DOCUMENTS = [Customer, Order]
+
+
+@pytest.fixture
+def source() -> BeanieSource:
+    return BeanieSource(BeanieSourceConfig(id="sample", classes="unused:classes"))
+
+
+@pytest.mark.parametrize("annotation, types", [
+    (Union[int, str, datetime], ["integer", "string", "datetime"]),
+    (Union[datetime, str, int], ["datetime", "string", "integer"]),
+    (Optional[Union[bytes, float]], ["bytes", "number"]),
+    (str | None | int, ["string", "integer"])
+])
+def test_union_order(source: BeanieSource, annotation, types: list[str]):
+    assert source._resolve_type(annotation).model_dump() == {"type": "union", "types": types}
+
+
+def test_map_values(source: BeanieSource):
+    assert source._resolve_type(dict[str, str]).model_dump() == {"type": "map", "values": "string"}
+    assert source._resolve_type(Optional[list[int]]).model_dump() == {"type": "array", "items": "integer"}
+
+
+def test_equal_unions_keep_their_order(source: BeanieSource):
+    assert source._resolve_type(Union[bool, str]).model_dump() == {"type": "union", "types": ["boolean", "string"]}
+    assert source._resolve_type(Union[str, bool]).model_dump() == {"type": "union", "types": ["string", "boolean"]}
+
+
+def _parse(classes: str) -> DataModel:
+    return BeanieSource(BeanieSourceConfig(id="sample", classes=f"{__name__}:{classes}")).parse()
+
+
+def test_recursive_objects():
+    data_model = _parse("DOCUMENTS")
+    assert sorted(data_model.objects) == ["Address", "Category", "Product"]
+    assert data_model.objects["Address"].fields["previous"].type.model_dump() == {"type": "object", "id": "Address"}
+    assert data_model.objects["Category"].fields["products"].type.model_dump() == {
+        "type": "array", "items": {"type": "object", "id": "Product"}
+    }
+    assert data_model.objects["Product"].fields["category"].type.model_dump() == {"type": "object", "id": "Category"}
+
+
+def test_objects_are_converted_once(source: BeanieSource, monkeypatch):
+    extracted_classes = []
+    extract_fields = source._extract_fields
+    monkeypatch.setattr(
+        source, "_extract_fields",
+        lambda model_class: extracted_classes.append(model_class.__name__) or extract_fields(model_class)
+    )
+    monkeypatch.setattr(source._config, "classes", f"{__name__}:DOCUMENTS")
+    source.parse()
+    assert sorted(extracted_classes) == ["Address", "Category", "Customer", "Order", "Product"]
+
+
+def test_classes_with_the_same_name(source: BeanieSource):
+    class Address(BaseModel):
+        city: str
+
+    source._resolve_type(globals()["Address"])
+    with pytest.raises(DataTypeResolutionError, match="have the same name `Address`"):
+        source._resolve_type(Address)
+
+
+def _get_indexes(document_class: type[Document]) -> list[tuple]:
+    return [
+        (index.name, index.fields, index.kind, index.is_unique, index.expire_after_seconds)
+        for index in get_entity_indexes(document_class)
+    ]
+
+
+def test_entity_indexes():
+    assert _get_indexes(Customer) == [
+        ("_id_", ["id"], "primary_key", True, None),
+        ("code_1", ["code"], "index", False, None)
+    ]
+    # indexes of the parent document are merged, aliases are mapped to field names
+    assert _get_indexes(Order) == [
+        ("_id_", ["id"], "primary_key", True, None),
+        ("email_1", ["email"], "index", True, None),
+        ("code_1", ["code"], "index", False, None),
+        ("customer_created", ["id_customer", "created"], "index", False, None),
+        ("description_text", ["description"], "text", False, None),
+        ("created_ttl", ["created"], "ttl", False, 3600)
+    ]
+    # without `merge_indexes`, only the indexes of the document settings are kept
+    assert _get_indexes(Invoice) == [
+        ("_id_", ["id"], "primary_key", True, None),
+        ("email_1", ["email"], "index", True, None),
+        ("description_1", ["description"], "index", False, None)
+    ]
+
+
+def test_indexed_fields():
+    data_model = _parse("DOCUMENTS")
+    fields = data_model.entities["orders"].fields
+    indexed_fields = [name for name, field in fields.items() if field.is_indexed]
+    assert indexed_fields == ["id", "code", "email", "id_customer", "created"]
+    # text indexes do not support lookups
+    assert not fields["description"].is_indexed
+    assert find_unindexed_references(data_model).is_empty
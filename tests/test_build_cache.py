@@ -0,0 +1,56 @@
+import os
+
+import yaml
+
+from dmdoc.core.build_cache import BuildCache
+from dmdoc.core.generator import _load_data_model
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.snapshot import save_snapshot
+
+
+def _write_snapshot_source(tmp_path, data_model: DataModel) -> str:
+    snapshot_filepath = str(tmp_path / "model.snapshot")
+    save_snapshot(data_model, snapshot_filepath)
+    source_filepath = str(tmp_path / "source.yaml")
+    with open(source_filepath, mode="w") as f:
+        yaml.safe_dump({"type": "snapshot", "config": {"path": snapshot_filepath}}, f)
+    return source_filepath
+
+
+def test_model_round_trip(tmp_path, create_data_model):
+    cache = BuildCache(str(tmp_path))
+    data_model = create_data_model({"value": {"type": "union", "types": [{"type": "string"}, {"type": "integer"}]}})
+    model_key = cache.save_model("source", data_model, [])
+    cached_model, cached_key = cache.load_model("source")
+    assert cached_key == model_key
+    assert cached_model.merkle_hash == data_model.merkle_hash
+
+
+def test_model_is_invalidated_by_input_files(tmp_path, create_data_model):
+    cache = BuildCache(str(tmp_path / "cache"))
+    input_filepath = tmp_path / "input.txt"
+    input_filepath.write_text("v1")
+    cache.save_model("source", create_data_model({"value": {"type": "string"}}), [str(input_filepath)])
+    assert cache.load_model("source") is not None
+    input_filepath.write_text("v2")
+    assert cache.load_model("source") is None
+
+
+def test_model_without_input_files_is_not_saved(tmp_path, create_data_model):
+    cache = BuildCache(str(tmp_path))
+    model_key = cache.save_model("source", create_data_model({"value": {"type": "string"}}), None)
+    assert model_key
+    assert cache.load_model("source") is None
+    assert not os.path.exists(tmp_path / "models")
+
+
+def test_snapshot_source_changes_invalidate_cache(tmp_path, create_data_model):
+    cache = BuildCache(str(tmp_path / "cache"))
+    source_filepath = _write_snapshot_source(tmp_path, create_data_model({"value": {"type": "string"}}))
+    data_model, model_key = _load_data_model(source_filepath, cache)
+    assert _load_data_model(source_filepath, cache)[1] == model_key
+
+    _write_snapshot_source(tmp_path, create_data_model({"value": {"type": "integer"}}))
+    changed_model, changed_key = _load_data_model(source_filepath, cache)
+    assert changed_key != model_key
+    assert changed_model.entities["user"].fields["value"].type.type == "integer"
@@ -0,0 +1,61 @@
+import pytest
+import yaml
+
+from dmdoc.core.format.changelog_format import ChangelogFormat, write_changelog
+from dmdoc.core.format.markdown_format import MarkdownBuffer
+from dmdoc.core.generator import generate_documentation
+from dmdoc.core.sink.diff import diff_models
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.snapshot import save_snapshot
+
+
+def _write_yaml(filepath, content: dict) -> str:
+    with open(filepath, mode="w") as f:
+        yaml.safe_dump(content, f)
+    return str(filepath)
+
+
+def _write_source(directory, data_model: DataModel) -> str:
+    save_snapshot(data_model, str(directory / "source.snapshot"))
+    return _write_yaml(
+        directory / "source.yaml",
+        {"type": "snapshot", "config": {"path": str(directory / "source.snapshot")}}
+    )
+
+
+def test_baseline_is_relative_to_format_config(tmp_path, monkeypatch, create_data_model):
+    (tmp_path / "baseline").mkdir()
+    (tmp_path / "current").mkdir()
+    (tmp_path / "elsewhere").mkdir()
+    _write_source(tmp_path / "baseline", create_data_model())
+    source_filepath = _write_source(tmp_path / "current", create_data_model(entity_ids=["user", "order"]))
+    format_filepath = _write_yaml(
+        tmp_path / "current" / "changelog.yaml",
+        {
+            "format": "changelog",
+            "config": {"output_path": str(tmp_path / "CHANGELOG.md"), "baseline": "../baseline/source.yaml"}
+        }
+    )
+
+    monkeypatch.chdir(tmp_path / "elsewhere")
+    generate_documentation(source_filepath, [format_filepath])
+    assert "order" in (tmp_path / "CHANGELOG.md").read_text()
+
+
+def test_baseline_is_required(tmp_path, create_data_model):
+    changelog_format = ChangelogFormat.create(
+        data_model=create_data_model(),
+        config_dict={"output_path": str(tmp_path / "CHANGELOG.md"), "baseline": "source.yaml"}
+    )
+    with pytest.raises(ValueError):
+        changelog_format.generate()
+
+
+def test_headers_are_separated_from_lists(create_data_model):
+    md_file = MarkdownBuffer()
+    write_changelog(md_file, diff_models(
+        create_data_model(entity_ids=["user", "order"]),
+        create_data_model(entity_ids=["user", "invoice"])
+    ))
+    text = md_file.get_text()
+    assert "* ``invoice``\n\n## Removed" in text
@@ -0,0 +1,72 @@
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from dmdoc.cli.check_cli import check
+from dmdoc.core.generator import generate_documentation
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.snapshot import save_snapshot
+
+
+def _write_yaml(filepath, content: dict) -> str:
+    with open(filepath, mode="w") as f:
+        yaml.safe_dump(content, f)
+    return str(filepath)
+
+
+def _save_data_model(tmp_path, data_model: DataModel):
+    save_snapshot(data_model, str(tmp_path / "source.snapshot"))
+
+
+@pytest.fixture
+def source_filepath(tmp_path, create_data_model) -> str:
+    _save_data_model(tmp_path, create_data_model())
+    return _write_yaml(
+        tmp_path / "source.yaml",
+        {"type": "snapshot", "config": {"path": str(tmp_path / "source.snapshot")}}
+    )
+
+
+@pytest.fixture
+def markdown_filepath(tmp_path) -> str:
+    return _write_yaml(
+        tmp_path / "markdown.yaml",
+        {"format": "markdown", "config": {"output_path": str(tmp_path / "output.md"), "overwrite": True}}
+    )
+
+
+def _check(*args: str) -> int:
+    return CliRunner().invoke(check, list(args)).exit_code
+
+
+def test_check_parses_source(source_filepath: str):
+    assert _check("-s", source_filepath) == 0
+
+
+def test_stale_requires_formats(source_filepath: str):
+    assert _check("-s", source_filepath, "--stale") == 2
+
+
+def test_stale_documentation(tmp_path, source_filepath: str, markdown_filepath: str, create_data_model):
+    # not generated yet
+    assert _check("-s", source_filepath, "-f", markdown_filepath, "--stale") == 1
+
+    generate_documentation(source_filepath, [markdown_filepath])
+    assert _check("-s", source_filepath, "-f", markdown_filepath, "--stale") == 0
+    # the check does not generate anything
+    output = (tmp_path / "output.md").read_bytes()
+
+    _save_data_model(tmp_path, create_data_model(doc="Changed"))
+    assert _check("-s", source_filepath, "-f", markdown_filepath, "--stale") == 1
+    assert (tmp_path / "output.md").read_bytes() == output
+
+
+def test_formats_without_fingerprint_are_skipped(tmp_path, source_filepath: str, markdown_filepath: str):
+    snapshot_filepath = _write_yaml(
+        tmp_path / "snapshot.yaml",
+        {"format": "snapshot", "config": {"output_path": str(tmp_path / "output.snapshot")}}
+    )
+    assert _check("-s", source_filepath, "-f", snapshot_filepath, "--stale") == 0
+
+    generate_documentation(source_filepath, [markdown_filepath])
+    assert _check("-s", source_filepath, "-f", snapshot_filepath, "-f", markdown_filepath, "--stale") == 0
@@ -0,0 +1,61 @@
+import gc
+import json
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from dmdoc.core.sink.data_type import create_datatype, datatype_registry
+from dmdoc.core.sink.model import DataModel
+
+
+def test_equal_data_types_are_shared():
+    array_type = create_datatype(type="array", items="string")
+    assert create_datatype(type="array", items={"type": "string"}) is array_type
+    assert array_type.items is create_datatype(type="string")
+    data_model = DataModel(
+        id="sample",
+        entities={"user": {"fields": {
+            "tags": {"name": "tags", "type": {"type": "array", "items": "string"}},
+            "labels": {"name": "labels", "type": {"type": "array", "items": {"type": "string"}}}
+        }}}
+    )
+    fields = data_model.entities["user"].fields
+    assert fields["tags"].type is fields["labels"].type is array_type
+
+
+def test_unused_data_types_are_released():
+    union_type = create_datatype(type="union", types=[{"type": "map", "values": "date"}, {"type": "enum", "id": "x"}])
+    reference = weakref.ref(union_type)
+    del union_type
+    gc.collect()
+    assert reference() is None
+    assert create_datatype(type="union", types=[{"type": "map", "values": "date"}, {"type": "enum", "id": "x"}])
+
+
+def test_json_schema_defines_data_type_once():
+    # data type classes validated before the schema generation must not change it
+    create_datatype(type="array", items={"type": "map", "values": "string"})
+    schema = DataModel.model_json_schema()
+    definitions = schema["$defs"]
+    assert definitions["DataType"]["discriminator"]["propertyName"] == "type"
+    assert {ref["$ref"] for ref in definitions["DataType"]["oneOf"]} == {
+        f"#/$defs/{datatype_registry.get_class(type_name).__name__}" for type_name in datatype_registry.get_names()
+    }
+    # nested data types reference the shared definition
+    assert definitions["ArrayDataType"]["properties"]["items"]["$ref"] == "#/$defs/DataType"
+    assert definitions["MapDataType"]["properties"]["values"]["$ref"] == "#/$defs/DataType"
+    assert definitions["UnionDataType"]["properties"]["types"]["items"] == {"$ref": "#/$defs/DataType"}
+
+
+def test_json_schema_in_threads():
+    schema = json.dumps(DataModel.model_json_schema(), sort_keys=True)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        schemas = list(executor.map(lambda _: json.dumps(DataModel.model_json_schema(), sort_keys=True), range(64)))
+    assert set(schemas) == {schema}
+
+
+def test_union_of_primitive_types_round_trip():
+    union_type = create_datatype(type="union", types=["string", {"type": "integer"}])
+    data_model = DataModel(id="sample", entities={"user": {"fields": {"value": {"name": "value", "type": union_type}}}})
+    assert union_type.model_dump() == {"type": "union", "types": ["string", "integer"]}
+    loaded_model = DataModel.model_validate_json(data_model.model_dump_json())
+    assert loaded_model.entities["user"].fields["value"].type is union_type
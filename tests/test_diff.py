@@ -0,0 +1,72 @@
+import pytest
+
+from dmdoc.core.sink.diff import diff_models, ChangeType
+from dmdoc.core.sink.model import DataModel
+
+
+@pytest.fixture
+def create_user_model(create_data_model):
+    """ Data models with a self-referencing user entity and a status enum """
+
+    def create_user_model(fields: dict[str, str], status_values: list[str] = ("active",)) -> DataModel:
+        return create_data_model(
+            fields,
+            entity={"references": [{"id_entity": "user", "mapping": [{"source": "id_parent", "destination": "id"}]}]},
+            enums={"status": {"values": [{"name": value.title(), "value": value} for value in status_values]}}
+        )
+    return create_user_model
+
+
+def test_equal_models_have_empty_diff(create_user_model):
+    fields = {"id": "string", "id_parent": "string"}
+    assert diff_models(create_user_model(fields), create_user_model(fields)).is_empty
+
+
+def test_field_changes(create_user_model):
+    old = create_user_model({"id": "string", "id_parent": "string", "age": "integer"})
+    new = create_user_model({"id": "integer", "id_parent": "string", "email": "string"})
+    diff = diff_models(old, new)
+    assert [entity.id for entity in diff.entities] == ["user"]
+    assert [(field.id, field.change, field.attributes) for field in diff.entities[0].fields] == [
+        ("id", ChangeType.CHANGED, ["type"]),
+        ("email", ChangeType.ADDED, []),
+        ("age", ChangeType.REMOVED, [])
+    ]
+    assert not diff.objects and not diff.enums
+
+
+def test_field_order_change(create_user_model):
+    old = create_user_model({"id": "string", "id_parent": "string"})
+    new = create_user_model({"id_parent": "string", "id": "string"})
+    diff = diff_models(old, new)
+    assert len(diff.entities) == 1
+    assert diff.entities[0].change == ChangeType.CHANGED
+    assert diff.entities[0].attributes == ["fields"]
+    assert not diff.entities[0].fields
+
+
+def test_enum_changes(create_user_model):
+    fields = {"id": "string", "id_parent": "string"}
+    diff = diff_models(
+        create_user_model(fields, ["active", "deleted"]),
+        create_user_model(fields, ["active", "archived"])
+    )
+    assert not diff.entities
+    assert [value.value for value in diff.enums[0].added_values] == ["archived"]
+    assert [value.value for value in diff.enums[0].removed_values] == ["deleted"]
+
+    diff = diff_models(
+        create_user_model(fields, ["active", "deleted"]),
+        create_user_model(fields, ["deleted", "active"])
+    )
+    assert diff.enums[0].attributes == ["values"]
+
+
+def test_enum_values_are_matched_by_name(create_user_model):
+    fields = {"id": "string", "id_parent": "string"}
+    old = create_user_model(fields, ["active"])
+    new = create_user_model(fields, ["active"])
+    new.enums["status"].values[0].value = "ACTIVE"
+    diff = diff_models(old, new)
+    assert not diff.enums[0].added_values and not diff.enums[0].removed_values
+    assert [(value.name, value.value) for value in diff.enums[0].changed_values] == [("Active", "ACTIVE")]
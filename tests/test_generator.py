@@ -0,0 +1,58 @@
+import pytest
+import yaml
+from sqlalchemy import String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from dmdoc.core.generator import generate_documentation
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+
+
+def _write_yaml(filepath, content: dict) -> str:
+    with open(filepath, mode="w") as f:
+        yaml.safe_dump(content, f)
+    return str(filepath)
+
+
+@pytest.fixture
+def source_filepath(tmp_path) -> str:
+    return _write_yaml(
+        tmp_path / "source.yaml",
+        {"type": "sqlalchemy", "config": {"base": f"{__name__}:Base", "id": "sample"}}
+    )
+
+
+def _write_format(tmp_path, name: str) -> str:
+    return _write_yaml(
+        tmp_path / f"{name}.yaml",
+        {"format": "markdown", "config": {"output_path": str(tmp_path / f"{name}.md")}}
+    )
+
+
+def test_generate_several_formats(tmp_path, source_filepath: str):
+    generate_documentation(
+        source_filepath=source_filepath,
+        format_filepaths=[_write_format(tmp_path, "first"), _write_format(tmp_path, "second")]
+    )
+    assert (tmp_path / "first.md").read_text() == (tmp_path / "second.md").read_text()
+    assert "user" in (tmp_path / "first.md").read_text()
+
+
+def test_deprecated_format_filepath(tmp_path, source_filepath: str):
+    with pytest.warns(DeprecationWarning):
+        generate_documentation(source_filepath=source_filepath, format_filepath=_write_format(tmp_path, "output"))
+    assert "user" in (tmp_path / "output.md").read_text()
+
+
+def test_format_filepath_conflict(tmp_path, source_filepath: str):
+    format_filepath = _write_format(tmp_path, "output")
+    with pytest.raises(ValueError), pytest.warns(DeprecationWarning):
+        generate_documentation(source_filepath, format_filepaths=[format_filepath], format_filepath=format_filepath)
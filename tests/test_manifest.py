@@ -0,0 +1,76 @@
+import os
+
+import pytest
+import yaml
+from pydantic import ValidationError
+from sqlalchemy import String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from dmdoc.core.manifest import generate_manifest, load_manifest
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class User(Base):
+    __tablename__ = "user"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+
+
+def _write_yaml(filepath, content: dict) -> str:
+    with open(filepath, mode="w") as f:
+        yaml.safe_dump(content, f)
+    return str(filepath)
+
+
+def _write_job(directory, base: str) -> dict:
+    """ Writes the source and markdown format configuration files of a job, returns its manifest entry """
+
+    directory.mkdir()
+    _write_yaml(directory / "source.yaml", {"type": "sqlalchemy", "config": {"base": base, "id": "sample"}})
+    _write_yaml(
+        directory / "markdown.yaml",
+        {"format": "markdown", "config": {"output_path": str(directory / "output.md"), "overwrite": True}}
+    )
+    return {
+        "name": directory.name,
+        "source": f"{directory.name}/source.yaml",
+        "formats": [f"{directory.name}/markdown.yaml"]
+    }
+
+
+def test_paths_are_relative_to_manifest(tmp_path, monkeypatch):
+    (tmp_path / "manifests").mkdir()
+    manifest_filepath = _write_yaml(
+        tmp_path / "manifests" / "manifest.yaml",
+        {"jobs": [{"source": "users/source.yaml", "formats": ["users/markdown.yaml", "/abs/markdown.yaml"]}]}
+    )
+    monkeypatch.chdir(tmp_path)
+    manifest = load_manifest(os.path.join("manifests", "manifest.yaml"))
+    assert manifest.jobs[0].source == str(tmp_path / "manifests" / "users" / "source.yaml")
+    assert manifest.jobs[0].formats == [str(tmp_path / "manifests" / "users" / "markdown.yaml"), "/abs/markdown.yaml"]
+    # the default name is the source filepath
+    assert manifest.jobs[0].display_name == manifest.jobs[0].source
+    assert load_manifest(manifest_filepath) == manifest
+
+
+def test_job_names_are_unique(tmp_path):
+    job = {"source": "source.yaml", "formats": ["markdown.yaml"]}
+    with pytest.raises(ValidationError, match="source.yaml"):
+        load_manifest(_write_yaml(tmp_path / "manifest.yaml", {"jobs": [job, job]}))
+
+    manifest = load_manifest(_write_yaml(
+        tmp_path / "manifest.yaml",
+        {"jobs": [{**job, "name": "markdown"}, job]}
+    ))
+    assert len(manifest.jobs) == 2
+
+
+def test_failures_are_isolated(tmp_path):
+    jobs = [_write_job(tmp_path / "users", f"{__name__}:Base"), _write_job(tmp_path / "orders", "missing_module:Base")]
+    failures = generate_manifest(_write_yaml(tmp_path / "manifest.yaml", {"jobs": jobs}), jobs=2)
+    assert list(failures) == ["orders"]
+    assert (tmp_path / "users" / "output.md").exists()
+    assert not (tmp_path / "orders" / "output.md").exists()
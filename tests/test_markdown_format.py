@@ -0,0 +1,196 @@
+import os
+import warnings
+
+import pytest
+
+from dmdoc.core.format import markdown_format
+from dmdoc.core.format.markdown_format import MarkdownFormat, SectionKind, get_section_hash
+from dmdoc.core.sink.model import DataModel
+
+
+def _create_data_model() -> DataModel:
+    return DataModel(
+        id="sample",
+        name="Sample",
+        entities={"user": {
+            "fields": {"id": {"name": "id", "type": {"type": "string"}}, "address": {"name": "address", "type": {
+                "type": "object", "id": "address"
+            }}}
+        }},
+        objects={"address": {"fields": {"street": {"name": "street", "type": {"type": "string"}}}}},
+        enums={"status": {"values": [{"name": "Active", "value": "active"}]}}
+    )
+
+
+def test_no_deprecated_api_is_used(tmp_path):
+    output_path = tmp_path / "output.md"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        MarkdownFormat.create(data_model=_create_data_model(), config_dict={"output_path": str(output_path)}).generate()
+        MarkdownFormat.create(
+            data_model=_create_data_model(),
+            config_dict={"output_path": str(tmp_path / "shards" / "index.md"), "sharding": {}}
+        ).generate()
+    text = output_path.read_text()
+    assert text.startswith("\nSample\n======\n")
+    assert "\n## user\n" in text
+
+
+def test_pipes_are_escaped_in_tables(tmp_path):
+    output_path = tmp_path / "output.md"
+    data_model = DataModel(
+        id="sample",
+        name="sample",
+        entities={"user": {"fields": {"id": {"name": "id", "type": "string", "doc": "Either a | b"}}}}
+    )
+    MarkdownFormat.create(data_model=data_model, config_dict={"output_path": str(output_path)}).generate()
+    assert r"Either a \| b" in output_path.read_text()
+
+
+def test_padded_tables_are_aligned(tmp_path):
+    output_path = tmp_path / "output.md"
+    MarkdownFormat.create(
+        data_model=_create_data_model(),
+        config_dict={"output_path": str(output_path), "pad_tables": True}
+    ).generate()
+    table_lines = [line for line in output_path.read_text().splitlines() if line.startswith("|")]
+    assert table_lines
+    assert len({len(line) for line in table_lines[:3]}) == 1
+
+
+def _create_full_data_model() -> DataModel:
+    return DataModel(
+        id="sample",
+        name="Sample",
+        entities={
+            f"entity_{i}": {
+                "doc": f"Entity {i} | documentation",
+                "fields": {
+                    "id": {"name": "id", "type": "string", "is_key": True},
+                    "status": {"name": "status", "type": {"type": "enum", "id": "status"}},
+                    "address": {"name": "address", "type": {"type": "object", "id": f"address_{i % 3}"}},
+                    "id_parent": {"name": "id_parent", "type": "string"}
+                },
+                "references": [
+                    {"id_entity": f"entity_{(i + 1) % 8}", "mapping": [{"source": "id_parent", "destination": "id"}]}
+                ]
+            }
+            for i in range(8)
+        },
+        objects={
+            f"address_{i}": {"fields": {"street": {"name": "street", "type": {"type": "array", "items": "string"}}}}
+            for i in range(3)
+        },
+        enums={"status": {"values": [{"name": "Active", "value": "ACTIVE"}, {"name": "Closed", "value": "CLOSED"}]}}
+    )
+
+
+def _generate(data_model: DataModel, output_path: str, **config):
+    MarkdownFormat.create(
+        data_model=data_model,
+        config_dict={"output_path": output_path, "overwrite": True, **config}
+    ).generate()
+
+
+@pytest.mark.parametrize("config", [{}, {"pad_tables": True}, {"incremental": True}])
+def test_workers_output_is_identical(tmp_path, config: dict):
+    data_model = _create_full_data_model()
+    _generate(data_model, str(tmp_path / "serial.md"), workers=1, **config)
+    _generate(data_model, str(tmp_path / "parallel.md"), workers=3, **config)
+    assert (tmp_path / "parallel.md").read_bytes() == (tmp_path / "serial.md").read_bytes()
+
+
+def _read_files(directory) -> dict[str, bytes]:
+    return {
+        os.path.relpath(os.path.join(root, filename), directory): open(os.path.join(root, filename), mode="rb").read()
+        for root, _, filenames in os.walk(directory)
+        for filename in filenames
+    }
+
+
+@pytest.mark.parametrize("group_by", ["section", "prefix"])
+def test_workers_shards_are_identical(tmp_path, group_by: str):
+    data_model = _create_full_data_model()
+    sharding = {"group_by": group_by, "separator": "_"}
+    _generate(data_model, str(tmp_path / "serial" / "index.md"), workers=1, sharding=sharding)
+    _generate(data_model, str(tmp_path / "parallel" / "index.md"), workers=3, sharding=sharding)
+    assert _read_files(tmp_path / "parallel") == _read_files(tmp_path / "serial")
+
+
+def test_section_hash():
+    entity_hash = get_section_hash(SectionKind.ENTITY, "entity_3", _create_full_data_model())
+    assert get_section_hash(SectionKind.ENTITY, "entity_3", _create_full_data_model()) == entity_hash
+    assert get_section_hash(SectionKind.ENTITY, "entity_3", _create_full_data_model(), {"pad_tables": True}) != \
+        entity_hash
+
+    # sections list the references to their entity too
+    data_model = _create_full_data_model()
+    data_model.entities["entity_2"].references[0].name = "fk_parent"
+    assert get_section_hash(SectionKind.ENTITY, "entity_3", data_model) != entity_hash
+
+    data_model = _create_full_data_model()
+    data_model.entities["entity_5"].doc = "Changed"
+    assert get_section_hash(SectionKind.ENTITY, "entity_3", data_model) == entity_hash
+
+
+def test_incremental_reuses_unchanged_sections(tmp_path, monkeypatch):
+    output_path = str(tmp_path / "output.md")
+    _generate(_create_full_data_model(), output_path, incremental=True)
+
+    data_model = _create_full_data_model()
+    data_model.entities["entity_3"].doc = "Changed"
+    data_model.enums["status"].values[0].name = "Open"
+    rendered_sections = []
+    write_section = markdown_format.write_section
+    monkeypatch.setattr(
+        markdown_format, "write_section",
+        lambda md_file, kind, name, *args: rendered_sections.append((kind, name)) or write_section(
+            md_file, kind, name, *args
+        )
+    )
+    _generate(data_model, output_path, incremental=True)
+    assert rendered_sections == [(SectionKind.ENTITY, "entity_3"), (SectionKind.ENUM, "status")]
+
+    monkeypatch.undo()
+    _generate(data_model, str(tmp_path / "full.md"), incremental=True)
+    assert (tmp_path / "output.md").read_bytes() == (tmp_path / "full.md").read_bytes()
+
+
+def _generate_shards(data_model: DataModel, output_path: str):
+    _generate(data_model, output_path, sharding={})
+
+
+def test_stale_shards_are_deleted(tmp_path, create_data_model):
+    output_path = str(tmp_path / "index.md")
+    _generate_shards(create_data_model(entity_ids=["user", "order"]), output_path)
+    assert sorted(os.listdir(tmp_path / "entities")) == ["order.md", "user.md"]
+
+    (tmp_path / "entities" / "notes.md").write_text("# Notes written by hand\n")
+    _generate_shards(create_data_model(), output_path)
+    assert sorted(os.listdir(tmp_path / "entities")) == ["notes.md", "user.md"]
+
+
+def test_shard_file_names_are_unique(tmp_path, create_data_model):
+    output_path = str(tmp_path / "index.md")
+    _generate_shards(create_data_model(entity_ids=["a b", "a_b", "User", "user"]), output_path)
+    assert sorted(os.listdir(tmp_path / "entities")) == ["User.md", "a_b.md", "a_b_2.md", "user_2.md"]
+    assert "## a_b" in (tmp_path / "entities" / "a_b_2.md").read_text()
+    index = (tmp_path / "index.md").read_text()
+    assert "(entities/a_b_2.md#a_b)" in index and "(entities/user_2.md#user)" in index
+
+
+def test_indexes_are_listed_once(tmp_path):
+    output_path = tmp_path / "output.md"
+    data_model = DataModel(
+        id="sample",
+        name="sample",
+        entities={"user": {
+            "fields": {"id": {"name": "id", "type": "string"}},
+            "indexes": [{"name": "pk_user", "fields": ["id"], "kind": "primary_key", "is_unique": True}],
+            "statistics": {"row_count": 10, "size": 4096}
+        }}
+    )
+    MarkdownFormat.create(data_model=data_model, config_dict={"output_path": str(output_path)}).generate()
+    text = output_path.read_text()
+    assert text.count("pk_user") == 1
+    assert "Rows: 10" in text
@@ -0,0 +1,35 @@
+from dmdoc.core.sink.model import DataModelEnum
+
+
+def test_equal_models_have_equal_hashes(create_data_model):
+    fields = {"id": "string", "name": "string"}
+    assert create_data_model(fields).merkle_hash == create_data_model(fields).merkle_hash
+
+
+def test_hash_changes_on_field_type(create_data_model):
+    data_model = create_data_model({"id": "string", "name": "string"})
+    changed = create_data_model({"id": "integer", "name": "integer"})
+    assert data_model.merkle_hash != changed.merkle_hash
+    assert data_model.entities["user"].merkle_hash != changed.entities["user"].merkle_hash
+
+
+def test_hash_changes_on_field_order(create_data_model):
+    data_model = create_data_model({"id": "string", "name": "string"})
+    reordered = create_data_model({"name": "string", "id": "string"})
+    assert data_model.entities["user"].merkle_hash != reordered.entities["user"].merkle_hash
+    assert data_model.merkle_hash != reordered.merkle_hash
+
+
+def test_hash_changes_on_entity_order(create_data_model):
+    assert (
+        create_data_model(entity_ids=("user", "order")).merkle_hash
+        != create_data_model(entity_ids=("order", "user")).merkle_hash
+    )
+
+
+def test_hash_changes_on_enum_value_order():
+    values = [{"name": "Red", "value": "red"}, {"name": "Blue", "value": "blue"}]
+    assert (
+        DataModelEnum(values=values).merkle_hash
+        != DataModelEnum(values=list(reversed(values))).merkle_hash
+    )
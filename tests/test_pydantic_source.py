@@ -0,0 +1,107 @@
+from enum import Enum, IntEnum
+from typing import Optional, Union, Any
+
+import pytest
+from pydantic import BaseModel, Field
+
+from dmdoc.core.sink.snapshot import dump_snapshot, parse_snapshot
+from dmdoc.core.source.pydantic_source import PydanticSource, PydanticSourceConfig
+from dmdoc.utils.exception import DataTypeResolutionError
+
+
+class Color(str, Enum):
+    RED = "red"
+    DARK_BLUE = "blue"
+
+
+class Priority(IntEnum):
+    LOW = 1
+    HIGH = 2
+
+
+class Address(BaseModel):
+    """ Postal address """
+
+    street: str
+    zip_code: Optional[int] = None
+
+
+class User(BaseModel):
+    id: str = Field(alias="_id", description="Identifier")
+    addresses: Optional[list[Address]] = None
+    color: Color
+    priority: Priority = Priority.LOW
+    value: Union[int, str]
+    optional_value: Optional[Union[int, str]] = None
+    metadata: dict[str, Any] = {}
+    anything: Any = None
+    friend: Optional["User"] = None
+
+
+class Order(BaseModel):
+    user: User
+    shipping: Address
+    billing: Optional[Address] = None
+
+
+class Empty(BaseModel):
+    nothing: None = None
+
+
+MODELS = [User, Order]
+EMPTY_MODELS = [Empty]
+
+
+def _parse(models: str, **kwargs):
+    return PydanticSource(PydanticSourceConfig(id="sample", models=f"{__name__}:{models}", **kwargs)).parse()
+
+
+def test_entities_and_objects():
+    data_model = _parse("MODELS")
+    assert list(data_model.entities) == ["User", "Order"]
+    assert data_model.entities["User"].aliases == [f"{__name__}.User"]
+    # shared and recursive models are converted once
+    assert list(data_model.objects) == ["Address", "User"]
+    assert data_model.objects["Address"].doc.strip() == "Postal address"
+    assert data_model.objects["User"].fields is data_model.entities["User"].fields
+    assert data_model.name == "sample"
+
+
+def test_fields():
+    fields = _parse("MODELS").entities["User"].fields
+    assert list(fields)[0] == "_id"
+    assert fields["_id"].is_required and fields["_id"].doc == "Identifier"
+    assert not fields["addresses"].is_required
+    assert fields["addresses"].type.model_dump() == {"type": "array", "items": {"type": "object", "id": "Address"}}
+    assert fields["metadata"].type.model_dump() == {"type": "map", "values": "any"}
+    assert fields["anything"].type.type == "any"
+    assert fields["friend"].type.model_dump() == {"type": "object", "id": "User"}
+
+
+def test_field_names_by_attribute():
+    assert list(_parse("MODELS", by_alias=False).entities["User"].fields)[0] == "id"
+
+
+def test_unions():
+    fields = _parse("MODELS").entities["User"].fields
+    assert fields["value"].type.model_dump() == {"type": "union", "types": ["integer", "string"]}
+    assert fields["value"].is_required
+    # null is dropped from optional unions
+    assert fields["optional_value"].type is fields["value"].type
+    assert not fields["optional_value"].is_required
+
+
+def test_null_only_type():
+    with pytest.raises(DataTypeResolutionError, match="`nothing`"):
+        _parse("EMPTY_MODELS")
+
+
+def test_enums():
+    enums = _parse("MODELS").enums
+    assert [(value.name, value.value) for value in enums["Color"].values] == [("RED", "red"), ("DARK_BLUE", "blue")]
+    assert [(value.name, value.value) for value in enums["Priority"].values] == [("LOW", "1"), ("HIGH", "2")]
+
+
+def test_snapshot_round_trip():
+    data_model = _parse("MODELS")
+    assert parse_snapshot(dump_snapshot(data_model)).merkle_hash == data_model.merkle_hash
@@ -0,0 +1,61 @@
+import pytest
+
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.sink.snapshot import dump_snapshot, parse_snapshot
+
+_DATATYPES = {
+    "boolean": {"type": "boolean"},
+    "integer": {"type": "integer"},
+    "number": {"type": "number"},
+    "bytes": {"type": "bytes"},
+    "string": {"type": "string"},
+    "date": {"type": "date"},
+    "datetime": {"type": "datetime"},
+    "time": {"type": "time"},
+    "objectId": {"type": "objectId"},
+    "enum": {"type": "enum", "id": "status"},
+    "object": {"type": "object", "id": "address"},
+    "array": {"type": "array", "items": {"type": "string"}},
+    "array_of_objects": {"type": "array", "items": {"type": "object", "id": "address"}},
+    "map": {"type": "map", "values": {"type": "integer"}},
+    "union_of_primitives": {"type": "union", "types": [{"type": "string"}, {"type": "integer"}]},
+    "union_of_complex_types": {
+        "type": "union",
+        "types": [{"type": "array", "items": {"type": "number"}}, {"type": "enum", "id": "status"}]
+    },
+    "nested_union": {
+        "type": "map",
+        "values": {"type": "union", "types": [{"type": "boolean"}, {"type": "object", "id": "address"}]}
+    }
+}
+
+
+@pytest.fixture
+def create_user_model(create_data_model):
+    """ Data models with a key and a field of the provided data type, along with the types it refers to """
+
+    def create_user_model(name: str, datatype: dict) -> DataModel:
+        return create_data_model(
+            {"id": "string", name: datatype},
+            key_fields=["id"],
+            objects={"address": {"fields": {"street": {"name": "street", "type": "string"}}}},
+            enums={"status": {"values": [{"name": "Active", "value": "active"}]}}
+        )
+    return create_user_model
+
+
+@pytest.mark.parametrize("name", _DATATYPES)
+def test_json_round_trip(name: str, create_user_model):
+    data_model = create_user_model(name, _DATATYPES[name])
+    loaded = DataModel.model_validate_json(data_model.model_dump_json())
+    assert loaded.entities["user"].fields[name].type is data_model.entities["user"].fields[name].type
+    assert loaded.merkle_hash == data_model.merkle_hash
+
+
+@pytest.mark.parametrize("name", _DATATYPES)
+def test_snapshot_round_trip(name: str, create_user_model):
+    data_model = create_user_model(name, _DATATYPES[name])
+    loaded = parse_snapshot(dump_snapshot(data_model))
+    assert loaded.entities["user"].fields[name].type is data_model.entities["user"].fields[name].type
+    assert loaded.merkle_hash == data_model.merkle_hash
+    assert loaded.model_dump() == data_model.model_dump()
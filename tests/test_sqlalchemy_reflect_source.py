@@ -0,0 +1,124 @@
+import sqlite3
+from datetime import datetime
+from typing import Optional
+
+import pytest
+from sqlalchemy import ForeignKey, Index, Integer, MetaData, Numeric, String, UniqueConstraint, create_engine
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from dmdoc.core.sink.analysis import find_unindexed_references
+from dmdoc.core.sink.model import DataModel
+from dmdoc.core.source.sqlalchemy_reflect_source import SQLAlchemyReflectSource, build_tables
+from dmdoc.core.source.sqlalchemy_source import SQLAlchemySource
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customer"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str] = mapped_column(String(16), unique=True)
+    name: Mapped[Optional[str]] = mapped_column(String(64))
+    is_active: Mapped[bool]
+
+
+class Purchase(Base):
+    __tablename__ = "purchase"
+    __table_args__ = (
+        UniqueConstraint("id_customer", "created", name="uq_purchase_customer_created"),
+        Index("ix_purchase_code_amount", "code", "amount")
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    id_customer: Mapped[int] = mapped_column(ForeignKey("customer.id"))
+    code: Mapped[str] = mapped_column(ForeignKey("customer.code", name="fk_purchase_code"))
+    created: Mapped[datetime]
+    amount: Mapped[Optional[float]] = mapped_column(Numeric(10, 2))
+
+
+@pytest.fixture
+def database_url(tmp_path) -> str:
+    url = f"sqlite:///{tmp_path / 'sample.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    return url
+
+
+def _reflect(url: str) -> DataModel:
+    return SQLAlchemyReflectSource.create({"url": url, "id": "sample", "workers": 2}).parse()
+
+
+def test_columns(database_url: str):
+    customer = _reflect(database_url).entities["customer"]
+    assert {name: field.type.model_dump() for name, field in customer.fields.items()} == {
+        "id": "integer", "code": "string", "name": "string", "is_active": "boolean"
+    }
+    assert [name for name, field in customer.fields.items() if field.is_key] == ["id"]
+    assert [name for name, field in customer.fields.items() if field.is_required] == ["id", "code", "is_active"]
+
+
+def test_constraints_and_indexes(database_url: str):
+    data_model = _reflect(database_url)
+    purchase = data_model.entities["purchase"]
+    assert [(reference.name, reference.id_entity, [m.source for m in reference.mapping]) for reference in
+            purchase.references] == [(None, "customer", ["id_customer"]), ("fk_purchase_code", "customer", ["code"])]
+    assert [(index.kind, index.name, index.fields, index.is_unique) for index in purchase.indexes] == [
+        ("primary_key", None, ["id"], True),
+        ("unique_constraint", "uq_purchase_customer_created", ["id_customer", "created"], True),
+        ("index", "ix_purchase_code_amount", ["code", "amount"], False)
+    ]
+    assert [index.fields for index in data_model.entities["customer"].indexes] == [["id"], ["code"]]
+    assert find_unindexed_references(data_model).is_empty
+
+
+def test_parity_with_declarative_source(database_url: str):
+    reflected = _reflect(database_url)
+    declared = SQLAlchemySource.create({"base": f"{__name__}:Base", "id": "sample"}).parse()
+    assert list(reflected.entities) == list(declared.entities)
+    for table_name, entity in reflected.entities.items():
+        # ORM classes are not available when reflecting
+        assert entity.aliases == []
+        assert entity.model_dump(exclude={"aliases"}) == declared.entities[table_name].model_dump(exclude={"aliases"})
+
+
+def test_skip_references_to_tables_not_reflected(tmp_path):
+    database_filepath = tmp_path / "orphan.db"
+    with sqlite3.connect(database_filepath) as connection:
+        connection.executescript(
+            "CREATE TABLE item (id INTEGER PRIMARY KEY, id_missing INTEGER REFERENCES missing (id));"
+        )
+    item = _reflect(f"sqlite:///{database_filepath}").entities["item"]
+    assert list(item.fields) == ["id", "id_missing"]
+    assert item.references == []
+
+
+def test_functional_index_prefix():
+    reflected = {
+        "get_multi_columns": {(None, "sample"): [
+            {"name": name, "type": Integer(), "nullable": True} for name in ["id", "a", "pid"]
+        ]},
+        "get_multi_pk_constraint": {},
+        "get_multi_foreign_keys": {},
+        "get_multi_unique_constraints": {},
+        # dialects like PostgreSQL return None in place of the expressions
+        "get_multi_indexes": {(None, "sample"): [
+            {"name": "ix_expression", "column_names": [None, "pid"], "unique": False},
+            {"name": "ix_mixed", "column_names": ["pid", None, "a"], "unique": True}
+        ]},
+        "get_multi_table_comment": {}
+    }
+    metadata = MetaData()
+    build_tables(metadata, reflected)
+    indexes = {index.name: [column.name for column in index.columns] for index in metadata.tables["sample"].indexes}
+    assert indexes == {"ix_mixed": ["pid"]}
+
+
+def test_input_files(tmp_path, database_url: str):
+    source = SQLAlchemyReflectSource.create({"url": database_url, "id": "sample"})
+    assert source.get_input_files() == [str(tmp_path / "sample.db"), f"{tmp_path / 'sample.db'}-wal"]
+    # in-memory databases cannot be tracked
+    assert SQLAlchemyReflectSource.create({"url": "sqlite://", "id": "sample"}).get_input_files() is None
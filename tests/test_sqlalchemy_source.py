@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import (
+    ARRAY, BigInteger, Column, Double, Enum, ForeignKey, Index, Integer, MetaData, String, Table, Text, TypeDecorator,
+    Uuid, func
+)
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from dmdoc.core.sink.analysis import find_unindexed_references
+from dmdoc.core.sink.model import DataModel, Entity, construct_model
+from dmdoc.core.source.sqlalchemy_source import SQLAlchemySource, SQLAlchemySourceConfig, get_entity_indexes
+from dmdoc.utils.exception import DataTypeResolutionError
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Customer(Base):
+    __tablename__ = "customer"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str] = mapped_column(String(16), unique=True)
+
+
+class Purchase(Base):
+    __tablename__ = "purchase"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    code: Mapped[str] = mapped_column(ForeignKey("customer.code"))
+    id_customer: Mapped[int] = mapped_column(ForeignKey("customer.id"))
+
+
+Index("ix_purchase_lower_code", func.lower(Purchase.code), Purchase.id_customer)
+
+
+class Tags(TypeDecorator):
+    impl = Text
+    cache_ok = True
+
+
+def _create_source() -> SQLAlchemySource:
+    return SQLAlchemySource(SQLAlchemySourceConfig(base=f"{__name__}:Base", id="sample"))
+
+
+def _parse() -> DataModel:
+    return _create_source().parse()
+
+
+def test_constructed_model_passes_validation():
+    data_model = _parse()
+    assert data_model.entities["customer"].aliases == [f"{__name__}:Customer"]
+    assert DataModel.model_validate(data_model.model_dump()).model_dump() == data_model.model_dump()
+
+
+def test_check_integrity_rejects_unknown_entities():
+    purchase = _parse().entities["purchase"]
+    reference = purchase.references[0].model_copy(update={"id_entity": "missing"})
+    data_model = construct_model(
+        DataModel,
+        id="sample",
+        entities={"purchase": construct_model(Entity, **{**dict(purchase), "references": [reference]})}
+    )
+    with pytest.raises(ValueError):
+        data_model.check_integrity()
+
+
+def test_column_types_are_resolved_through_mro():
+    table = Table(
+        "sample", MetaData(),
+        Column("text", Text), Column("big", BigInteger), Column("ratio", Double), Column("uid", Uuid),
+        Column("pg_text", postgresql.TEXT), Column("tags", Tags), Column("codes", ARRAY(String)),
+        Column("status", Enum("open", "closed", name="status"))
+    )
+    source = _create_source()
+    assert {column.name: source.get_data_type(column).model_dump() for column in table.columns} == {
+        "text": "string",
+        "big": "integer",
+        "ratio": "number",
+        "uid": "string",
+        "pg_text": "string",
+        "tags": "string",
+        "codes": {"type": "array", "items": "string"},
+        "status": {"type": "enum", "id": "status"}
+    }
+
+
+def test_unknown_column_type():
+    table = Table("sample", MetaData(), Column("data", postgresql.JSONB))
+    with pytest.raises(DataTypeResolutionError, match=r"\[sample\]\.\[data\]"):
+        _create_source().get_data_type(table.c.data)
+
+
+def _get_index_fields(table: Table) -> dict[str, list[str]]:
+    return {index.name: index.fields for index in get_entity_indexes(table) if index.name is not None}
+
+
+def test_functional_index_prefix():
+    table = Table(
+        "sample", MetaData(),
+        Column("id", Integer, primary_key=True), Column("a", String), Column("pid", Integer)
+    )
+    Index("ix_expression", func.lower(table.c.a), table.c.pid)
+    Index("ix_mixed", table.c.pid, func.lower(table.c.a), table.c.a)
+    Index("ix_columns", table.c.a, table.c.pid)
+    # fields following an expression are not a usable prefix, indexes led by an expression are dropped
+    assert _get_index_fields(table) == {"ix_columns": ["a", "pid"], "ix_mixed": ["pid"]}
+
+
+def test_functional_index_does_not_cover_references():
+    data_model = _parse()
+    purchase = data_model.entities["purchase"]
+    assert [index.name for index in purchase.indexes] == [None]
+    assert not purchase.fields["code"].is_indexed
+    report = find_unindexed_references(data_model)
+    assert [reference.fields for reference in report.unindexed_references] == [["code"], ["id_customer"]]
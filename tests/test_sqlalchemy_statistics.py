@@ -0,0 +1,98 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine
+
+from dmdoc.core.source import sqlalchemy_statistics
+from dmdoc.core.source.sqlalchemy_statistics import (
+    SQLiteStatisticsConfig, collect_sqlite_statistics, count_rows, parse_stat_row_counts
+)
+
+_ROWS = 50
+
+
+@pytest.fixture
+def database_filepath(tmp_path) -> str:
+    filepath = str(tmp_path / "sample.db")
+    with sqlite3.connect(filepath) as connection:
+        connection.executescript(
+            "CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT);"
+            "CREATE INDEX ix_item_name ON item (name);"
+            "CREATE TABLE tag (id INTEGER PRIMARY KEY, label TEXT);"
+        )
+        connection.executemany("INSERT INTO item (name) VALUES (?)", [(f"item-{i}",) for i in range(_ROWS)])
+        connection.executemany("INSERT INTO tag (label) VALUES (?)", [(f"tag-{i}",) for i in range(3)])
+    return filepath
+
+
+@pytest.fixture
+def tables() -> dict[str, Table]:
+    metadata = MetaData()
+    return {
+        "item": Table("item", metadata, Column("id", Integer, primary_key=True), Column("name", String)),
+        "tag": Table("tag", metadata, Column("id", Integer, primary_key=True), Column("label", String))
+    }
+
+
+def _collect(database_filepath: str, tables: dict[str, Table]):
+    return collect_sqlite_statistics(SQLiteStatisticsConfig(workers=2), tables, f"sqlite:///{database_filepath}")
+
+
+def test_row_counts_from_sqlite_stat1(database_filepath: str, tables: dict[str, Table], monkeypatch):
+    with sqlite3.connect(database_filepath) as connection:
+        connection.execute("ANALYZE")
+        # the estimation is used as is, it may differ from the actual row count
+        connection.execute("UPDATE sqlite_stat1 SET stat = '1000 1' WHERE tbl = 'item'")
+    counted_tables = []
+    monkeypatch.setattr(
+        sqlalchemy_statistics, "count_rows",
+        lambda engine, table, timeout: counted_tables.append(table.name) or _ROWS
+    )
+    statistics = _collect(database_filepath, tables)
+    assert statistics["item"].row_count == 1000
+    # tables without indexes are analyzed too
+    assert statistics["tag"].row_count == 3
+    assert counted_tables == []
+
+
+def test_count_rows_fallback(database_filepath: str, tables: dict[str, Table]):
+    statistics = _collect(database_filepath, tables)
+    assert statistics["item"].row_count == _ROWS
+    assert statistics["tag"].row_count == 3
+    # table and index pages, from dbstat
+    assert statistics["item"].size > statistics["tag"].size > 0
+
+
+def test_count_rows_timeout(tmp_path):
+    filepath = tmp_path / "slow.db"
+    with sqlite3.connect(filepath) as connection:
+        connection.execute(
+            "CREATE VIEW slow AS WITH RECURSIVE numbers(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM numbers) "
+            "SELECT n FROM numbers"
+        )
+    engine = create_engine(f"sqlite:///{filepath}")
+    try:
+        assert count_rows(engine, Table("slow", MetaData(), Column("n", Integer)), timeout=0.1) is None
+    finally:
+        engine.dispose()
+
+
+def test_missing_dbstat(database_filepath: str, tables: dict[str, Table], monkeypatch):
+    fetch_optional = sqlalchemy_statistics._fetch_optional
+    monkeypatch.setattr(
+        sqlalchemy_statistics, "_fetch_optional",
+        lambda engine, statement: fetch_optional(engine, statement.replace("dbstat", "missing_dbstat"))
+    )
+    statistics = _collect(database_filepath, tables)
+    assert statistics["item"].size is None
+    assert statistics["item"].row_count == _ROWS
+
+
+@pytest.mark.parametrize("rows, row_counts", [
+    ([("item", None, "10")], {"item": 10}),
+    ([("item", "ix_full", "10 1"), ("item", "ix_partial", "4 1")], {"item": 10}),
+    ([("item", "ix_partial", "4 1"), ("item", "ix_full", "10 1")], {"item": 10}),
+    ([("item", "ix_partial", "4 1"), ("tag", "ix_tag", ""), ("tag", None, None)], {"item": 4})
+])
+def test_parse_stat_row_counts(rows: list[tuple], row_counts: dict[str, int]):
+    assert parse_stat_row_counts(rows) == row_counts